@@ -1,86 +1,160 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, Response, stream_with_context, has_request_context
 from flask_cors import CORS
 import os
+import sys
 import uuid
 from werkzeug.utils import secure_filename
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import PyPDF2
 import docx
-import spacy
 import re
 from groq import Groq
 import json
 from typing import Dict, List, Any
 import logging
 import asyncio
+import threading
+import importlib.util
 from datetime import datetime
 
-# Import necessary libraries for vector database
-try:
-    from pymilvus import connections, utility, FieldSchema, CollectionSchema, DataType, Collection
-    MILVUS_ENABLED = True
-except ImportError:
-    logger.warning("pymilvus not installed, vector database features will be disabled")
-    MILVUS_ENABLED = False
+# The vector database client is imported on first use; only check that it is installed here
+MILVUS_ENABLED = importlib.util.find_spec("pymilvus") is not None
     
+import hmac
 import hashlib
 import numpy as np
 
 # Local imports
-from resource_scraper import get_resources_for_skills
+from lazy import LazyProxy
+from llm_cache import CachedGroqClient, cache_from_env
+from llm_metrics import InstrumentedGroqClient, REGISTRY as metrics_registry, PROMETHEUS_CONTENT_TYPE, record_json_parse
+from rate_limiter import (
+    ScheduledGroqClient, scheduler_from_env,
+    PRIORITY_INTERACTIVE, PRIORITY_ASSESSMENT, PRIORITY_BACKGROUND
+)
+from singleflight import singleflight_from_env
+from job_description_library import JobDescriptionLibrary
+from assessment_store import AssessmentStore, ProgressCompactor, DEFAULT_PAGE_SIZE
+from assessment_export import export_assessments, parse_since, NDJSON_CONTENT_TYPE
+from json_provider import jsonify, install_json_provider
+from resource_cache import ResourceCache, FRESH, fetched_at_iso
+from storage import (
+    UPLOAD_FOLDER, DATA_FOLDER, PATHWAY_DB_PATH, JOB_DESCRIPTION_DB, RESOURCE_CACHE_DB, CRAWL_JOBS_DB,
+    migrate as migrate_storage
+)
+from crawl_jobs import CrawlJobRunner
+from prompt_budget import PromptBudgeter
+from streaming_json import JSONArrayItemStream
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+install_json_provider(app)
 CORS(app)  # Enable CORS for all routes
 
 
+if not MILVUS_ENABLED:
+    logger.warning("pymilvus not installed, vector database features will be disabled")
+
 # Configure Groq client
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY environment variable is not set")
+    logger.warning("GROQ_API_KEY environment variable is not set; LLM calls will fail until it is")
 
 # Update to use the latest Llama 4 model
 GROQ_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"  # Latest Llama 4 model
 
-try:
-    groq_client = Groq(api_key=GROQ_API_KEY)
-    # Test the client with a simple request
-    test_completion = groq_client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[{"role": "user", "content": "test"}],
-        max_tokens=10
-    )
-    logger.info(f"Successfully initialized Groq client with model {GROQ_MODEL}")
-except Exception as e:
-    logger.error(f"Failed to initialize Groq client: {str(e)}")
-    raise
-
-# Configure upload folder
-UPLOAD_FOLDER = 'uploads'
+# Cache completions by content hash so repeated prompts skip the network round trip,
+# and coalesce identical in-flight prompts so bursts share one upstream call
+llm_cache = cache_from_env(DATA_FOLDER)
+llm_singleflight = singleflight_from_env()
+
+# Measure every prompt and compact the ones that exceed their endpoint's token budget
+prompt_budgeter = PromptBudgeter()
+
+def create_groq_client():
+    """Create the underlying Groq client, called on first use"""
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY environment variable is not set")
+    return Groq(api_key=GROQ_API_KEY)
+
+# Outbound calls are admitted by priority within the account's request and token rate limits
+llm_scheduler = scheduler_from_env()
+
+def current_endpoint():
+    """Name of the Flask endpoint handling the current request, used to label LLM metrics"""
+    return request.endpoint if has_request_context() else 'background'
+
+# The Groq client is created lazily so importing the app never touches the network
+groq_upstream = LazyProxy(create_groq_client, "Groq client")
+
+# Outermost wrapper records latency and token usage per endpoint, including cache hits
+groq_client = InstrumentedGroqClient(
+    CachedGroqClient(
+        ScheduledGroqClient(
+            groq_upstream,
+            llm_scheduler,
+            max_retries=int(os.getenv('GROQ_MAX_RETRIES', '3'))
+        ),
+        llm_cache,
+        llm_singleflight
+    ),
+    endpoint_resolver=current_endpoint
+)
+
+# Configure upload folder; it and the data folder are created by storage.migrate()
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Limit file size to 16MB
 
-# Create uploads directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Create data directory for storing roadmaps
-DATA_FOLDER = 'data'
-os.makedirs(DATA_FOLDER, exist_ok=True)
+# Precomputed job descriptions, so known roles skip the LLM in assess_skills
+job_description_library = JobDescriptionLibrary(JOB_DESCRIPTION_DB)
+
+# Users, assessments and milestone progress live in the pathway SQLite database.
+# None of these objects touch disk when built; storage.migrate() creates the files and tables,
+# once from the gunicorn master (see gunicorn.conf.py)
+assessment_store = AssessmentStore(PATHWAY_DB_PATH)
+# Scraped resource listings with per-source TTLs; stale and missing entries are re-scraped in the background
+resource_cache = ResourceCache(RESOURCE_CACHE_DB)
+
+def create_background_scraper():
+    """Build the background scraper, called on first use; importing it loads aiohttp and the HTML parsers"""
+    from resource_scraper import BackgroundScraper
+    return BackgroundScraper(cache=resource_cache)
+
+background_scraper = LazyProxy(create_background_scraper, "background scraper")
+
+# Crawls run on a background thread; request handlers only queue them
+crawl_runner = CrawlJobRunner(
+    CRAWL_JOBS_DB,
+    background_scraper,
+    cache=resource_cache,
+    schedule_interval=float(os.getenv('CRAWL_SCHEDULE_INTERVAL', '3600'))
+)
+
+# Bearer token for the bulk export endpoint; exports are disabled when unset
+EXPORT_API_TOKEN = os.getenv('EXPORT_API_TOKEN')
+
+# Folds the append-only milestone event log into the progress snapshot; started by start_background_tasks()
+progress_compactor = ProgressCompactor(
+    assessment_store,
+    interval=float(os.getenv('PROGRESS_COMPACT_INTERVAL', '30'))
+)
+
+def load_spacy_model():
+    """Load the spaCy model for NLP processing, downloading it if necessary"""
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        # If model not available, download it
+        import subprocess
+        subprocess.call([sys.executable, '-m', 'spacy', 'download', 'en_core_web_sm'])
+        return spacy.load("en_core_web_sm")
 
-# Load spaCy model for NLP processing
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    # If model not available, download it
-    import subprocess
-    subprocess.call(['python', '-m', 'spacy', 'download', 'en_core_web_sm'])
-    nlp = spacy.load("en_core_web_sm")
+# spaCy is only needed by the fallback skill extractor, so load it on first use
+nlp = LazyProxy(load_spacy_model, "spaCy model")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -117,10 +191,11 @@ def extract_skills_from_text(text):
     """Extract skills from text using Groq for dynamic skill identification"""
     try:
         logger.debug(f"Starting skill extraction for text of length: {len(text)}")
+        prompt_text = prompt_budgeter.fit_text('extract_skills', text, resume=True)
         prompt = f"""Analyze the following text and extract all relevant technical and soft skills. Include both conventional and non-conventional skills that would be valuable in a professional context.
 
 Text to analyze:
-{text}
+{prompt_text}
 
 Please provide a JSON response with the following structure:
 {{
@@ -161,7 +236,8 @@ Example format:
             temperature=0.3,
             max_tokens=2000,
             top_p=1,
-            stream=False
+            stream=False,
+            priority=PRIORITY_BACKGROUND
         )
         
         logger.debug("Received response from Groq API")
@@ -170,6 +246,7 @@ Example format:
         
         try:
             skills_analysis = json.loads(response_text)
+            record_json_parse(current_endpoint(), True)
             logger.debug(f"Successfully parsed JSON response with {len(skills_analysis)} categories")
             
             # Combine all skills into a single list with their confidence scores
@@ -192,6 +269,7 @@ Example format:
             return filtered_skills
             
         except json.JSONDecodeError as e:
+            record_json_parse(current_endpoint(), False)
             logger.error(f"Failed to parse JSON response: {str(e)}")
             logger.error(f"Raw response that failed to parse: {response_text}")
             # Fall back to basic NLP extraction
@@ -204,7 +282,7 @@ Example format:
 def fallback_skill_extraction(text):
     """Fallback method for skill extraction using basic NLP"""
     logger.info("Using fallback NLP-based skill extraction")
-    doc = nlp(text.lower())
+    doc = nlp.get()(text.lower())
     skills = []
     for chunk in doc.noun_chunks:
         if len(chunk.text.split()) <= 3:
@@ -247,22 +325,26 @@ Please provide a JSON response with the following structure:
 }}"""
 
     try:
+        messages = [
+            {"role": "system", "content": "You are an expert at analyzing professional skills and providing detailed assessments."},
+            {"role": "user", "content": prompt}
+        ]
+        prompt_budgeter.measure('analyze_resume', messages)
         completion = groq_client.chat.completions.create(
             model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an expert at analyzing professional skills and providing detailed assessments."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.3,
             max_tokens=2000,
             top_p=1,
-            stream=False
+            stream=False,
+            priority=PRIORITY_BACKGROUND
         )
         
         # Parse the response
         response_text = completion.choices[0].message.content
         try:
             analysis = json.loads(response_text)
+            record_json_parse(current_endpoint(), True)
             return {
                 'skills': skills,
                 'skill_categories': analysis.get('skill_categories', {}),
@@ -270,6 +352,7 @@ Please provide a JSON response with the following structure:
                 'skill_levels': analysis.get('skill_levels', {})
             }
         except json.JSONDecodeError:
+            record_json_parse(current_endpoint(), False)
             # Fallback to basic scoring if JSON parsing fails
             return {
                 'skills': skills,
@@ -306,6 +389,7 @@ def analyze_career_gap_with_groq(
     Analyze career gap using Groq API to provide intelligent recommendations.
     """
     try:
+        job_description = prompt_budgeter.fit_text('career_gap_job_description', job_description)
         prompt = f"""As a career development expert, analyze the following information and provide detailed recommendations:
 
 Current Skills: {', '.join(current_skills)}
@@ -399,7 +483,8 @@ IMPORTANT:
             temperature=0.7,
             max_tokens=4000,
             top_p=1,
-            stream=False
+            stream=False,
+            priority=PRIORITY_ASSESSMENT
         )
         
         # Parse the response
@@ -412,6 +497,7 @@ IMPORTANT:
             
             # Parse the JSON
             analysis = json.loads(response_text)
+            record_json_parse(current_endpoint(), True)
             
             # Validate required fields
             required_fields = ['required_skills', 'skill_gaps', 'learning_path', 'milestones', 'resources', 'risk_assessment']
@@ -464,6 +550,7 @@ IMPORTANT:
             return analysis
             
         except json.JSONDecodeError as e:
+            record_json_parse(current_endpoint(), False)
             logger.error(f"Failed to parse JSON response: {str(e)}")
             logger.error(f"Raw response that failed to parse: {response_text}")
             # Return a default response with basic structure
@@ -538,6 +625,17 @@ def upload_resume():
         logger.error(f"Unexpected error in upload_resume: {str(e)}")
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
+# Sections of the assess-skills display format; 'key' is the field of 'analysis' each one shows
+DISPLAY_SECTIONS = (
+    {'title': 'Summary', 'type': 'summary', 'key': 'summary'},
+    {'title': 'Required Skills', 'type': 'list', 'key': 'required_skills'},
+    {'title': 'Skill Gaps', 'type': 'table', 'key': 'skill_gaps'},
+    {'title': 'Learning Path', 'type': 'timeline', 'key': 'learning_path'},
+    {'title': 'Milestones', 'type': 'timeline', 'key': 'milestones'},
+    {'title': 'Recommended Resources', 'type': 'cards', 'key': 'resources'},
+    {'title': 'Risk Assessment', 'type': 'table', 'key': 'risk_assessment'},
+)
+
 @app.route('/api/assess-skills', methods=['POST'])
 def assess_skills():
     """Endpoint to process skill assessment data using Groq-based analysis"""
@@ -583,12 +681,12 @@ def assess_skills():
             logger.error("Target role is missing")
             return jsonify({'error': 'Target role is required'}), 400
             
-        # If job description is not provided, fetch a general description from GROQ
+        # If job description is not provided, use the library or fetch a general description from GROQ
         if not job_description:
-            logger.info(f"Job description not provided, fetching general description for {target_role}")
+            logger.info(f"Job description not provided, looking up general description for {target_role}")
             try:
-                # Fetch job description using GROQ
-                job_description = fetch_job_description_from_groq(target_role)
+                # Known roles come from the local library; unknown ones are fetched and written back
+                job_description = job_description_library.get_or_fetch(target_role, fetch_job_description_from_groq)
                 logger.info(f"Successfully fetched job description for {target_role}")
             except Exception as e:
                 logger.error(f"Error fetching job description from GROQ: {str(e)}")
@@ -622,44 +720,9 @@ def assess_skills():
             'experience_level': experience,
             'timeframe': timeframe,
             'current_skills': user_skills,
+            # Sections name the analysis key they render instead of repeating its content
             'display_format': {
-                'sections': [
-                    {
-                        'title': 'Summary',
-                        'type': 'summary',
-                        'content': analysis.get('summary', {})
-                    },
-                    {
-                        'title': 'Required Skills',
-                        'type': 'list',
-                        'content': analysis.get('required_skills', [])
-                    },
-                    {
-                        'title': 'Skill Gaps',
-                        'type': 'table',
-                        'content': analysis.get('skill_gaps', [])
-                    },
-                    {
-                        'title': 'Learning Path',
-                        'type': 'timeline',
-                        'content': analysis.get('learning_path', [])
-                    },
-                    {
-                        'title': 'Milestones',
-                        'type': 'timeline',
-                        'content': analysis.get('milestones', [])
-                    },
-                    {
-                        'title': 'Recommended Resources',
-                        'type': 'cards',
-                        'content': analysis.get('resources', [])
-                    },
-                    {
-                        'title': 'Risk Assessment',
-                        'type': 'table',
-                        'content': analysis.get('risk_assessment', [])
-                    }
-                ]
+                'sections': list(DISPLAY_SECTIONS)
             }
         }
         
@@ -675,6 +738,72 @@ def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'ok'})
 
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def llm_cache_stats():
+    """Report hit/miss counters for the LLM response cache"""
+    stats = llm_cache.get_stats()
+    stats['singleflight'] = llm_singleflight.get_stats()
+    return jsonify(stats)
+
+@app.route('/api/resource-cache/stats', methods=['GET'])
+def resource_cache_stats():
+    """Report per-source lookups and hit ratios for the scraped resource cache"""
+    return jsonify({'sources': resource_cache.get_stats(), 'refreshing': background_scraper.pending() if background_scraper.initialized else 0})
+
+@app.route('/api/crawl-jobs/status', methods=['GET'])
+def crawl_jobs_status():
+    """Report queued, running and finished resource crawls and the skills prefetched by popularity"""
+    return jsonify(crawl_runner.status())
+
+@app.route('/api/llm-scheduler/stats', methods=['GET'])
+def llm_scheduler_stats():
+    """Report per-priority queue wait times for outbound LLM calls"""
+    return jsonify(llm_scheduler.get_stats())
+
+@app.route('/api/prompt-metrics', methods=['GET'])
+def prompt_metrics():
+    """Report per-endpoint prompt sizes and compaction counts"""
+    return jsonify(prompt_budgeter.get_metrics())
+
+def collect_llm_stats():
+    """Report cache, single-flight, scheduler and prompt-budget counters at scrape time"""
+    cache = llm_cache.get_stats()
+    flights = llm_singleflight.get_stats()
+    queues = llm_scheduler.get_stats()['queues']
+    prompts = prompt_budgeter.get_metrics()['endpoints']
+    return [
+        ('llm_cache_events_total', 'counter', 'LLM response cache lookups and writes by event',
+         [({'event': event}, cache[event]) for event in ('hits', 'disk_hits', 'misses', 'stores', 'evictions', 'expired')]),
+        ('llm_cache_entries', 'gauge', 'Entries in the in-memory LLM response cache', [({}, cache['entries'])]),
+        ('llm_singleflight_calls_total', 'counter', 'Upstream calls led or coalesced by single-flight',
+         [({'role': 'leader'}, flights['leaders']), ({'role': 'coalesced'}, flights['coalesced'])]),
+        ('llm_scheduler_admitted_total', 'counter', 'Calls admitted by the Groq scheduler per priority queue',
+         [({'queue': name}, values['admitted']) for name, values in queues.items()]),
+        ('llm_scheduler_wait_seconds_total', 'counter', 'Time spent waiting for admission per priority queue',
+         [({'queue': name}, values['wait_seconds_total']) for name, values in queues.items()]),
+        ('llm_scheduler_retries_total', 'counter', 'Rate-limit retries per priority queue',
+         [({'queue': name}, values['retries']) for name, values in queues.items()]),
+        ('llm_scheduler_queued', 'gauge', 'Calls waiting for admission per priority queue',
+         [({'queue': name}, values['queued']) for name, values in queues.items()]),
+        ('llm_prompt_compacted_total', 'counter', 'Prompts compacted to fit their token budget',
+         [({'endpoint': name}, values['compacted']) for name, values in prompts.items()]),
+        ('assessment_listing_cache_total', 'counter', 'Assessment list page cache lookups by result',
+         [({'result': 'hit'}, assessment_store.listing_cache.stats['hits']),
+          ({'result': 'miss'}, assessment_store.listing_cache.stats['misses'])]),
+        ('progress_events_pending', 'gauge', 'Milestone changes in the event log awaiting compaction',
+         [({}, assessment_store.pending_events())]),
+        ('resource_cache_lookups_total', 'counter', 'Scraped resource cache lookups per source by result',
+         [({'source': source, 'result': result}, counts[result])
+          for source, counts in resource_cache.get_stats().items() for result in ('fresh', 'stale', 'negative', 'miss')]),
+    ]
+
+metrics_registry.register_collector(collect_llm_stats)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose LLM latency, token and parse metrics in the Prometheus text format"""
+    return Response(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/api/save-assessment', methods=['POST'])
 def save_assessment():
     """Save assessment results for a user"""
@@ -701,28 +830,12 @@ def save_assessment():
         # Generate a unique ID for the assessment
         assessment_id = str(uuid.uuid4())
         
-        # Create user directory if it doesn't exist
-        user_dir = os.path.join(DATA_FOLDER, user_id)
-        logger.info(f"Creating user directory at {user_dir}")
-        os.makedirs(user_dir, exist_ok=True)
-        
-        # Save user info if it doesn't exist
-        user_info_file = os.path.join(user_dir, 'user_info.json')
-        if not os.path.exists(user_info_file):
-            user_info = {
-                'id': user_id,
-                'name': user_name,
-                'email': user_email,
-                'created_at': datetime.now().isoformat()
-            }
-            with open(user_info_file, 'w') as f:
-                json.dump(user_info, f, indent=2)
-            logger.info(f"Created user info file at {user_info_file}")
-        
-        # Create assessment directory
-        assessment_dir = os.path.join(user_dir, assessment_id)
-        os.makedirs(assessment_dir, exist_ok=True)
-        logger.info(f"Created assessment directory at {assessment_dir}")
+        user_info = {
+            'id': user_id,
+            'name': user_name,
+            'email': user_email,
+            'created_at': datetime.now().isoformat()
+        }
         
         # Prepare assessment data
         assessment_data = {
@@ -737,23 +850,9 @@ def save_assessment():
             'status': 'active'  # Add status field for tracking
         }
         
-        # Save assessment data
-        assessment_file = os.path.join(assessment_dir, 'assessment.json')
-        with open(assessment_file, 'w') as f:
-            json.dump(assessment_data, f, indent=2)
-        logger.info(f"Saved assessment data to {assessment_file}")
-        
-        # Also save a session copy for immediate access
-        session_file = os.path.join(DATA_FOLDER, f"session_{user_id}.json")
-        with open(session_file, 'w') as f:
-            json.dump({
-                'assessments': [assessment_data]
-            }, f, indent=2)
-        logger.info(f"Saved session assessment data to {session_file}")
-        
-        # Save milestones if they exist
+        # Build milestones if they exist
+        milestones = []
         if assessment_results and 'analysis' in assessment_results and 'milestones' in assessment_results['analysis']:
-            milestones = []
             for milestone in assessment_results['analysis']['milestones']:
                 milestone_id = milestone.get('milestone', '').replace(' ', '_').lower()
                 milestone_data = {
@@ -767,28 +866,10 @@ def save_assessment():
                     'created_at': datetime.now().isoformat()
                 }
                 milestones.append(milestone_data)
-            
-            # Save milestones
-            milestones_file = os.path.join(assessment_dir, 'milestones.json')
-            with open(milestones_file, 'w') as f:
-                json.dump(milestones, f, indent=2)
-            logger.info(f"Saved milestones to {milestones_file}")
-        
-        # Save learning path if it exists
-        if assessment_results and 'analysis' in assessment_results and 'learning_path' in assessment_results['analysis']:
-            learning_path = assessment_results['analysis']['learning_path']
-            path_file = os.path.join(assessment_dir, 'learning_path.json')
-            with open(path_file, 'w') as f:
-                json.dump(learning_path, f, indent=2)
-            logger.info(f"Saved learning path to {path_file}")
-        
-        # Save skill gaps if they exist
-        if assessment_results and 'analysis' in assessment_results and 'skill_gaps' in assessment_results['analysis']:
-            skill_gaps = assessment_results['analysis']['skill_gaps']
-            gaps_file = os.path.join(assessment_dir, 'skill_gaps.json')
-            with open(gaps_file, 'w') as f:
-                json.dump(skill_gaps, f, indent=2)
-            logger.info(f"Saved skill gaps to {gaps_file}")
+        
+        # The learning path and skill gaps are read back from the analysis, so only one copy is stored
+        assessment_store.save_assessment(user_info, assessment_data, milestones)
+        logger.info(f"Saved assessment {assessment_id} with {len(milestones)} milestones for user {user_id}")
         
         return jsonify({
             'message': 'Assessment saved successfully',
@@ -802,116 +883,90 @@ def save_assessment():
 
 @app.route('/api/get-assessments/<user_id>', methods=['GET'])
 def get_assessments(user_id):
-    """Get all assessments for a user"""
+    """
+    Get a page of a user's assessments, newest first.
+    
+    Query parameters: limit (default 20, max 100), cursor (the next_cursor of
+    the previous page) and view ('summary' without the analysis blob, or 'full').
+    """
     try:
         logger.info(f"Fetching assessments for user {user_id}")
+        view = request.args.get('view', 'full')
+        if view not in ('summary', 'full'):
+            return jsonify({'error': "view must be 'summary' or 'full'"}), 400
         
-        # First check if we have a session file for this user
-        session_file = os.path.join(DATA_FOLDER, f"session_{user_id}.json")
-        if os.path.exists(session_file):
-            logger.info(f"Found session file at {session_file}")
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    return jsonify(session_data)
-            except Exception as e:
-                logger.error(f"Error reading session file: {str(e)}")
-                # Continue to normal directory check if session file is corrupted
-        
-        # Check user directory
-        user_dir = os.path.join(DATA_FOLDER, user_id)
-        if not os.path.exists(user_dir):
-            logger.info(f"User directory not found at {user_dir}")
-            return jsonify({'assessments': []})
-        
-        logger.info(f"Looking for assessments in {user_dir}")
-        assessments = []
-        for assessment_id in os.listdir(user_dir):
-            if assessment_id == 'user_info.json':
-                continue
-                
-            assessment_dir = os.path.join(user_dir, assessment_id)
-            if os.path.isdir(assessment_dir):
-                assessment_file = os.path.join(assessment_dir, 'assessment.json')
-                if os.path.exists(assessment_file):
-                    logger.info(f"Found assessment file at {assessment_file}")
-                    with open(assessment_file, 'r') as f:
-                        assessment = json.load(f)
-                        
-                        # Load milestones if they exist
-                        milestones_file = os.path.join(assessment_dir, 'milestones.json')
-                        if os.path.exists(milestones_file):
-                            with open(milestones_file, 'r') as mf:
-                                milestones = json.load(mf)
-                                # Calculate progress
-                                total_milestones = len(milestones)
-                                completed_milestones = len([m for m in milestones if m['status'] == 'completed'])
-                                progress = (completed_milestones / total_milestones * 100) if total_milestones > 0 else 0
-                                assessment['progress'] = progress
-                        
-                        assessments.append(assessment)
-        
-        # Sort assessments by created_at
-        assessments.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        # Save to session file for faster access next time
-        if assessments:
-            logger.info(f"Saving {len(assessments)} assessments to session file")
-            with open(session_file, 'w') as f:
-                json.dump({
-                    'assessments': assessments
-                }, f, indent=2)
+        try:
+            page = assessment_store.list_assessments(
+                user_id,
+                limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                cursor=request.args.get('cursor'),
+                summary=(view == 'summary')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        return jsonify({
-            'assessments': assessments
-        })
+        return jsonify(page)
         
     except Exception as e:
         logger.error(f"Error retrieving assessments: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error retrieving assessments: {str(e)}'}), 500
 
+@app.route('/api/get-progress-summary/<user_id>', methods=['GET'])
+def get_progress_summary(user_id):
+    """Get a user's overall milestone completion and the milestones due this week"""
+    try:
+        return jsonify(assessment_store.get_user_rollup(user_id))
+        
+    except Exception as e:
+        logger.error(f"Error retrieving progress summary: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Error retrieving progress summary: {str(e)}'}), 500
+
+@app.route('/api/export/assessments', methods=['GET'])
+def export_assessments_ndjson():
+    """
+    Stream every user's assessments, skill gaps and milestones as NDJSON.
+
+    ?since=<ISO timestamp> limits the export to assessments changed since then.
+    The body is gzipped on the fly with Content-Encoding: gzip when the client
+    accepts it, so HTTP clients decompress it transparently.
+    Requires EXPORT_API_TOKEN as a bearer token; the endpoint is off when it is unset.
+    """
+    if not EXPORT_API_TOKEN:
+        return jsonify({'error': 'Export is disabled'}), 403
+    supplied = request.headers.get('Authorization', '')[len('Bearer '):]
+    if not hmac.compare_digest(supplied.encode(), EXPORT_API_TOKEN.encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        since = parse_since(request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    compress = request.accept_encodings['gzip'] > 0
+    response = Response(
+        stream_with_context(export_assessments(assessment_store, since=since, compress=compress)),
+        mimetype=NDJSON_CONTENT_TYPE
+    )
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Content-Disposition'] = 'attachment; filename=assessments.ndjson'
+    return response
+
 @app.route('/api/get-assessment/<assessment_id>', methods=['GET'])
 def get_assessment(assessment_id):
     """Get a specific assessment by ID"""
     try:
-        # Find the assessment directory
-        assessment_dir = None
-        for user_id in os.listdir(DATA_FOLDER):
-            user_dir = os.path.join(DATA_FOLDER, user_id)
-            if os.path.isdir(user_dir):
-                potential_dir = os.path.join(user_dir, assessment_id)
-                if os.path.isdir(potential_dir):
-                    assessment_dir = potential_dir
-                    break
-        
-        if not assessment_dir:
+        assessment = assessment_store.get_assessment(assessment_id)
+        if not assessment:
             return jsonify({'error': 'Assessment not found'}), 404
         
-        # Load assessment data
-        assessment_file = os.path.join(assessment_dir, 'assessment.json')
-        with open(assessment_file, 'r') as f:
-            assessment = json.load(f)
-        
-        # Load milestones if they exist
-        progress = []
-        milestones_file = os.path.join(assessment_dir, 'milestones.json')
-        if os.path.exists(milestones_file):
-            with open(milestones_file, 'r') as f:
-                progress = json.load(f)
-        
-        # Load learning path if it exists
-        learning_path = []
-        learning_path_file = os.path.join(assessment_dir, 'learning_path.json')
-        if os.path.exists(learning_path_file):
-            with open(learning_path_file, 'r') as f:
-                learning_path = json.load(f)
-        
-        # Load skill gaps if they exist
-        skill_gaps = []
-        skill_gaps_file = os.path.join(assessment_dir, 'skill_gaps.json')
-        if os.path.exists(skill_gaps_file):
-            with open(skill_gaps_file, 'r') as f:
-                skill_gaps = json.load(f)
+        progress = assessment_store.get_progress(assessment_id)
+        
+        # Learning path and skill gaps are sections of the stored analysis
+        analysis = (assessment.get('assessment_data') or {}).get('analysis') or {}
+        learning_path = analysis.get('learning_path', [])
+        skill_gaps = analysis.get('skill_gaps', [])
         
         # Calculate overall progress
         total_milestones = len(progress)
@@ -934,58 +989,18 @@ def get_assessment(assessment_id):
 
 @app.route('/api/update-progress', methods=['POST'])
 def update_progress():
-    """Update the status of a learning milestone"""
+    """Update the status and/or notes of a learning milestone"""
     try:
         data = request.json
         
         # Validate required fields
-        if not data or 'progress_id' not in data or 'status' not in data:
+        if not data or 'progress_id' not in data or ('status' not in data and 'notes' not in data):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        progress_id = data['progress_id']
-        status = data['status']
-        notes = data.get('notes', '')
-        
-        # Find the milestone file
-        milestone_file = None
-        for user_id in os.listdir(DATA_FOLDER):
-            user_dir = os.path.join(DATA_FOLDER, user_id)
-            if os.path.isdir(user_dir):
-                for assessment_id in os.listdir(user_dir):
-                    if assessment_id == 'user_info.json':
-                        continue
-                        
-                    assessment_dir = os.path.join(user_dir, assessment_id)
-                    if os.path.isdir(assessment_dir):
-                        potential_file = os.path.join(assessment_dir, 'milestones.json')
-                        if os.path.exists(potential_file):
-                            with open(potential_file, 'r') as f:
-                                milestones = json.load(f)
-                                for milestone in milestones:
-                                    if milestone['id'] == progress_id:
-                                        milestone_file = potential_file
-                                        # Update milestone
-                                        milestone['status'] = status
-                                        milestone['notes'] = notes
-                                        if status == 'completed':
-                                            milestone['completed_at'] = datetime.now().isoformat()
-                                        else:
-                                            milestone['completed_at'] = None
-                                        break
-                                if milestone_file:
-                                    break
-                    if milestone_file:
-                        break
-                if milestone_file:
-                    break
-        
-        if not milestone_file:
+        # Only the fields present in the request are changed
+        if not assessment_store.update_progress(data['progress_id'], data.get('status'), data.get('notes')):
             return jsonify({'error': 'Milestone not found'}), 404
         
-        # Save updated milestones
-        with open(milestone_file, 'w') as f:
-            json.dump(milestones, f, indent=2)
-        
         return jsonify({
             'message': 'Progress updated successfully'
         })
@@ -994,21 +1009,65 @@ def update_progress():
         logger.error(f"Error updating progress: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error updating progress: {str(e)}'}), 500
 
+# Upper bound on milestone changes accepted by one batch request
+MAX_PROGRESS_BATCH = 500
+
+@app.route('/api/update-progress/batch', methods=['POST'])
+def update_progress_batch():
+    """Apply several milestone status changes in a single transaction"""
+    try:
+        data = request.json
+        updates = data.get('updates') if data else None
+        
+        # Validate required fields
+        if not isinstance(updates, list) or not updates:
+            return jsonify({'error': 'updates must be a non-empty list'}), 400
+        if len(updates) > MAX_PROGRESS_BATCH:
+            return jsonify({'error': f'At most {MAX_PROGRESS_BATCH} updates per request'}), 400
+        for update in updates:
+            if not isinstance(update, dict) or 'progress_id' not in update or \
+                    ('status' not in update and 'notes' not in update):
+                return jsonify({'error': 'Each update needs a progress_id and a status or notes'}), 400
+        
+        updated, not_found = assessment_store.update_progress_batch(updates)
+        logger.info(f"Batch progress update: {len(updated)} updated, {len(not_found)} not found")
+        
+        return jsonify({
+            'message': 'Progress updated successfully',
+            'updated': updated,
+            'not_found': not_found
+        })
+        
+    except Exception as e:
+        logger.error(f"Error updating progress batch: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Error updating progress: {str(e)}'}), 500
+
 @app.route('/api/get-resources/<skill>', methods=['GET'])
 def get_resources(skill):
     """Get learning resources for a specific skill"""
     try:
         max_results = request.args.get('max', 10, type=int)
         
+        # Serve cached listings right away, even stale ones, and queue a crawl of outdated sources
+        crawl_runner.record_request(skill)
+        entries = resource_cache.lookup_many(skill, list(background_scraper.scraper.sources))
+        resources = [resource for _, cached, _ in entries.values() if cached for resource in cached]
+        outdated = [source for source, (state, _, _) in entries.items() if state != FRESH]
+        if outdated:
+            crawl_runner.enqueue(skill, outdated)
+        freshness = {
+            source: {'state': state, 'fetched_at': fetched_at_iso(fetched_at)}
+            for source, (state, _, fetched_at) in entries.items()
+        }
+        
         # Create resources directory if it doesn't exist
         resources_dir = os.path.join(DATA_FOLDER, 'resources')
         os.makedirs(resources_dir, exist_ok=True)
         
-        # Load resources for the skill
+        # Fall back to resources saved by earlier scrapes
         skill_file = os.path.join(resources_dir, f"{skill.lower().replace(' ', '_')}.json")
-        resources = []
         
-        if os.path.exists(skill_file):
+        if not resources and os.path.exists(skill_file):
             with open(skill_file, 'r') as f:
                 resources = json.load(f)
         
@@ -1070,7 +1129,7 @@ def get_resources(skill):
             ]
         
         # Sort resources by rating if available
-        resources.sort(key=lambda x: x.get('rating', 0), reverse=True)
+        resources.sort(key=lambda x: x.get('rating') or 0, reverse=True)
         
         # Ensure we have a mix of resource types
         resource_types = ['course', 'video', 'documentation']
@@ -1087,272 +1146,352 @@ def get_resources(skill):
         
         return jsonify({
             'skill': skill,
-            'resources': final_resources[:max_results]
+            'resources': final_resources[:max_results],
+            'sources': freshness
         })
         
     except Exception as e:
         logger.error(f"Error retrieving resources: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error retrieving resources: {str(e)}'}), 500
 
-@app.route('/api/generate-assessment', methods=['POST'])
-def generate_assessment():
-    try:
-        # Check for data in form
-        topic = request.form.get('topic')
-        resume_file = request.files.get('resume')
-        
-        # Also check for JSON data if not in form
-        if not topic and request.is_json:
-            data = request.json
-            topic = data.get('topic')
-            
-        if not topic and not resume_file:
-            return jsonify({'error': 'Either topic or resume must be provided'}), 400
-
-        logger.info(f"Generating assessment for topic: {topic}")
+# Question arrays the assessment prompt may produce, with the type implied by each
+ASSESSMENT_QUESTION_ARRAYS = {
+    'questions': None,
+    'multiple_choice_questions': 'multiple_choice',
+    'coding_questions': 'coding'
+}
+MAX_ASSESSMENT_QUESTIONS = 20
 
-        # Extract skills from resume if provided
-        skills = []
-        if resume_file:
-            if not allowed_file(resume_file.filename):
-                return jsonify({'error': 'Invalid file type'}), 400
-            
-            filename = secure_filename(resume_file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            resume_file.save(file_path)
-            
-            # Extract text from resume
-            text = extract_text_from_file(file_path)
-            skills = extract_skills_from_text(text)
-            
-            # Clean up the file
-            os.remove(file_path)
-
-        # Determine if coding questions are appropriate for this topic
-        # List of topics that are well-suited for coding questions
-        coding_relevant_topics = [
-            'programming', 'coding', 'python', 'javascript', 'java', 'c++', 'web development',
-            'software engineering', 'data structures', 'algorithms', 'react', 'angular', 'vue',
-            'node.js', 'backend', 'frontend', 'fullstack', 'data science', 'machine learning'
-        ]
+def parse_generate_assessment_request():
+    """
+    Read the topic and optional resume from a generate-assessment request.
+    
+    Returns a tuple of (topic, skills, error_response).
+    """
+    # Check for data in form
+    topic = request.form.get('topic')
+    resume_file = request.files.get('resume')
+    
+    # Also check for JSON data if not in form
+    if not topic and request.is_json:
+        data = request.json
+        topic = data.get('topic')
         
-        # Check if any of the coding-relevant topics are in the user's topic
-        topic_lower = topic.lower()
-        include_coding = any(coding_topic in topic_lower for coding_topic in coding_relevant_topics)
-        
-        # Generate questions using Groq
-        if include_coding:
-            # Include a mix of multiple choice and optional coding questions
-            question_structure = """
-            Create a comprehensive assessment with a total of 10-15 questions maximum (limiting to 20 absolute maximum if complex topics):
-            - The majority should be multiple-choice questions that test theoretical knowledge and practical understanding
-            - Include 1-2 coding questions only if appropriate for the topic
-            
-            For multiple-choice questions, provide:
-            1. A clear and specific question
-            2. Four possible answers (A, B, C, D)
-            3. The correct answer
-            
-            For coding questions (only if topic is programming-related), provide:
-            1. A clear problem statement
-            2. Input and expected output examples
-            3. Constraints or requirements
-            4. A starter code template (if applicable)
-            5. The correct solution code
-            """
-        else:
-            # Only include multiple choice questions for non-coding topics
-            question_structure = """
-            Create a comprehensive assessment with a total of 10-15 questions maximum (limiting to 20 absolute maximum if complex topics):
-            - All questions should be multiple-choice that thoroughly test both theoretical knowledge and practical understanding
-            
-            For each question, provide:
-            1. A clear and specific question
-            2. Four possible answers (A, B, C, D)
-            3. The correct answer
-            """
+    if not topic and not resume_file:
+        return None, None, (jsonify({'error': 'Either topic or resume must be provided'}), 400)
+
+    logger.info(f"Generating assessment for topic: {topic}")
 
-        prompt = f"""Generate a comprehensive skill assessment.
-        {'Based on the following skills: ' + ', '.join(skills) if skills else f'On the topic of: {topic}'}
+    # Extract skills from resume if provided
+    skills = []
+    if resume_file:
+        if not allowed_file(resume_file.filename):
+            return None, None, (jsonify({'error': 'Invalid file type'}), 400)
         
-        {question_structure}
+        filename = secure_filename(resume_file.filename)
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        resume_file.save(file_path)
         
-        Format the response as a JSON object with the following structure:
-        {{
-            "questions": [
-                {{
-                    "question": "Question text",
-                    "options": ["Option A", "Option B", "Option C", "Option D"],
-                    "correctAnswer": "Option A",
-                    "type": "multiple_choice"
-                }},
-                // Additional multiple choice questions...
-                
-                // Only include coding questions if topic is programming-related
-                {{
-                    "question": "Problem statement",
-                    "examples": [
-                        {{
-                            "input": "Example input",
-                            "output": "Expected output"
-                        }}
-                    ],
-                    "constraints": "Any constraints or requirements",
-                    "starter_code": "// starter code template if applicable",
-                    "solution": "// correct solution code",
-                    "type": "coding"
-                }}
-                // Maximum 1-2 coding questions if applicable
-            ],
-            "topic": "{topic if topic else 'Skill Assessment'}"
-        }}
+        # Extract text from resume
+        text = extract_text_from_file(file_path)
+        skills = extract_skills_from_text(text)
         
-        VERY IMPORTANT: 
-        1. Return ONLY the JSON object without any additional text, comments, markdown formatting, or explanations.
-        2. Ensure the questions are of medium difficulty level.
-        3. Include a mix of theoretical and practical questions.
-        4. LIMIT THE TOTAL NUMBER OF QUESTIONS TO 20 MAXIMUM, preferably 10-15 for most topics.
-        5. Only include coding questions if the topic is directly related to programming or software development."""
+        # Clean up the file
+        os.remove(file_path)
+    
+    return topic, skills, None
+
+def build_assessment_messages(topic, skills):
+    """Build the Groq messages for generating an assessment"""
+    # Determine if coding questions are appropriate for this topic
+    # List of topics that are well-suited for coding questions
+    coding_relevant_topics = [
+        'programming', 'coding', 'python', 'javascript', 'java', 'c++', 'web development',
+        'software engineering', 'data structures', 'algorithms', 'react', 'angular', 'vue',
+        'node.js', 'backend', 'frontend', 'fullstack', 'data science', 'machine learning'
+    ]
+    
+    # Check if any of the coding-relevant topics are in the user's topic or skills
+    topic_lower = (topic or ' '.join(skills)).lower()
+    include_coding = any(coding_topic in topic_lower for coding_topic in coding_relevant_topics)
+    # Generate questions using Groq
+    if include_coding:
+        # Include a mix of multiple choice and optional coding questions
+        question_structure = """
+        Create a comprehensive assessment with a total of 10-15 questions maximum (limiting to 20 absolute maximum if complex topics):
+        - The majority should be multiple-choice questions that test theoretical knowledge and practical understanding
+        - Include 1-2 coding questions only if appropriate for the topic
+        
+        For multiple-choice questions, provide:
+        1. A clear and specific question
+        2. Four possible answers (A, B, C, D)
+        3. The correct answer
+        
+        For coding questions (only if topic is programming-related), provide:
+        1. A clear problem statement
+        2. Input and expected output examples
+        3. Constraints or requirements
+        4. A starter code template (if applicable)
+        5. The correct solution code
+        """
+    else:
+        # Only include multiple choice questions for non-coding topics
+        question_structure = """
+        Create a comprehensive assessment with a total of 10-15 questions maximum (limiting to 20 absolute maximum if complex topics):
+        - All questions should be multiple-choice that thoroughly test both theoretical knowledge and practical understanding
+        
+        For each question, provide:
+        1. A clear and specific question
+        2. Four possible answers (A, B, C, D)
+        3. The correct answer
+        """
+
+    prompt = f"""Generate a comprehensive skill assessment.
+    {'Based on the following skills: ' + ', '.join(skills) if skills else f'On the topic of: {topic}'}
+    
+    {question_structure}
+    
+    Format the response as a JSON object with the following structure:
+    {{
+        "questions": [
+            {{
+                "question": "Question text",
+                "options": ["Option A", "Option B", "Option C", "Option D"],
+                "correctAnswer": "Option A",
+                "type": "multiple_choice"
+            }},
+            // Additional multiple choice questions...
+            
+            // Only include coding questions if topic is programming-related
+            {{
+                "question": "Problem statement",
+                "examples": [
+                    {{
+                        "input": "Example input",
+                        "output": "Expected output"
+                    }}
+                ],
+                "constraints": "Any constraints or requirements",
+                "starter_code": "// starter code template if applicable",
+                "solution": "// correct solution code",
+                "type": "coding"
+            }}
+            // Maximum 1-2 coding questions if applicable
+        ],
+        "topic": "{topic if topic else 'Skill Assessment'}"
+    }}
+    
+    VERY IMPORTANT: 
+    1. Return ONLY the JSON object without any additional text, comments, markdown formatting, or explanations.
+    2. Ensure the questions are of medium difficulty level.
+    3. Include a mix of theoretical and practical questions.
+    4. LIMIT THE TOTAL NUMBER OF QUESTIONS TO 20 MAXIMUM, preferably 10-15 for most topics.
+    5. Only include coding questions if the topic is directly related to programming or software development."""
+
+    messages = [
+        {"role": "system", "content": "You are an expert at creating skill assessment questions. Always respond with only the requested JSON format, without any additional text or explanations. IMPORTANT: Limit the total number of questions to 20 maximum."},
+        {"role": "user", "content": prompt}
+    ]
+    return messages
 
-        completion = groq_client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an expert at creating skill assessment questions. Always respond with only the requested JSON format, without any additional text or explanations. IMPORTANT: Limit the total number of questions to 20 maximum."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4000,
-            top_p=1,
-            stream=False
-        )
+def normalize_assessment_question(question, index, default_type=None):
+    """
+    Fill in defaults and normalize one generated question.
+    
+    Returns the question, or None if it is a multiple choice question without
+    a usable options list.
+    """
+    # Add type if not present (assume multiple choice as default)
+    if 'type' not in question:
+        if default_type:
+            question['type'] = default_type
+        elif 'options' in question:
+            question['type'] = 'multiple_choice'
+        else:
+            question['type'] = 'coding'
+    
+    # Process multiple choice questions
+    if question['type'] == 'multiple_choice':
+        # Make sure we have options as a list
+        if 'options' not in question or not isinstance(question['options'], list):
+            logger.error(f"Missing or invalid 'options' in question {index+1}")
+            return None
+        
+        # Convert correctAnswer from letter to option text if needed
+        if 'correctAnswer' in question and question['correctAnswer'] in ['A', 'B', 'C', 'D']:
+            option_index = ord(question['correctAnswer']) - ord('A')
+            if 0 <= option_index < len(question['options']):
+                question['correctAnswer'] = question['options'][option_index]
+    
+    # Process coding questions
+    elif question['type'] == 'coding':
+        # Ensure required fields
+        required_fields = ['question', 'solution']
+        for field in required_fields:
+            if field not in question:
+                logger.error(f"Missing '{field}' in coding question {index+1}")
+                question[field] = f"Default {field} for coding question {index+1}"
+        
+        # Add empty arrays/fields if missing
+        if 'examples' not in question or not isinstance(question['examples'], list):
+            question['examples'] = []
+        
+        if 'constraints' not in question:
+            question['constraints'] = "No specific constraints"
+        
+        if 'starter_code' not in question:
+            question['starter_code'] = "// Write your solution here"
+    
+    return question
 
-        response_text = completion.choices[0].message.content
-        logger.info(f"Raw response from Groq (first 200 chars): {response_text[:200]}")
+def iter_assessment_questions(messages):
+    """
+    Stream an assessment from Groq and yield each question once it is complete and validated.
+    
+    The completion is parsed incrementally, so the first questions are
+    available while the rest are still being generated. The stream is only
+    closed early once the question limit is reached; otherwise it is read to
+    the end, even after the last array closes, so the completion gets cached.
+    """
+    stream = groq_client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=messages,
+        temperature=0.7,
+        max_tokens=4000,
+        top_p=1,
+        stream=True,
+        priority=PRIORITY_ASSESSMENT
+    )
+    
+    parser = JSONArrayItemStream(ASSESSMENT_QUESTION_ARRAYS.keys())
+    endpoint = current_endpoint()
+    count = 0
+    try:
+        for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text or parser.done:
+                continue
+            for array_key, question in parser.feed(text):
+                question = normalize_assessment_question(question, count, ASSESSMENT_QUESTION_ARRAYS[array_key])
+                if question is None:
+                    continue
+                count += 1
+                yield question
+                if count >= MAX_ASSESSMENT_QUESTIONS:
+                    logger.warning(f"Reached {MAX_ASSESSMENT_QUESTIONS} questions, stopping generation")
+                    return
+    finally:
+        # Stop the upstream generation if the consumer stops early
+        close = getattr(stream, 'close', None)
+        if close:
+            close()
+        # Each streamed item is parsed on its own, so record one result per question
+        record_json_parse(endpoint, True, count)
+        if parser.invalid_items:
+            record_json_parse(endpoint, False, parser.invalid_items)
+            logger.warning(f"Skipped {parser.invalid_items} malformed questions")
+
+@app.route('/api/generate-assessment', methods=['POST'])
+def generate_assessment():
+    try:
+        topic, skills, error_response = parse_generate_assessment_request()
+        if error_response:
+            return error_response
         
-        try:
-            # Try to extract JSON from markdown if present
-            import re
-            json_match = re.search(r'```(?:json)?(.*?)```', response_text, re.DOTALL)
-            if json_match:
-                # Extract JSON from markdown code block
-                cleaned_json = json_match.group(1).strip()
-                logger.info(f"Extracted JSON from markdown code block")
-            else:
-                # Try to find JSON object within the text
-                json_match = re.search(r'({.*})', response_text, re.DOTALL)
-                if json_match:
-                    cleaned_json = json_match.group(1).strip()
-                    logger.info(f"Extracted JSON from text")
-                else:
-                    # Use the full response as is
-                    cleaned_json = response_text.strip()
-                    logger.info(f"Using full response as JSON")
-            
-            assessment_data = json.loads(cleaned_json)
-            
-            # Handle different response formats
-            questions = []
-            
-            # Check if the response uses the new format with separate arrays
-            if 'multiple_choice_questions' in assessment_data and 'coding_questions' in assessment_data:
-                # Add type field to each question if not present
-                for q in assessment_data['multiple_choice_questions']:
-                    if 'type' not in q:
-                        q['type'] = 'multiple_choice'
-                    questions.append(q)
-                
-                for q in assessment_data['coding_questions']:
-                    if 'type' not in q:
-                        q['type'] = 'coding'
-                    questions.append(q)
-                
-                # Create a standard format
-                assessment_data['questions'] = questions
-            elif 'questions' not in assessment_data:
-                logger.error("No questions field in assessment data")
-                return jsonify({'error': 'Invalid assessment data format'}), 500
-            
-            # Validate the assessment data structure
-            if not isinstance(assessment_data['questions'], list):
-                logger.error("Invalid 'questions' field in assessment data")
-                return jsonify({'error': 'Invalid assessment data format'}), 500
-            
-            # Limit the number of questions to 20 maximum
-            if len(assessment_data['questions']) > 20:
-                logger.warning(f"Too many questions generated ({len(assessment_data['questions'])}), limiting to 20")
-                assessment_data['questions'] = assessment_data['questions'][:20]
-                
-            # Ensure each question has the required fields and format them correctly
-            for i, question in enumerate(assessment_data['questions']):
-                # Add type if not present (assume multiple choice as default)
-                if 'type' not in question:
-                    if 'options' in question:
-                        question['type'] = 'multiple_choice'
-                    else:
-                        question['type'] = 'coding'
-                
-                # Process multiple choice questions
-                if question['type'] == 'multiple_choice':
-                    # Make sure we have options as a list
-                    if 'options' not in question or not isinstance(question['options'], list):
-                        logger.error(f"Missing or invalid 'options' in question {i+1}")
-                        return jsonify({'error': f'Invalid options format in question {i+1}'}), 500
-                    
-                    # Convert correctAnswer from letter to option text if needed
-                    if 'correctAnswer' in question and question['correctAnswer'] in ['A', 'B', 'C', 'D']:
-                        index = ord(question['correctAnswer']) - ord('A')
-                        if 0 <= index < len(question['options']):
-                            question['correctAnswer'] = question['options'][index]
-                
-                # Process coding questions
-                elif question['type'] == 'coding':
-                    # Ensure required fields
-                    required_fields = ['question', 'solution']
-                    for field in required_fields:
-                        if field not in question:
-                            logger.error(f"Missing '{field}' in coding question {i+1}")
-                            question[field] = f"Default {field} for coding question {i+1}"
-                    
-                    # Add empty arrays/fields if missing
-                    if 'examples' not in question or not isinstance(question['examples'], list):
-                        question['examples'] = []
-                    
-                    if 'constraints' not in question:
-                        question['constraints'] = "No specific constraints"
-                    
-                    if 'starter_code' not in question:
-                        question['starter_code'] = "// Write your solution here"
-                
-            logger.info(f"Successfully processed assessment with {len(assessment_data['questions'])} questions")
-            return jsonify(assessment_data)
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {str(e)}")
-            logger.error(f"Raw response: {response_text}")
+        messages = build_assessment_messages(topic, skills)
+        questions = list(iter_assessment_questions(messages))
+        
+        if not questions:
+            logger.error("No valid questions in generated assessment")
             return jsonify({'error': 'Failed to generate assessment'}), 500
+        
+        logger.info(f"Successfully processed assessment with {len(questions)} questions")
+        return jsonify({
+            'questions': questions,
+            'topic': topic if topic else 'Skill Assessment'
+        })
 
     except Exception as e:
         logger.error(f"Error in generate_assessment: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
-# Configure Milvus vector database connection
-if MILVUS_ENABLED:
+@app.route('/api/generate-assessment/stream', methods=['POST'])
+def generate_assessment_stream():
+    """Streaming variant of generate-assessment that sends each question as a server-sent event"""
     try:
-        # Check if MILVUS_HOST environment variable exists, otherwise use default
-        MILVUS_HOST = os.environ.get('MILVUS_HOST', 'localhost')
-        MILVUS_PORT = os.environ.get('MILVUS_PORT', '19530')
-        
-        connections.connect(
-            alias="default", 
-            host=MILVUS_HOST,
-            port=MILVUS_PORT
+        topic, skills, error_response = parse_generate_assessment_request()
+        if error_response:
+            return error_response
+        
+        messages = build_assessment_messages(topic, skills)
+        
+        def generate():
+            count = 0
+            try:
+                for question in iter_assessment_questions(messages):
+                    count += 1
+                    yield format_sse({'question': question}, event='question')
+            except Exception as e:
+                logger.error(f"Error streaming assessment: {str(e)}", exc_info=True)
+                yield format_sse({'error': str(e)}, event='error')
+                return
+            
+            if not count:
+                yield format_sse({'error': 'Failed to generate assessment'}, event='error')
+                return
+            yield format_sse({'topic': topic if topic else 'Skill Assessment', 'count': count}, event='done')
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
         )
-        logger.info(f"Successfully connected to Milvus at {MILVUS_HOST}:{MILVUS_PORT}")
+        
     except Exception as e:
-        logger.warning(f"Could not connect to Milvus: {str(e)}. Vector search will be disabled.")
-        MILVUS_ENABLED = False
-else:
-    logger.warning("Vector database features are disabled.")
+        logger.error(f"Error in generate_assessment_stream: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+# Configure Milvus vector database connection
+# Check if MILVUS_HOST environment variable exists, otherwise use default
+MILVUS_HOST = os.environ.get('MILVUS_HOST', 'localhost')
+MILVUS_PORT = os.environ.get('MILVUS_PORT', '19530')
+_milvus_connected = False
+_milvus_lock = threading.Lock()
+
+def milvus_ready():
+    """Connect to Milvus and create collections on first use; return whether it is available"""
+    global MILVUS_ENABLED, _milvus_connected
+    global connections, utility, FieldSchema, CollectionSchema, DataType, Collection
+    if not MILVUS_ENABLED:
+        return False
+    if _milvus_connected:
+        return True
+    
+    with _milvus_lock:
+        if _milvus_connected or not MILVUS_ENABLED:
+            return MILVUS_ENABLED
+        try:
+            from pymilvus import connections, utility, FieldSchema, CollectionSchema, DataType, Collection
+            connections.connect(
+                alias="default", 
+                host=MILVUS_HOST,
+                port=MILVUS_PORT
+            )
+            logger.info(f"Successfully connected to Milvus at {MILVUS_HOST}:{MILVUS_PORT}")
+            _milvus_connected = True
+        except Exception as e:
+            logger.warning(f"Could not connect to Milvus: {str(e)}. Vector search will be disabled.")
+            MILVUS_ENABLED = False
+            return False
+        
+        try:
+            setup_milvus_collection()
+        except Exception as e:
+            logger.warning(f"Could not set up Milvus collections: {str(e)}")
+    return True
 
 # Define vector dimension for embeddings
 VECTOR_DIM = 1536  # Appropriate for most embedding models
@@ -1411,16 +1550,9 @@ def setup_milvus_collection():
         logger.error(f"Error setting up Milvus collections: {str(e)}")
         return False
 
-# Try to set up collections on startup
-if MILVUS_ENABLED:
-    try:
-        setup_milvus_collection()
-    except Exception as e:
-        logger.warning(f"Could not set up Milvus collections: {str(e)}")
-
 async def get_embedding(text, model="text-embedding-ada-002"):
     """Generate embedding for text using Groq API"""
-    if not MILVUS_ENABLED:
+    if not milvus_ready():
         return np.random.rand(VECTOR_DIM).tolist()
         
     try:
@@ -1484,7 +1616,7 @@ def is_educational_query(query):
 
 def store_message_embedding(user_id, message, message_id=None, role="user"):
     """Store message with embedding in vector database"""
-    if not MILVUS_ENABLED:
+    if not milvus_ready():
         return None
         
     try:
@@ -1523,7 +1655,7 @@ def store_message_embedding(user_id, message, message_id=None, role="user"):
 
 def get_relevant_message_history(user_id, current_query, limit=5):
     """Retrieve relevant previous messages based on semantic similarity"""
-    if not MILVUS_ENABLED:
+    if not milvus_ready():
         return []
         
     try:
@@ -1598,10 +1730,11 @@ def upload_pdf_for_chat():
                 else:
                     return jsonify({'error': 'Only PDF files are supported'}), 400
                 
-                # Generate a summary of the PDF using Groq
+                # Generate a summary of the PDF using Groq, compacting the text to the token budget
+                summary_text = prompt_budgeter.fit_text('upload_pdf_summary', text)
                 prompt = f"""Summarize the key points of the following document:
 
-{text[:15000]}  # Limit text to prevent token limits
+{summary_text}
 
 Provide only the most important information without adding any personal opinions or comments.
 If the document appears to be cut off, focus on summarizing the available content.
@@ -1618,13 +1751,14 @@ If the content seems technical or domain-specific, include relevant terminology.
                     temperature=0.3,
                     max_tokens=1000,
                     top_p=1,
-                    stream=False
+                    stream=False,
+                    priority=PRIORITY_INTERACTIVE
                 )
                 
                 summary = completion.choices[0].message.content
                 
                 # Store document chunks in vector database if Milvus is available
-                if MILVUS_ENABLED:
+                if milvus_ready():
                     user_id = request.args.get('user_id', 'anonymous')
                     
                     try:
@@ -1703,48 +1837,7 @@ If the content seems technical or domain-specific, include relevant terminology.
         logger.error(f"Unexpected error in upload_pdf_for_chat: {str(e)}", exc_info=True)
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
-@app.route('/api/learn-with-ai/chat', methods=['POST'])
-def learn_with_ai_chat():
-    try:
-        # Get request data
-        if not request.is_json:
-            return jsonify({'error': 'Request must be JSON'}), 400
-            
-        data = request.json
-        user_message = data.get('message')
-        chat_history = data.get('history', [])
-        file_contexts = data.get('files', [])
-        user_id = data.get('userId', 'anonymous')  # Get user ID for context storage
-        
-        if not user_message:
-            return jsonify({'error': 'Message is required'}), 400
-            
-        # Check if the query is appropriate for educational context
-        if not is_educational_query(user_message):
-            return jsonify({
-                'message': "I'm sorry, but I can only provide assistance with educational and career-related topics. Please ask me about learning paths, skill development, educational resources, or career guidance.",
-                'timestamp': datetime.now().isoformat()
-            })
-            
-        # Store the user message in vector DB for context
-        try:
-            store_message_embedding(user_id, user_message)
-        except Exception as e:
-            logger.warning(f"Failed to store message: {str(e)}")
-            
-        # Retrieve relevant past messages to enhance context
-        relevant_history = []
-        try:
-            relevant_history = get_relevant_message_history(user_id, user_message)
-            logger.info(f"Retrieved {len(relevant_history)} relevant history items")
-        except Exception as e:
-            logger.warning(f"Failed to retrieve message history: {str(e)}")
-            
-        # Format the conversation history for the AI
-        messages = [
-            {
-                "role": "system", 
-                "content": """You are an educational AI assistant specialized in career development and learning paths.
+LEARN_WITH_AI_SYSTEM_PROMPT = """You are an educational AI assistant specialized in career development and learning paths.
                 Your goal is to help users develop their skills, understand career options, and create personalized learning plans.
                 Provide specific, actionable guidance based on the user's interests, goals, and current skill level.
                 For learning resources, suggest specific courses, books, websites, and practice projects.
@@ -1759,61 +1852,118 @@ def learn_with_ai_chat():
                 4. Use bullet points, numbered lists, and clear formatting to make your responses easy to read.
                 5. Always stay positive, encouraging, and focused on the user's learning journey.
                 """
-            }
-        ]
+
+def prepare_learn_with_ai_chat(data):
+    """
+    Validate a Learn With AI chat request and build the Groq message list.
+    
+    Returns a tuple of (messages, canned_reply). When canned_reply is set the
+    request should be answered with it directly, without calling the LLM.
+    """
+    user_message = data.get('message')
+    chat_history = data.get('history', [])
+    file_contexts = data.get('files', [])
+    user_id = data.get('userId', 'anonymous')  # Get user ID for context storage
+    
+    # Check if the query is appropriate for educational context
+    if not is_educational_query(user_message):
+        return None, "I'm sorry, but I can only provide assistance with educational and career-related topics. Please ask me about learning paths, skill development, educational resources, or career guidance."
         
-        # Add relevant past context if available
-        if relevant_history:
-            relevant_context = "Based on your previous conversations, you've discussed these topics:\n\n"
-            for i, item in enumerate(relevant_history[:3]):  # Use top 3 most relevant items
-                relevant_context += f"- {item['content']}\n"
-            
-            messages.append({
-                "role": "system",
-                "content": relevant_context
-            })
+    # Store the user message in vector DB for context
+    try:
+        store_message_embedding(user_id, user_message)
+    except Exception as e:
+        logger.warning(f"Failed to store message: {str(e)}")
         
-        # Add PDF contexts if available
-        if file_contexts and len(file_contexts) > 0:
-            pdf_context = "The user has shared the following document(s):\n\n"
-            
-            for i, file in enumerate(file_contexts):
-                # Truncate content if it's too long to fit in context window
-                content = file.get('content', '')
-                if len(content) > 10000:  # Limit content length
-                    content = content[:10000] + "... [content truncated]"
-                    
-                pdf_context += f"DOCUMENT {i+1}: {file.get('name', 'Unnamed document')}\n"
-                pdf_context += f"CONTENT: {content}\n\n"
-            
-            messages.append({
-                "role": "system",
-                "content": pdf_context
-            })
-            
-            # Add a reminder to refer to PDFs
-            messages.append({
-                "role": "system",
-                "content": "Remember to reference the document content when answering questions about the documents. If asked to analyze, summarize, or explain content from the documents, do so based on the content provided."
-            })
+    # Retrieve relevant past messages to enhance context
+    relevant_history = []
+    try:
+        relevant_history = get_relevant_message_history(user_id, user_message)
+        logger.info(f"Retrieved {len(relevant_history)} relevant history items")
+    except Exception as e:
+        logger.warning(f"Failed to retrieve message history: {str(e)}")
+        
+    # Format the conversation history for the AI
+    messages = [
+        {
+            "role": "system", 
+            "content": LEARN_WITH_AI_SYSTEM_PROMPT
+        }
+    ]
+    
+    # Add relevant past context if available
+    if relevant_history:
+        relevant_context = "Based on your previous conversations, you've discussed these topics:\n\n"
+        for i, item in enumerate(relevant_history[:3]):  # Use top 3 most relevant items
+            relevant_context += f"- {item['content']}\n"
+        
+        messages.append({
+            "role": "system",
+            "content": relevant_context
+        })
+    
+    # Add PDF contexts if available
+    if file_contexts and len(file_contexts) > 0:
+        pdf_context = "The user has shared the following document(s):\n\n"
+        
+        for i, file in enumerate(file_contexts):
+            # Truncate content if it's too long to fit in context window
+            content = file.get('content', '')
+            if len(content) > 10000:  # Limit content length
+                content = content[:10000] + "... [content truncated]"
+                
+            pdf_context += f"DOCUMENT {i+1}: {file.get('name', 'Unnamed document')}\n"
+            pdf_context += f"CONTENT: {content}\n\n"
         
-        # Add conversation history
-        for msg in chat_history:
-            messages.append({
-                "role": msg['role'],
-                "content": msg['content']
-            })
-            
-        # Add the latest user message
         messages.append({
-            "role": "user",
-            "content": user_message
+            "role": "system",
+            "content": pdf_context
         })
         
-        # If user mentions PDF but no files are uploaded, add a hint
-        if ("pdf" in user_message.lower() or "document" in user_message.lower()) and not file_contexts:
+        # Add a reminder to refer to PDFs
+        messages.append({
+            "role": "system",
+            "content": "Remember to reference the document content when answering questions about the documents. If asked to analyze, summarize, or explain content from the documents, do so based on the content provided."
+        })
+    
+    # Add conversation history
+    for msg in chat_history:
+        messages.append({
+            "role": msg['role'],
+            "content": msg['content']
+        })
+        
+    # Add the latest user message
+    messages.append({
+        "role": "user",
+        "content": user_message
+    })
+    
+    # If user mentions PDF but no files are uploaded, add a hint
+    if ("pdf" in user_message.lower() or "document" in user_message.lower()) and not file_contexts:
+        return None, "I don't see any PDFs uploaded yet. To use this feature, please click the 'Upload PDF' button above the chat and select a PDF file. Once uploaded, you can ask me questions about its content!"
+    
+    # Keep the prompt within budget by trimming old history and oversized documents
+    messages = prompt_budgeter.fit_messages('learn_with_ai_chat', messages)
+    return messages, None
+
+@app.route('/api/learn-with-ai/chat', methods=['POST'])
+def learn_with_ai_chat():
+    try:
+        # Get request data
+        if not request.is_json:
+            return jsonify({'error': 'Request must be JSON'}), 400
+            
+        data = request.json
+        user_id = data.get('userId', 'anonymous')
+        
+        if not data.get('message'):
+            return jsonify({'error': 'Message is required'}), 400
+            
+        messages, canned_reply = prepare_learn_with_ai_chat(data)
+        if canned_reply:
             return jsonify({
-                'message': "I don't see any PDFs uploaded yet. To use this feature, please click the 'Upload PDF' button above the chat and select a PDF file. Once uploaded, you can ask me questions about its content!",
+                'message': canned_reply,
                 'timestamp': datetime.now().isoformat()
             })
         
@@ -1824,7 +1974,8 @@ def learn_with_ai_chat():
             temperature=0.7,
             max_tokens=1000,
             top_p=1,
-            stream=False
+            stream=False,
+            priority=PRIORITY_INTERACTIVE
         )
         
         # Extract and return the AI response
@@ -1845,12 +1996,82 @@ def learn_with_ai_chat():
         logger.error(f"Error in Learn With AI chat: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error processing request: {str(e)}'}), 500
 
-def fetch_job_description_from_groq(job_title: str) -> str:
+def format_sse(data, event=None):
+    """Format a payload as a server-sent event"""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+@app.route('/api/learn-with-ai/chat/stream', methods=['POST'])
+def learn_with_ai_chat_stream():
+    """Streaming variant of the Learn With AI chat that forwards tokens as server-sent events"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Request must be JSON'}), 400
+            
+        data = request.json
+        user_id = data.get('userId', 'anonymous')
+        
+        if not data.get('message'):
+            return jsonify({'error': 'Message is required'}), 400
+            
+        messages, canned_reply = prepare_learn_with_ai_chat(data)
+        
+        def generate():
+            if canned_reply:
+                yield format_sse({'token': canned_reply})
+                yield format_sse({'message': canned_reply, 'timestamp': datetime.now().isoformat()}, event='done')
+                return
+            
+            parts = []
+            try:
+                stream = groq_client.chat.completions.create(
+                    model=GROQ_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000,
+                    top_p=1,
+                    stream=True,
+                    priority=PRIORITY_INTERACTIVE
+                )
+                for chunk in stream:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        yield format_sse({'token': token})
+            except Exception as e:
+                logger.error(f"Error streaming Learn With AI chat: {str(e)}", exc_info=True)
+                yield format_sse({'error': f'Error processing request: {str(e)}'}, event='error')
+                return
+            
+            ai_response = ''.join(parts)
+            yield format_sse({'message': ai_response, 'timestamp': datetime.now().isoformat()}, event='done')
+            
+            # Store AI response in vector DB once the full answer has been sent
+            try:
+                store_message_embedding(user_id, ai_response, role="assistant")
+            except Exception as e:
+                logger.warning(f"Failed to store AI response: {str(e)}")
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in Learn With AI chat stream: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Error processing request: {str(e)}'}), 500
+
+def fetch_job_description_from_groq(job_title: str, priority: int = PRIORITY_ASSESSMENT) -> str:
     """
     Fetch a general job description for a given job title using GROQ API.
     
     Args:
         job_title: The job title to fetch description for.
+        priority: Scheduler priority class for the request.
         
     Returns:
         A string containing the job description.
@@ -1868,16 +2089,19 @@ def fetch_job_description_from_groq(job_title: str) -> str:
 Keep the description professional, detailed, and realistic as if it were from a top company in the industry.
 """
 
+        messages = [
+            {"role": "system", "content": "You are a professional HR and recruiting expert specializing in technical roles."},
+            {"role": "user", "content": prompt}
+        ]
+        prompt_budgeter.measure('fetch_job_description', messages)
         completion = groq_client.chat.completions.create(
             model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a professional HR and recruiting expert specializing in technical roles."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.7,
             max_tokens=1000,
             top_p=1,
-            stream=False
+            stream=False,
+            priority=priority
         )
         
         # Get the job description from response
@@ -1897,52 +2121,10 @@ Keep the description professional, detailed, and realistic as if it were from a
 def delete_assessment(assessment_id):
     """Delete a specific assessment by ID"""
     try:
-        # Find the assessment directory
-        assessment_dir = None
-        user_id = None
-        
-        for uid in os.listdir(DATA_FOLDER):
-            user_dir = os.path.join(DATA_FOLDER, uid)
-            if os.path.isdir(user_dir):
-                potential_dir = os.path.join(user_dir, assessment_id)
-                if os.path.isdir(potential_dir):
-                    assessment_dir = potential_dir
-                    user_id = uid
-                    break
-        
-        if not assessment_dir or not user_id:
+        user_id = assessment_store.delete_assessment(assessment_id)
+        if not user_id:
             return jsonify({'error': 'Assessment not found'}), 404
-        
-        # Delete all files in the assessment directory
-        for file_name in os.listdir(assessment_dir):
-            file_path = os.path.join(assessment_dir, file_name)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                    logger.info(f"Deleted file {file_path}")
-            except Exception as e:
-                logger.error(f"Error deleting file {file_path}: {str(e)}")
-        
-        # Remove the directory
-        os.rmdir(assessment_dir)
-        logger.info(f"Deleted assessment directory {assessment_dir}")
-        
-        # Update the session file
-        session_file = os.path.join(DATA_FOLDER, f"session_{user_id}.json")
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                # Filter out the deleted assessment
-                assessments = [a for a in session_data.get('assessments', []) if a.get('id') != assessment_id]
-                
-                # Save updated session data
-                with open(session_file, 'w') as f:
-                    json.dump({'assessments': assessments}, f, indent=2)
-                logger.info(f"Updated session file after deletion")
-            except Exception as e:
-                logger.error(f"Error updating session file: {str(e)}")
+        logger.info(f"Deleted assessment {assessment_id} for user {user_id}")
         
         return jsonify({
             'message': 'Assessment deleted successfully',
@@ -1953,5 +2135,49 @@ def delete_assessment(assessment_id):
         logger.error(f"Error deleting assessment: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error deleting assessment: {str(e)}'}), 500
 
+def warmup(check_groq=False):
+    """
+    Explicitly initialize lazily-loaded dependencies before serving traffic.
+    
+    Called from the gunicorn post_worker_init hook (see gunicorn.conf.py) so
+    the first request does not pay for loading spaCy or connecting to Milvus.
+    Failures are logged rather than raised, so a worker can still boot offline.
+    """
+    try:
+        groq_upstream.get()
+        if check_groq:
+            # Optional live request to verify the API key and model
+            groq_upstream.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[{"role": "user", "content": "test"}],
+                max_tokens=10
+            )
+            logger.info(f"Successfully initialized Groq client with model {GROQ_MODEL}")
+    except Exception as e:
+        logger.error(f"Failed to initialize Groq client: {str(e)}")
+    
+    try:
+        nlp.get()
+    except Exception as e:
+        logger.error(f"Failed to load spaCy model: {str(e)}")
+
+    try:
+        background_scraper.get()
+    except Exception as e:
+        logger.error(f"Failed to initialize background scraper: {str(e)}")
+    
+    milvus_ready()
+
+def start_background_tasks():
+    """Start per-process background threads; called once the server process is running"""
+    progress_compactor.start()
+    crawl_runner.start()
+
 if __name__ == '__main__':
+    migrate_storage()
+    # The reloader re-runs this module in a child process that does the serving;
+    # only start threads there, so the parent does not run a second set against the same databases
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warmup(check_groq=True)
+        start_background_tasks()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
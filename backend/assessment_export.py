@@ -0,0 +1,51 @@
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from payload_codec import dumps_json
+
+# Lines are buffered into chunks of about this size before being written or sent
+EXPORT_CHUNK_SIZE = 64 * 1024
+GZIP_LEVEL = 6
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def parse_since(value: Optional[str]) -> Optional[str]:
+    """Validate an ISO date or timestamp and normalise it to the format stored in updated_at"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid since timestamp: {value}")
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Serialize records as newline-delimited JSON, yielding chunks of roughly chunk_size bytes"""
+    buffer = []
+    buffered = 0
+    for record in records:
+        line = dumps_json(record) + b'\n'
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield b''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly without holding more than one chunk in memory"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 writes a gzip header and trailer
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_assessments(store, since: Optional[str] = None, compress: bool = False) -> Iterator[bytes]:
+    """Stream every assessment changed since `since` as NDJSON, gzipped when compress is set"""
+    chunks = iter_ndjson(store.iter_export(since=since))
+    return gzip_chunks(chunks) if compress else chunks
@@ -1,18 +1,83 @@
 import os
 import json
+import time
+import asyncio
+import secrets
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import groq
+import httpx
 from fastapi import HTTPException
 
+try:
+    from .llm_metrics import record_llm_call, record_json_parse
+    from .certificate_store import CertificateStore
+except ImportError:
+    # Imported as a top-level module (benchmarks, scripts run from backend/)
+    from llm_metrics import record_llm_call, record_json_parse
+    from certificate_store import CertificateStore
+
 logger = logging.getLogger(__name__)
 
+# Connection pool and in-flight limits for outbound Groq calls from this worker
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "50"))
+GROQ_MAX_KEEPALIVE = int(os.getenv("GROQ_MAX_KEEPALIVE", "20"))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))
+
+def create_async_groq_client() -> groq.AsyncGroq:
+    """Create an AsyncGroq client backed by a pooled, keep-alive httpx client"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_MAX_KEEPALIVE
+        ),
+        timeout=httpx.Timeout(GROQ_TIMEOUT, connect=10.0)
+    )
+    return groq.AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client)
+
 class AssessmentService:
-    def __init__(self):
-        self.groq_client = groq.Client(api_key=os.getenv("GROQ_API_KEY"))
-        self.certificates_dir = "data/certificates"
-        os.makedirs(self.certificates_dir, exist_ok=True)
+    def __init__(self, groq_client: Optional[groq.AsyncGroq] = None, max_concurrency: int = GROQ_MAX_CONCURRENCY,
+                 certificate_store: Optional[CertificateStore] = None):
+        # One shared async client per service so every request reuses the same connection pool
+        self.groq_client = groq_client or create_async_groq_client()
+        self.max_concurrency = max_concurrency
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self.certificate_store = certificate_store or CertificateStore(os.getenv('PATHWAY_DB_PATH', 'pathway_data.db'))
+
+    async def _complete(self, endpoint: str, **kwargs) -> str:
+        """Run a chat completion without blocking the event loop, bounded by the concurrency limit"""
+        # Created lazily so the semaphore binds to the server's running event loop
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._llm_semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self.groq_client.chat.completions.create(**kwargs)
+            except Exception:
+                record_llm_call(endpoint, 'chat', time.perf_counter() - start, status='error')
+                raise
+        usage = getattr(response, 'usage', None)
+        record_llm_call(endpoint, 'chat', time.perf_counter() - start,
+                        prompt_tokens=getattr(usage, 'prompt_tokens', None),
+                        completion_tokens=getattr(usage, 'completion_tokens', None))
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _parse_json(endpoint: str, content: str) -> Any:
+        """Parse LLM output as JSON, recording the outcome in the parse-success metrics"""
+        try:
+            result = json.loads(content)
+        except json.JSONDecodeError:
+            record_json_parse(endpoint, False)
+            raise
+        record_json_parse(endpoint, True)
+        return result
+
+    async def close(self) -> None:
+        """Release the pooled HTTP connections"""
+        await self.groq_client.close()
 
     async def generate_test(self, topics: List[str], num_questions: int = 10) -> List[Dict[str, Any]]:
         """Generate a test using GROQ API based on provided topics"""
@@ -27,7 +92,8 @@ class AssessmentService:
             Format the response as a JSON array of question objects.
             Each question should be challenging but fair, testing both theoretical knowledge and practical understanding."""
 
-            response = self.groq_client.chat.completions.create(
+            content = await self._complete(
+                'generate_test',
                 messages=[{"role": "user", "content": prompt}],
                 model="mixtral-8x7b-32768",
                 temperature=0.7,
@@ -35,7 +101,7 @@ class AssessmentService:
             )
 
             # Parse the response to get questions
-            questions = json.loads(response.choices[0].message.content)
+            questions = self._parse_json('generate_test', content)
             return questions
 
         except Exception as e:
@@ -87,18 +153,16 @@ class AssessmentService:
             if score < 75:
                 return None
 
+            issued = datetime.now()
             certificate_data = {
                 'user_id': user_id,
                 'topics': topics,
                 'score': score,
-                'date_issued': datetime.now().isoformat(),
-                'certificate_id': f"CERT-{user_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                'date_issued': issued.isoformat(),
+                # The random suffix keeps IDs unique within a second and hard to guess for public verification
+                'certificate_id': f"CERT-{user_id}-{issued.strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(4)}"
             }
-
-            # Save certificate data
-            certificate_file = os.path.join(self.certificates_dir, f"{certificate_data['certificate_id']}.json")
-            with open(certificate_file, 'w') as f:
-                json.dump(certificate_data, f, indent=2)
+            self.certificate_store.save(certificate_data)
 
             return certificate_data
 
@@ -116,14 +180,15 @@ class AssessmentService:
             Resume text:
             {resume_text}"""
 
-            response = self.groq_client.chat.completions.create(
+            content = await self._complete(
+                'extract_topics',
                 messages=[{"role": "user", "content": prompt}],
                 model="mixtral-8x7b-32768",
                 temperature=0.3,
                 max_tokens=1000
             )
 
-            topics = json.loads(response.choices[0].message.content)
+            topics = self._parse_json('extract_topics', content)
             return topics
 
         except Exception as e:
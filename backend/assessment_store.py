@@ -0,0 +1,747 @@
+import os
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from payload_codec import encode_payload, decode_payload
+from pagination import encode_cursor, decode_cursor
+from assessment_export import export_assessments, parse_since
+from json_migration import JSONMigration, MIGRATION_BATCH_SIZE, format_report
+
+logger = logging.getLogger(__name__)
+
+# Same definitions as the tables already shipped in pathway_data.db
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        email TEXT UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS assessments (
+        id TEXT PRIMARY KEY,
+        user_id TEXT,
+        target_role TEXT,
+        current_role TEXT,
+        experience TEXT,
+        timeframe TEXT,
+        assessment_data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS learning_progress (
+        id TEXT PRIMARY KEY,
+        assessment_id TEXT,
+        milestone_id TEXT,
+        status TEXT,
+        notes TEXT,
+        completed_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (assessment_id) REFERENCES assessments (id)
+    )""",
+    # Append-only log of milestone changes, folded into learning_progress by compact()
+    """CREATE TABLE IF NOT EXISTS progress_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        progress_id TEXT NOT NULL,
+        assessment_id TEXT NOT NULL,
+        status TEXT,
+        notes TEXT,
+        completed_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+# Latest status of a milestone: its newest logged status change, else the compacted snapshot
+EFFECTIVE_STATUS_SQL = """COALESCE(
+    (SELECT e.status FROM progress_events e
+     WHERE e.progress_id = p.id AND e.status IS NOT NULL ORDER BY e.seq DESC LIMIT 1),
+    p.status)"""
+
+# Columns the JSON layout carried that the original tables did not, plus listing metadata and progress counters
+ADDED_COLUMNS = {
+    'users': [('listing_version', 'INTEGER DEFAULT 0')],
+    'assessments': [('status', "TEXT DEFAULT 'active'"), ('skill_gap_count', 'INTEGER DEFAULT 0'),
+                    ('resource_count', 'INTEGER DEFAULT 0'), ('total_milestones', 'INTEGER DEFAULT 0'),
+                    ('completed_milestones', 'INTEGER DEFAULT 0'), ('updated_at', 'TIMESTAMP')],
+    'learning_progress': [('milestone', 'TEXT'), ('target_date', 'TEXT')],
+}
+
+# Run by migrate() only when it adds the column, to fill it in for existing rows
+BACKFILLS = {
+    ('assessments', 'skill_gap_count'):
+        """UPDATE assessments SET skill_gap_count = COALESCE(json_array_length(assessment_data, '$.analysis.skill_gaps'), 0)
+           WHERE json_valid(assessment_data)""",
+    ('assessments', 'resource_count'):
+        """UPDATE assessments SET resource_count = COALESCE(json_array_length(assessment_data, '$.analysis.resources'), 0)
+           WHERE json_valid(assessment_data)""",
+    ('assessments', 'updated_at'):
+        'UPDATE assessments SET updated_at = created_at',
+    ('assessments', 'total_milestones'):
+        """UPDATE assessments SET total_milestones =
+           (SELECT COUNT(*) FROM learning_progress p WHERE p.assessment_id = assessments.id)""",
+    ('assessments', 'completed_milestones'):
+        f"""UPDATE assessments SET completed_milestones =
+           (SELECT COUNT(*) FROM learning_progress p
+            WHERE p.assessment_id = assessments.id AND {EFFECTIVE_STATUS_SQL} = 'completed')""",
+}
+
+INDEXES = [
+    # Superseded by idx_assessments_user_created_id, which also covers the pagination tie-breaker
+    'DROP INDEX IF EXISTS idx_assessments_user_created',
+    'CREATE INDEX IF NOT EXISTS idx_assessments_user_created_id ON assessments (user_id, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS idx_progress_assessment ON learning_progress (assessment_id)',
+    'CREATE INDEX IF NOT EXISTS idx_progress_milestone ON learning_progress (milestone_id)',
+    'CREATE INDEX IF NOT EXISTS idx_events_progress ON progress_events (progress_id, seq)',
+    'CREATE INDEX IF NOT EXISTS idx_events_assessment ON progress_events (assessment_id, seq)',
+    'CREATE INDEX IF NOT EXISTS idx_assessments_updated ON assessments (updated_at, id)',
+]
+
+ASSESSMENT_COLUMNS = ('id', 'user_id', 'target_role', 'current_role', 'experience', 'timeframe',
+                      'assessment_data', 'created_at', 'status')
+PROGRESS_COLUMNS = ('id', 'assessment_id', 'milestone_id', 'milestone', 'target_date', 'status', 'notes',
+                    'completed_at', 'created_at')
+
+# Fields of the summary projection used by list views; everything except the analysis blob
+SUMMARY_COLUMNS = ('id', 'user_id', 'target_role', 'current_role', 'experience', 'timeframe', 'created_at',
+                   'status', 'skill_gap_count', 'resource_count')
+
+# Upper bound on milestones listed in the due-this-week rollup
+MAX_DUE_MILESTONES = 50
+EXPORT_BATCH_SIZE = 500
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _calculate_progress(total: int, completed: int) -> float:
+    return (completed / total * 100) if total > 0 else 0
+
+
+def _analysis_count(assessment: Dict[str, Any], section: str) -> int:
+    analysis = (assessment.get('assessment_data') or {}).get('analysis') or {}
+    value = analysis.get(section)
+    return len(value) if isinstance(value, list) else 0
+
+
+class ListingCache:
+    """
+    LRU cache of assessment list pages.
+
+    Keys include the user's listing_version, which every write bumps in the
+    same transaction, so a bumped version in any worker makes the cached
+    pages unreachable here and they simply age out.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return page
+
+    def set(self, key: Tuple, page: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@contextmanager
+def _immediate_transaction(conn: sqlite3.Connection):
+    """
+    Run a read-then-write block under the database write lock.
+
+    The default deferred transaction only takes the lock at the first write,
+    so a status read before it could be stale by the time the counters change.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _fold_event(milestone: Dict[str, Any], event: sqlite3.Row) -> None:
+    """Apply one logged change to a milestone dict; NULL fields were not part of the change"""
+    if event['status'] is not None:
+        milestone['status'] = event['status']
+        milestone['completed_at'] = event['completed_at']
+    if event['notes'] is not None:
+        milestone['notes'] = event['notes']
+
+
+class AssessmentStore:
+    """
+    Repository for users, assessments and milestone progress on the pathway SQLite database.
+
+    Every lookup is an indexed query, and each thread reuses one connection
+    opened in WAL mode so readers never block the single writer.
+
+    Milestone changes are appended to progress_events rather than updating
+    rows in place, so concurrent workers never overwrite each other. Reads
+    fold pending events over the learning_progress snapshot, and compact()
+    periodically merges the log into the snapshot.
+    """
+
+    def __init__(self, db_path: str, listing_cache_size: int = 1024, compress_payloads: bool = True):
+        self.db_path = db_path
+        self.compress_payloads = compress_payloads
+        self._local = threading.local()
+        self.listing_cache = ListingCache(listing_cache_size)
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+    def migrate(self) -> List[str]:
+        """
+        Create missing tables, columns and indexes, and backfill new columns.
+
+        Run once per deployment rather than on import: the gunicorn master
+        calls it before forking workers, and `python assessment_store.py migrate`
+        runs it by hand. The whole step holds the write lock and re-reads the
+        columns under it, so concurrent runs are still safe. Returns the
+        columns added, as table.column.
+        """
+        conn = self._connection()
+        added = []
+        with _immediate_transaction(conn):
+            for statement in SCHEMA:
+                conn.execute(statement)
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+                for name, definition in columns:
+                    if name in existing:
+                        continue
+                    try:
+                        conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+                    except sqlite3.OperationalError as e:
+                        # Added by an older build that migrated without taking the lock first
+                        if 'duplicate column name' not in str(e):
+                            raise
+                        continue
+                    added.append((table, name))
+            for statement in INDEXES:
+                conn.execute(statement)
+            # Only for columns added just now, and after the indexes exist so the
+            # per-row milestone counts are index lookups rather than table scans
+            for column in added:
+                if column in BACKFILLS:
+                    conn.execute(BACKFILLS[column])
+        added = [f'{table}.{name}' for table, name in added]
+        if added:
+            logger.info(f"Added columns: {', '.join(added)}")
+        return added
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return a per-thread connection to the pathway database"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            # WAL with NORMAL sync is durable across application crashes and avoids an fsync per commit
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _assessment_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        assessment = {column: row[column] for column in ASSESSMENT_COLUMNS}
+        assessment['assessment_data'] = decode_payload(row['assessment_data']) or {}
+        return assessment
+
+    def _encode_assessment_data(self, data: Dict[str, Any]) -> Any:
+        # The analysis is stored once, as compressed JSON; learning path and skill gaps are read from it
+        return encode_payload(data) if self.compress_payloads else json.dumps(data)
+
+    @staticmethod
+    def _progress_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {column: row[column] for column in PROGRESS_COLUMNS}
+
+    def _ensure_user(self, conn: sqlite3.Connection, user: Dict[str, Any]) -> None:
+        conn.execute(
+            'INSERT OR IGNORE INTO users (id, name, email, created_at) VALUES (?, ?, ?, ?)',
+            (user['id'], user.get('name'), user.get('email'), user.get('created_at') or datetime.now().isoformat())
+        )
+        if conn.execute('SELECT 1 FROM users WHERE id = ?', (user['id'],)).fetchone() is None:
+            # The email belongs to another user ID; keep the user without it rather than failing the save
+            logger.warning(f"Email for user {user['id']} already registered, storing user without email")
+            conn.execute(
+                'INSERT INTO users (id, name, email, created_at) VALUES (?, ?, NULL, ?)',
+                (user['id'], user.get('name'), user.get('created_at') or datetime.now().isoformat())
+            )
+
+    def save_assessments(self, items: Iterable[Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]]) -> int:
+        """
+        Insert (user, assessment, milestones) triples in a single transaction.
+
+        Assessments and milestones that already exist are replaced, so
+        re-importing the same records is safe. Returns the number saved.
+        """
+        conn = self._connection()
+        saved = 0
+        with conn:
+            for user, assessment, milestones in items:
+                self._ensure_user(conn, user)
+                conn.execute(
+                    """INSERT OR REPLACE INTO assessments
+                       (id, user_id, target_role, current_role, experience, timeframe, assessment_data, created_at,
+                        status, skill_gap_count, resource_count, total_milestones, completed_milestones, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (assessment['id'], assessment['user_id'], assessment.get('target_role', ''),
+                     assessment.get('current_role', ''), assessment.get('experience', ''),
+                     assessment.get('timeframe', ''), self._encode_assessment_data(assessment.get('assessment_data') or {}),
+                     assessment.get('created_at') or datetime.now().isoformat(), assessment.get('status', 'active'),
+                     _analysis_count(assessment, 'skill_gaps'), _analysis_count(assessment, 'resources'),
+                     len(milestones), sum(1 for m in milestones if m.get('status') == 'completed'),
+                     assessment.get('updated_at') or datetime.now().isoformat())
+                )
+                conn.executemany(
+                    """INSERT OR REPLACE INTO learning_progress
+                       (id, assessment_id, milestone_id, milestone, target_date, status, notes, completed_at, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    [(m['id'], assessment['id'], m.get('milestone_id', ''), m.get('milestone', ''),
+                      m.get('target_date', ''), m.get('status', 'not_started'), m.get('notes', ''),
+                      m.get('completed_at'), m.get('created_at') or datetime.now().isoformat())
+                     for m in milestones]
+                )
+                self._bump_listing_version(conn, assessment['user_id'])
+                saved += 1
+        return saved
+
+    def save_assessment(self, user: Dict[str, Any], assessment: Dict[str, Any],
+                        milestones: List[Dict[str, Any]]) -> None:
+        """Insert one assessment with its milestones, creating the user if needed"""
+        self.save_assessments([(user, assessment, milestones)])
+
+    def list_assessments(self, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                         summary: bool = True) -> Dict[str, Any]:
+        """
+        Return one page of a user's assessments, newest first.
+
+        The summary projection leaves out the analysis blob and carries its
+        section counts instead. Pages are served from the listing cache until
+        the user's data changes. Returns {'assessments': [...], 'next_cursor': str or None}.
+        Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        conn = self._connection()
+        user = conn.execute('SELECT listing_version FROM users WHERE id = ?', (user_id,)).fetchone()
+        if user is None:
+            return {'assessments': [], 'next_cursor': None}
+
+        key = (user_id, user['listing_version'] or 0, summary, limit, cursor)
+        page = self.listing_cache.get(key)
+        if page is not None:
+            return page
+
+        columns = SUMMARY_COLUMNS if summary else ASSESSMENT_COLUMNS
+        where, params = 'a.user_id = ?', [user_id]
+        if cursor:
+            created_at, assessment_id = decode_cursor(cursor)
+            where += ' AND (a.created_at < ? OR (a.created_at = ? AND a.id < ?))'
+            params += [created_at, created_at, assessment_id]
+        rows = conn.execute(
+            f"""SELECT {', '.join('a.' + c for c in columns)}, a.total_milestones, a.completed_milestones
+                FROM assessments a
+                WHERE {where}
+                ORDER BY a.created_at DESC, a.id DESC
+                LIMIT ?""",
+            params + [limit + 1]
+        ).fetchall()
+
+        assessments = []
+        for row in rows[:limit]:
+            if summary:
+                assessment = {column: row[column] for column in SUMMARY_COLUMNS}
+                assessment['milestone_count'] = row['total_milestones']
+            else:
+                assessment = self._assessment_from_row(row)
+            assessment['progress'] = _calculate_progress(row['total_milestones'], row['completed_milestones'])
+            assessments.append(assessment)
+
+        next_cursor = encode_cursor(rows[limit - 1]['created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+        page = {'assessments': assessments, 'next_cursor': next_cursor}
+        self.listing_cache.set(key, page)
+        return page
+
+    @staticmethod
+    def _bump_listing_version(conn: sqlite3.Connection, user_id: str) -> None:
+        """Invalidate cached list pages for a user; must run in the transaction making the change"""
+        conn.execute('UPDATE users SET listing_version = COALESCE(listing_version, 0) + 1 WHERE id = ?', (user_id,))
+
+    def get_assessment(self, assessment_id: str) -> Optional[Dict[str, Any]]:
+        """Return one assessment, or None if it does not exist"""
+        row = self._connection().execute('SELECT * FROM assessments WHERE id = ?', (assessment_id,)).fetchone()
+        return self._assessment_from_row(row) if row else None
+
+    def get_progress(self, assessment_id: str) -> List[Dict[str, Any]]:
+        """Return the milestones of an assessment in the order they were created, with pending changes applied"""
+        conn = self._connection()
+        rows = conn.execute(
+            'SELECT * FROM learning_progress WHERE assessment_id = ? ORDER BY created_at, rowid', (assessment_id,)
+        ).fetchall()
+        milestones = [self._progress_from_row(row) for row in rows]
+        by_id = {m['id']: m for m in milestones}
+        for event in conn.execute('SELECT * FROM progress_events WHERE assessment_id = ? ORDER BY seq',
+                                  (assessment_id,)):
+            if event['progress_id'] in by_id:
+                _fold_event(by_id[event['progress_id']], event)
+        return milestones
+
+    @staticmethod
+    def _append_progress_event(conn: sqlite3.Connection, progress_id: str, status: Optional[str],
+                               notes: Optional[str]) -> bool:
+        """
+        Log a change to one milestone; fields left as None are not part of the change.
+
+        Must run inside _immediate_transaction so the assessment's completion
+        counter moves in step with the milestone's current status.
+        """
+        row = conn.execute(
+            f"""SELECT p.assessment_id, a.user_id, {EFFECTIVE_STATUS_SQL} AS status
+                FROM learning_progress p JOIN assessments a ON a.id = p.assessment_id
+                WHERE p.id = ?""",
+            (progress_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        if status is None and notes is None:
+            return True
+        now = datetime.now().isoformat()
+        conn.execute(
+            """INSERT INTO progress_events (progress_id, assessment_id, status, notes, completed_at, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (progress_id, row['assessment_id'], status, notes, now if status == 'completed' else None, now)
+        )
+        delta = (status == 'completed') - (row['status'] == 'completed') if status is not None else 0
+        # updated_at lets incremental exports pick up assessments whose progress changed
+        conn.execute(
+            'UPDATE assessments SET completed_milestones = completed_milestones + ?, updated_at = ? WHERE id = ?',
+            (delta, now, row['assessment_id'])
+        )
+        if status is not None and status != row['status']:
+            # Status changes alter the listed progress and the milestones in the user's rollup
+            AssessmentStore._bump_listing_version(conn, row['user_id'])
+        return True
+
+    def update_progress(self, progress_id: str, status: Optional[str] = None, notes: Optional[str] = None) -> bool:
+        """
+        Partially update one milestone: fields left as None keep their stored value.
+
+        Returns False if the milestone does not exist.
+        """
+        with _immediate_transaction(self._connection()) as conn:
+            return self._append_progress_event(conn, progress_id, status, notes)
+
+    def update_progress_batch(self, updates: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """
+        Apply many milestone updates in one transaction.
+
+        Each update is a dict with progress_id and optional status and notes.
+        Returns (updated IDs, IDs that were not found).
+        """
+        updated, missing = [], []
+        with _immediate_transaction(self._connection()) as conn:
+            for update in updates:
+                progress_id = update['progress_id']
+                if self._append_progress_event(conn, progress_id, update.get('status'), update.get('notes')):
+                    updated.append(progress_id)
+                else:
+                    missing.append(progress_id)
+        return updated, missing
+
+    def get_user_rollup(self, user_id: str, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Return a user's overall completion, from the per-assessment counters, and
+        the incomplete milestones whose target date falls in the current week (Monday to Sunday).
+        """
+        today = today or date.today()
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=6)
+
+        conn = self._connection()
+        user = conn.execute('SELECT listing_version FROM users WHERE id = ?', (user_id,)).fetchone()
+        version = user['listing_version'] if user else None
+        key = ('rollup', user_id, version, week_start.isoformat())
+        rollup = self.listing_cache.get(key)
+        if rollup is not None:
+            return rollup
+
+        totals = conn.execute(
+            """SELECT COUNT(*) AS assessments, COALESCE(SUM(total_milestones), 0) AS total,
+                      COALESCE(SUM(completed_milestones), 0) AS completed
+               FROM assessments WHERE user_id = ?""",
+            (user_id,)
+        ).fetchone()
+        # Target dates come from the LLM; date() is NULL for ones that are not ISO dates, which are skipped
+        due = conn.execute(
+            f"""SELECT p.id, p.assessment_id, a.target_role, p.milestone, p.target_date,
+                       {EFFECTIVE_STATUS_SQL} AS status
+                FROM assessments a JOIN learning_progress p ON p.assessment_id = a.id
+                WHERE a.user_id = ? AND date(p.target_date) BETWEEN ? AND ?
+                  AND {EFFECTIVE_STATUS_SQL} != 'completed'
+                ORDER BY date(p.target_date), p.milestone
+                LIMIT ?""",
+            (user_id, week_start.isoformat(), week_end.isoformat(), MAX_DUE_MILESTONES)
+        ).fetchall()
+
+        rollup = {
+            'user_id': user_id,
+            'assessments': totals['assessments'],
+            'total_milestones': totals['total'],
+            'completed_milestones': totals['completed'],
+            'overall_progress': _calculate_progress(totals['total'], totals['completed']),
+            'week_start': week_start.isoformat(),
+            'week_end': week_end.isoformat(),
+            'due_this_week': [dict(row) for row in due]
+        }
+        self.listing_cache.set(key, rollup)
+        return rollup
+
+    def compact(self, batch_size: int = 1000) -> int:
+        """
+        Fold logged progress events into learning_progress and remove them from the log.
+
+        Each batch runs in an IMMEDIATE transaction, so compactors in several
+        workers take turns instead of applying the same events twice.
+        Returns the number of events compacted.
+        """
+        compacted = 0
+        while True:
+            with _immediate_transaction(self._connection()) as conn:
+                events = conn.execute('SELECT * FROM progress_events ORDER BY seq LIMIT ?', (batch_size,)).fetchall()
+                if not events:
+                    return compacted
+                folded: Dict[str, Dict[str, Any]] = {}
+                for event in events:
+                    _fold_event(folded.setdefault(event['progress_id'], {}), event)
+                conn.executemany(
+                    """UPDATE learning_progress
+                       SET status = COALESCE(?, status),
+                           completed_at = CASE WHEN ? IS NULL THEN completed_at ELSE ? END,
+                           notes = COALESCE(?, notes)
+                       WHERE id = ?""",
+                    [(change.get('status'), change.get('status'), change.get('completed_at'), change.get('notes'),
+                      progress_id) for progress_id, change in folded.items()]
+                )
+                conn.execute('DELETE FROM progress_events WHERE seq <= ?', (events[-1]['seq'],))
+            compacted += len(events)
+            if len(events) < batch_size:
+                return compacted
+
+    def pending_events(self) -> int:
+        """Number of logged progress changes not yet compacted"""
+        return self._connection().execute('SELECT COUNT(*) FROM progress_events').fetchone()[0]
+
+    def delete_assessment(self, assessment_id: str) -> Optional[str]:
+        """Delete an assessment and its milestones; returns the owning user ID, or None if not found"""
+        conn = self._connection()
+        with conn:
+            row = conn.execute('SELECT user_id FROM assessments WHERE id = ?', (assessment_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('DELETE FROM progress_events WHERE assessment_id = ?', (assessment_id,))
+            conn.execute('DELETE FROM learning_progress WHERE assessment_id = ?', (assessment_id,))
+            conn.execute('DELETE FROM assessments WHERE id = ?', (assessment_id,))
+            self._bump_listing_version(conn, row['user_id'])
+        return row['user_id']
+
+    def iter_export(self, since: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every assessment changed at or after `since` (all of them when None)
+        with its skill gaps and milestones, ordered by updated_at.
+
+        Rows are read in keyset batches of `batch_size`, so memory stays flat
+        however many assessments are exported. Passing the last exported
+        updated_at as the next `since` gives an incremental export.
+        """
+        conn = self._connection()
+        last_updated, last_id = since or '', ''
+        while True:
+            rows = conn.execute(
+                """SELECT * FROM assessments
+                   WHERE updated_at > ? OR (updated_at = ? AND id > ?)
+                   ORDER BY updated_at, id LIMIT ?""",
+                (last_updated, last_updated, last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            ids = [row['id'] for row in rows]
+            placeholders = ','.join('?' * len(ids))
+            milestones: Dict[str, List[Dict[str, Any]]] = {assessment_id: [] for assessment_id in ids}
+            by_id = {}
+            for row in conn.execute(
+                    f"""SELECT * FROM learning_progress WHERE assessment_id IN ({placeholders})
+                        ORDER BY created_at, rowid""", ids):
+                milestone = self._progress_from_row(row)
+                milestones[milestone['assessment_id']].append(milestone)
+                by_id[milestone['id']] = milestone
+            for event in conn.execute(
+                    f'SELECT * FROM progress_events WHERE assessment_id IN ({placeholders}) ORDER BY seq', ids):
+                if event['progress_id'] in by_id:
+                    _fold_event(by_id[event['progress_id']], event)
+
+            for row in rows:
+                assessment = self._assessment_from_row(row)
+                analysis = assessment.pop('assessment_data').get('analysis') or {}
+                assessment['updated_at'] = row['updated_at']
+                assessment['skill_gaps'] = analysis.get('skill_gaps', [])
+                assessment['milestones'] = milestones[row['id']]
+                yield assessment
+            last_updated, last_id = rows[-1]['updated_at'], rows[-1]['id']
+
+    def count_assessments(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM assessments').fetchone()[0]
+
+    def compress_existing_payloads(self, batch_size: int = 500) -> int:
+        """
+        Rewrite assessment_data stored as plain JSON text into the compressed format.
+
+        Runs in batches of short transactions so the app can keep serving
+        while it migrates. Returns the number of rows rewritten.
+        """
+        conn = self._connection()
+        migrated = 0
+        while True:
+            rows = conn.execute(
+                "SELECT id, assessment_data FROM assessments WHERE typeof(assessment_data) = 'text' LIMIT ?",
+                (batch_size,)
+            ).fetchall()
+            if not rows:
+                return migrated
+            with conn:
+                conn.executemany(
+                    'UPDATE assessments SET assessment_data = ? WHERE id = ?',
+                    [(encode_payload(decode_payload(row['assessment_data']) or {}), row['id']) for row in rows]
+                )
+            migrated += len(rows)
+            logger.info(f"Compressed {migrated} assessment payloads")
+
+    def vacuum(self) -> None:
+        """Reclaim the space freed by a migration"""
+        conn = self._connection()
+        conn.execute('VACUUM')
+        # In WAL mode VACUUM writes the rebuilt database through the log, so truncate it afterwards
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+
+class ProgressCompactor:
+    """Background thread that periodically folds the progress event log into the snapshot"""
+
+    def __init__(self, store: AssessmentStore, interval: float = 30.0):
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='progress-compactor', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                compacted = self.store.compact()
+                if compacted:
+                    logger.debug(f"Compacted {compacted} progress events")
+            except Exception as e:
+                logger.error(f"Error compacting progress events: {str(e)}")
+
+
+def database_size(db_path: str) -> int:
+    """Bytes used by a SQLite database including its WAL and shared-memory files"""
+    return sum(os.path.getsize(path) for path in (db_path, db_path + '-wal', db_path + '-shm') if os.path.exists(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintenance commands for the pathway assessment database")
+    parser.add_argument('--db', default=os.getenv('PATHWAY_DB_PATH', 'pathway_data.db'), help='Database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('migrate', help='Create missing tables, columns and indexes')
+
+    compress = subparsers.add_parser('compress-payloads', help='Convert JSON text payloads to the compressed format')
+    compress.add_argument('--batch-size', type=int, default=500)
+    compress.add_argument('--vacuum', action='store_true', help='VACUUM afterwards to shrink the file')
+
+    export = subparsers.add_parser('export', help='Write assessments, skill gaps and milestones as NDJSON')
+    export.add_argument('--since', help='Only export assessments changed at or after this ISO timestamp')
+    export.add_argument('--gzip', action='store_true', help='Gzip the output')
+    export.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+
+    migrate = subparsers.add_parser('migrate-json', help='Import the legacy data/ JSON tree (resumable)')
+    migrate.add_argument('--data-dir', default='data', help='Root of the JSON tree')
+    migrate.add_argument('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+    migrate.add_argument('--batch-size', type=int, default=MIGRATION_BATCH_SIZE)
+    migrate.add_argument('--skip-verify', action='store_true', help='Skip the checksum verification pass')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    store = AssessmentStore(args.db)
+    # Every command needs the current schema; applying it again is a no-op
+    added = store.migrate()
+
+    if args.command == 'migrate':
+        print(f"Added columns: {', '.join(added)}" if added else "Schema is up to date")
+    elif args.command == 'compress-payloads':
+        size_before = database_size(args.db)
+        migrated = store.compress_existing_payloads(batch_size=args.batch_size)
+        if args.vacuum:
+            store.vacuum()
+        print(f"Compressed {migrated} payloads; database {size_before / 1e6:.1f} MB -> "
+              f"{database_size(args.db) / 1e6:.1f} MB")
+    elif args.command == 'export':
+        try:
+            since = parse_since(args.since)
+        except ValueError as e:
+            parser.error(str(e))
+        out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+        try:
+            for chunk in export_assessments(store, since=since, compress=args.gzip):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    elif args.command == 'migrate-json':
+        migration = JSONMigration(store, args.data_dir, workers=args.workers, batch_size=args.batch_size)
+        stats = migration.run()
+        verification = None if args.skip_verify else migration.verify()
+        print(format_report(stats, verification))
+        if stats['errors'] or (verification and verification['mismatches']):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
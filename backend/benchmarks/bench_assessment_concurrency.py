@@ -0,0 +1,108 @@
+"""Benchmark concurrent AssessmentService.generate_test throughput.
+
+Compares the previous behaviour (a synchronous Groq client called inside the
+coroutine, which blocks the event loop) against the async client path. The
+LLM is simulated with a fixed latency so no API key or network is needed.
+
+    python benchmarks/bench_assessment_concurrency.py --requests 32 --latency 0.5
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assessment_service import AssessmentService  # noqa: E402
+
+FAKE_QUESTIONS = json.dumps([
+    {"question": "What is 2 + 2?", "options": ["3", "4", "5", "6"], "correct_answer": "B", "explanation": "Arithmetic"}
+])
+
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content):
+        self.message = _Message(content)
+
+
+class _Response:
+    def __init__(self, content):
+        self.choices = [_Choice(content)]
+
+
+class _Namespace:
+    pass
+
+
+class FakeSyncGroq:
+    """Blocks the calling thread for the simulated LLM latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.chat = _Namespace()
+        self.chat.completions = self
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        return _Response(FAKE_QUESTIONS)
+
+
+class FakeAsyncGroq:
+    """Yields to the event loop for the simulated LLM latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.chat = _Namespace()
+        self.chat.completions = self
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return _Response(FAKE_QUESTIONS)
+
+    async def close(self):
+        pass
+
+
+class BlockingAssessmentService(AssessmentService):
+    """Reproduces the old code path: a sync client call inside an async method"""
+
+    def __init__(self, sync_client, max_concurrency):
+        super().__init__(groq_client=FakeAsyncGroq(0), max_concurrency=max_concurrency)
+        self.sync_client = sync_client
+
+    async def _complete(self, endpoint, **kwargs):
+        response = self.sync_client.chat.completions.create(**kwargs)
+        return response.choices[0].message.content
+
+
+async def run(service, num_requests):
+    start = time.perf_counter()
+    await asyncio.gather(*[service.generate_test(["python"], 5) for _ in range(num_requests)])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated LLM latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=16, help="GROQ_MAX_CONCURRENCY for the async path")
+    args = parser.parse_args()
+
+    blocking = BlockingAssessmentService(FakeSyncGroq(args.latency), args.concurrency)
+    non_blocking = AssessmentService(groq_client=FakeAsyncGroq(args.latency), max_concurrency=args.concurrency)
+
+    for label, service in (("sync client (before)", blocking), ("async client (after)", non_blocking)):
+        elapsed = asyncio.run(run(service, args.requests))
+        print(f"{label:<22} {args.requests} requests in {elapsed:6.2f}s  "
+              f"-> {args.requests / elapsed:7.2f} req/s")
+
+
+if __name__ == "__main__":
+    main()
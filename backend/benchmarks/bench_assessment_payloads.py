@@ -0,0 +1,164 @@
+"""Compare disk footprint and save/load latency of assessment storage layouts.
+
+Layouts measured, each with --assessments realistic LLM-sized analyses:
+
+  files       the original data/<user>/<assessment>/ tree: assessment.json,
+              learning_path.json, skill_gaps.json and milestones.json
+              pretty-printed with indent=2, plus the session_<user>.json copy
+  sqlite-json one row per assessment with the analysis as JSON text
+  sqlite-zip  one row per assessment with the analysis as compressed JSON
+              (zstd when installed, otherwise zlib), sections derived on read
+
+    python benchmarks/bench_assessment_payloads.py --assessments 2000
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import payload_codec
+from assessment_store import AssessmentStore, database_size
+
+SKILLS = ['python', 'sql', 'statistics', 'machine learning', 'docker', 'kubernetes', 'aws', 'communication',
+          'leadership', 'data visualization', 'spark', 'airflow', 'react', 'typescript', 'system design']
+
+
+def sentence(words=18):
+    vocabulary = ('build practical experience with production systems and measure impact through projects '
+                  'while learning core concepts from courses documentation and mentorship').split()
+    return ' '.join(random.choice(vocabulary) for _ in range(words)).capitalize() + '.'
+
+
+def synthetic_analysis():
+    """An analysis shaped like the career gap output of assess_skills"""
+    skills = random.sample(SKILLS, 10)
+    return {
+        'required_skills': [{'skill': s, 'importance': 'high', 'description': sentence()} for s in skills],
+        'skill_gaps': [{'skill': s, 'current_score': random.randint(0, 60), 'target_score': 90,
+                        'gap': sentence(), 'priority': random.choice(['high', 'medium', 'low'])} for s in skills[:8]],
+        'learning_path': [{'phase': f'Phase {p}', 'duration': '4 weeks', 'description': sentence(30),
+                           'skills': skills[p:p + 3], 'activities': [sentence() for _ in range(4)]}
+                          for p in range(6)],
+        'milestones': [{'milestone': f'Complete {s} project', 'target_date': '2025-06-01',
+                        'description': sentence(), 'success_criteria': sentence()} for s in skills[:6]],
+        'resources': [{'title': f'{s.title()} course', 'url': f'https://example.com/{s.replace(" ", "-")}',
+                       'type': 'course', 'description': sentence()} for s in skills],
+        'risk_assessment': {'risks': [sentence() for _ in range(4)], 'mitigations': [sentence() for _ in range(4)]},
+    }
+
+
+def synthetic_record(user_id):
+    assessment_id = str(uuid.uuid4())
+    analysis = synthetic_analysis()
+    assessment = {
+        'id': assessment_id, 'user_id': user_id, 'target_role': 'Data Scientist', 'current_role': 'Analyst',
+        'experience': '3', 'timeframe': '6 months', 'assessment_data': {'analysis': analysis},
+        'created_at': '2025-01-01T00:00:00', 'status': 'active'
+    }
+    milestones = [{'id': str(uuid.uuid4()), 'assessment_id': assessment_id,
+                   'milestone_id': m['milestone'].replace(' ', '_').lower(), 'milestone': m['milestone'],
+                   'target_date': m['target_date'], 'status': 'not_started', 'notes': '',
+                   'created_at': '2025-01-01T00:00:00'} for m in analysis['milestones']]
+    return assessment, milestones
+
+
+def files_save(data_dir, assessment, milestones):
+    """Write one assessment the way save_assessment did before the SQLite store"""
+    analysis = assessment['assessment_data']['analysis']
+    assessment_dir = os.path.join(data_dir, assessment['user_id'], assessment['id'])
+    os.makedirs(assessment_dir, exist_ok=True)
+    for name, content in (('assessment.json', assessment), ('milestones.json', milestones),
+                          ('learning_path.json', analysis['learning_path']), ('skill_gaps.json', analysis['skill_gaps'])):
+        with open(os.path.join(assessment_dir, name), 'w') as f:
+            json.dump(content, f, indent=2)
+    with open(os.path.join(data_dir, f"session_{assessment['user_id']}.json"), 'w') as f:
+        json.dump({'assessments': [assessment]}, f, indent=2)
+
+
+def files_load(data_dir, user_id, assessment_id):
+    assessment_dir = os.path.join(data_dir, user_id, assessment_id)
+    result = {}
+    for name in ('assessment.json', 'milestones.json', 'learning_path.json', 'skill_gaps.json'):
+        with open(os.path.join(assessment_dir, name)) as f:
+            result[name] = json.load(f)
+    return result
+
+
+def store_load(store, assessment_id):
+    assessment = store.get_assessment(assessment_id)
+    analysis = assessment['assessment_data'].get('analysis', {})
+    return assessment, store.get_progress(assessment_id), analysis.get('learning_path'), analysis.get('skill_gaps')
+
+
+def tree_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def run_layout(label, save, load, records, size, reads):
+    save_ms = []
+    for assessment, milestones in records:
+        start = time.perf_counter()
+        save(assessment, milestones)
+        save_ms.append((time.perf_counter() - start) * 1000)
+    load_ms = []
+    for assessment, _ in random.sample(records, min(reads, len(records))):
+        start = time.perf_counter()
+        load(assessment)
+        load_ms.append((time.perf_counter() - start) * 1000)
+    total = size()
+    save_p50, save_p95 = percentiles(save_ms)
+    load_p50, load_p95 = percentiles(load_ms)
+    print(f"{label:<12} {total / 1e6:9.2f} MB  {total / len(records) / 1024:7.1f} KB/assessment  "
+          f"save p50 {save_p50:6.3f} p95 {save_p95:6.3f} ms  load p50 {load_p50:6.3f} p95 {load_p95:6.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assessments', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--reads', type=int, default=500)
+    args = parser.parse_args()
+    random.seed(0)
+
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    records = [synthetic_record(users[i % args.users]) for i in range(args.assessments)]
+    codec = ('orjson' if payload_codec.orjson else 'json') + ' + ' + ('zstd' if payload_codec.zstandard else 'zlib')
+    print(f"{args.assessments} assessments, compressed codec: {codec}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, 'data')
+        run_layout('files', lambda a, m: files_save(data_dir, a, m),
+                   lambda a: files_load(data_dir, a['user_id'], a['id']), records,
+                   lambda: tree_size(data_dir), args.reads)
+
+        for label, compress in (('sqlite-json', False), ('sqlite-zip', True)):
+            db_path = os.path.join(tmp, f'{label}.db')
+            store = AssessmentStore(db_path, compress_payloads=compress)
+            store.migrate()
+            user_info = {}
+
+            def save(assessment, milestones, store=store):
+                user = user_info.setdefault(assessment['user_id'], {'id': assessment['user_id'], 'name': 'Bench'})
+                store.save_assessment(user, assessment, milestones)
+
+            def size(store=store, db_path=db_path):
+                store.vacuum()
+                return database_size(db_path)
+
+            run_layout(label, save, lambda a, store=store: store_load(store, a['id']), records, size, args.reads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Benchmark assessment lookups in the SQLite store against the old JSON-file layout.
+
+The store is filled with --assessments synthetic assessments (100k by
+default) spread over --users users, each with --milestones milestones. The
+old layout (data/<user>/<assessment>/*.json, found by scanning directories)
+is built with --legacy-assessments entries, which is kept smaller because
+every lookup walks the whole tree and gets slower as it grows.
+
+    python benchmarks/bench_assessment_store.py --assessments 100000 --legacy-assessments 5000
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assessment_store import AssessmentStore, database_size
+
+
+def synthetic_assessment(user_id, index, num_milestones):
+    assessment_id = str(uuid.uuid4())
+    created_at = (datetime(2024, 1, 1) + timedelta(minutes=index)).isoformat()
+    analysis = {
+        'milestones': [{'milestone': f'Milestone {m}', 'target_date': '2024-06-01'} for m in range(num_milestones)],
+        'learning_path': [{'step': s, 'description': 'x' * 200} for s in range(5)],
+        'skill_gaps': [{'skill': f'skill {g}', 'gap': 'y' * 100} for g in range(5)],
+    }
+    assessment = {
+        'id': assessment_id, 'user_id': user_id, 'target_role': 'Data Scientist', 'current_role': 'Analyst',
+        'experience': '3', 'timeframe': '6 months', 'assessment_data': {'analysis': analysis},
+        'created_at': created_at, 'status': 'active'
+    }
+    milestones = [{
+        'id': str(uuid.uuid4()), 'assessment_id': assessment_id, 'milestone_id': f'milestone_{m}',
+        'milestone': f'Milestone {m}', 'target_date': '2024-06-01', 'status': 'not_started', 'notes': '',
+        'created_at': created_at
+    } for m in range(num_milestones)]
+    return assessment, milestones
+
+
+def timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"  {label:<28} p50 {statistics.median(samples):8.3f} ms   p95 {p95:8.3f} ms   ({len(samples)} ops)")
+
+
+def populate_store(store, num_assessments, num_users, num_milestones, batch_size=1000):
+    users = [str(uuid.uuid4()) for _ in range(num_users)]
+    assessment_ids, progress_ids = [], []
+    start = time.perf_counter()
+    batch = []
+    for i in range(num_assessments):
+        user_id = users[i % num_users]
+        assessment, milestones = synthetic_assessment(user_id, i, num_milestones)
+        assessment_ids.append(assessment['id'])
+        progress_ids.extend(m['id'] for m in milestones[:1])
+        batch.append(({'id': user_id, 'name': 'Bench User', 'email': f'{user_id}@example.com'}, assessment, milestones))
+        if len(batch) >= batch_size:
+            store.save_assessments(batch)
+            batch = []
+    if batch:
+        store.save_assessments(batch)
+    return users, assessment_ids, progress_ids, time.perf_counter() - start
+
+
+def populate_legacy(data_dir, num_assessments, num_users, num_milestones):
+    users = [str(uuid.uuid4()) for _ in range(num_users)]
+    assessment_ids, progress_ids = [], []
+    for i in range(num_assessments):
+        user_id = users[i % num_users]
+        assessment, milestones = synthetic_assessment(user_id, i, num_milestones)
+        assessment_dir = os.path.join(data_dir, user_id, assessment['id'])
+        os.makedirs(assessment_dir, exist_ok=True)
+        with open(os.path.join(assessment_dir, 'assessment.json'), 'w') as f:
+            json.dump(assessment, f, indent=2)
+        with open(os.path.join(assessment_dir, 'milestones.json'), 'w') as f:
+            json.dump(milestones, f, indent=2)
+        assessment_ids.append(assessment['id'])
+        progress_ids.append(milestones[0]['id'])
+    return users, assessment_ids, progress_ids
+
+
+def legacy_get_assessment(data_dir, assessment_id):
+    """The old get_assessment lookup: scan every user directory for the assessment ID"""
+    for user_id in os.listdir(data_dir):
+        potential_dir = os.path.join(data_dir, user_id, assessment_id)
+        if os.path.isdir(potential_dir):
+            with open(os.path.join(potential_dir, 'assessment.json')) as f:
+                assessment = json.load(f)
+            with open(os.path.join(potential_dir, 'milestones.json')) as f:
+                milestones = json.load(f)
+            return assessment, milestones
+    return None
+
+
+def legacy_update_progress(data_dir, progress_id, status):
+    """The old update_progress lookup: load every milestones.json until the ID is found"""
+    for user_id in os.listdir(data_dir):
+        user_dir = os.path.join(data_dir, user_id)
+        for assessment_id in os.listdir(user_dir):
+            milestones_file = os.path.join(user_dir, assessment_id, 'milestones.json')
+            if not os.path.exists(milestones_file):
+                continue
+            with open(milestones_file) as f:
+                milestones = json.load(f)
+            for milestone in milestones:
+                if milestone['id'] == progress_id:
+                    milestone['status'] = status
+                    with open(milestones_file, 'w') as f:
+                        json.dump(milestones, f, indent=2)
+                    return True
+    return False
+
+
+def legacy_get_assessments(data_dir, user_id):
+    user_dir = os.path.join(data_dir, user_id)
+    assessments = []
+    for assessment_id in os.listdir(user_dir):
+        with open(os.path.join(user_dir, assessment_id, 'assessment.json')) as f:
+            assessments.append(json.load(f))
+    return assessments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assessments', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--milestones', type=int, default=5)
+    parser.add_argument('--legacy-assessments', type=int, default=5000,
+                        help='size of the JSON-file baseline (0 to skip)')
+    parser.add_argument('--ops', type=int, default=500, help='lookups per operation')
+    args = parser.parse_args()
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AssessmentStore(os.path.join(tmp, 'pathway_data.db'))
+        store.migrate()
+        users, assessment_ids, progress_ids, elapsed = populate_store(
+            store, args.assessments, args.users, args.milestones)
+        db_size = database_size(os.path.join(tmp, 'pathway_data.db'))
+        print(f"SQLite store: {store.count_assessments()} assessments, {args.users} users, "
+              f"loaded in {elapsed:.1f}s ({args.assessments / elapsed:.0f}/s), {db_size / 1e6:.1f} MB on disk")
+
+        sampled_users = [(random.choice(users),) for _ in range(args.ops)]
+        report('list_assessments(user)', timed(lambda u: store.list_assessments(u, summary=False), sampled_users))
+        report('list_assessments(summary)', timed(store.list_assessments, sampled_users))
+        report('list (summary, cached)', timed(store.list_assessments, sampled_users))
+        report('get_assessment + progress', timed(
+            lambda a: (store.get_assessment(a), store.get_progress(a)),
+            [(random.choice(assessment_ids),) for _ in range(args.ops)]))
+        report('update_progress', timed(store.update_progress,
+                                        [(random.choice(progress_ids), 'completed') for _ in range(args.ops)]))
+        to_delete = random.sample(assessment_ids, min(args.ops, len(assessment_ids)))
+        report('delete_assessment', timed(store.delete_assessment, [(a,) for a in to_delete]))
+
+        if args.legacy_assessments:
+            legacy_dir = os.path.join(tmp, 'data')
+            legacy_users = max(1, args.legacy_assessments * args.users // max(args.assessments, 1))
+            users, assessment_ids, progress_ids = populate_legacy(
+                legacy_dir, args.legacy_assessments, legacy_users, args.milestones)
+            ops = max(1, min(args.ops, 50))
+            print(f"JSON files (old layout): {args.legacy_assessments} assessments, {legacy_users} users")
+            report('get_assessments(user)', timed(
+                lambda u: legacy_get_assessments(legacy_dir, u), [(random.choice(users),) for _ in range(ops)]))
+            report('get_assessment (scan)', timed(
+                lambda a: legacy_get_assessment(legacy_dir, a), [(random.choice(assessment_ids),) for _ in range(ops)]))
+            report('update_progress (scan)', timed(
+                lambda p: legacy_update_progress(legacy_dir, p, 'completed'),
+                [(random.choice(progress_ids),) for _ in range(ops)]))
+
+
+if __name__ == '__main__':
+    main()
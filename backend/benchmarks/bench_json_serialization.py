@@ -0,0 +1,122 @@
+"""Benchmark JSON serialization time and payload size for the largest API responses.
+
+Each endpoint's response is built from a synthetic analysis and serialized
+the way Flask 2.0's jsonify does it (stdlib json, sorted keys) and with the
+orjson-based json_provider.dumps. assess-skills is measured with the old
+display_format, which repeated every analysis section, and with the current
+one, which references the sections by key.
+
+    python benchmarks/bench_json_serialization.py --iterations 500
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_provider import dumps, orjson  # noqa: E402
+
+SECTIONS = [
+    ('Summary', 'summary', 'summary'),
+    ('Required Skills', 'list', 'required_skills'),
+    ('Skill Gaps', 'table', 'skill_gaps'),
+    ('Learning Path', 'timeline', 'learning_path'),
+    ('Milestones', 'timeline', 'milestones'),
+    ('Recommended Resources', 'cards', 'resources'),
+    ('Risk Assessment', 'table', 'risk_assessment'),
+]
+
+
+def synthetic_analysis():
+    return {
+        'summary': {'current_level': 'Intermediate', 'target_level': 'Senior', 'overview': 'x' * 600},
+        'required_skills': [{'skill': f'Skill {i}', 'importance': 'high', 'description': 'd' * 150} for i in range(15)],
+        'skill_gaps': [{'skill': f'Skill {i}', 'current_score': 40, 'target_score': 90, 'gap': 'g' * 200,
+                        'priority': 'high'} for i in range(12)],
+        'learning_path': [{'step': i, 'title': f'Step {i}', 'description': 'l' * 400, 'duration': '2 weeks',
+                           'resources': [f'https://example.com/{i}/{j}' for j in range(4)]} for i in range(10)],
+        'milestones': [{'milestone': f'Milestone {i}', 'target_date': '2025-06-01', 'description': 'm' * 200}
+                       for i in range(8)],
+        'resources': [{'title': f'Course {i}', 'url': f'https://example.com/course/{i}', 'type': 'course',
+                       'description': 'r' * 250, 'cost': 'free'} for i in range(20)],
+        'risk_assessment': [{'risk': f'Risk {i}', 'mitigation': 'k' * 200} for i in range(5)],
+    }
+
+
+def assess_skills_response(analysis, inline_sections):
+    if inline_sections:
+        sections = [{'title': t, 'type': ty, 'content': analysis.get(k, [])} for t, ty, k in SECTIONS]
+    else:
+        sections = [{'title': t, 'type': ty, 'key': k} for t, ty, k in SECTIONS]
+    return {
+        'analysis': analysis, 'current_role': 'Analyst', 'target_role': 'Data Scientist',
+        'experience_level': '3', 'timeframe': '6 months', 'current_skills': ['python', 'sql', 'excel'],
+        'display_format': {'sections': sections},
+    }
+
+
+def assessment(analysis):
+    return {
+        'id': str(uuid.uuid4()), 'user_id': str(uuid.uuid4()), 'target_role': 'Data Scientist',
+        'current_role': 'Analyst', 'experience': '3', 'timeframe': '6 months',
+        'assessment_data': {'analysis': analysis}, 'created_at': '2025-01-01T00:00:00', 'status': 'active',
+        'progress': 37.5,
+    }
+
+
+def get_assessment_response(analysis):
+    progress = [{'id': str(uuid.uuid4()), 'milestone_id': f'milestone_{i}', 'milestone': f'Milestone {i}',
+                 'target_date': '2025-06-01', 'status': 'in_progress', 'notes': 'n' * 100} for i in range(8)]
+    return {'assessment': assessment(analysis), 'learning_path': analysis['learning_path'],
+            'skill_gaps': analysis['skill_gaps'], 'progress': progress}
+
+
+def summary_page():
+    return {'assessments': [{'id': str(uuid.uuid4()), 'target_role': 'Data Scientist', 'current_role': 'Analyst',
+                             'created_at': '2025-01-01T00:00:00', 'status': 'active', 'skill_gap_count': 12,
+                             'resource_count': 20, 'milestone_count': 8, 'progress': 37.5} for _ in range(20)],
+            'next_cursor': 'WyIyMDI1LTAxLTAxVDAwOjAwOjAwIiwgImFiYyJd'}
+
+
+def flask_default_dumps(obj):
+    # What jsonify produces on Flask 2.0 outside debug mode
+    return (json.dumps(obj, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def measure(fn, payload, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = fn(payload)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    analysis = synthetic_analysis()
+    endpoints = [
+        ('assess-skills (inline sections)', assess_skills_response(analysis, inline_sections=True)),
+        ('assess-skills (section keys)', assess_skills_response(analysis, inline_sections=False)),
+        ('get-assessment', get_assessment_response(analysis)),
+        ('get-assessments (full, 20)', {'assessments': [assessment(analysis) for _ in range(20)],
+                                        'next_cursor': None}),
+        ('get-assessments (summary, 20)', summary_page()),
+    ]
+    fast_label = 'orjson' if orjson is not None else 'json (orjson not installed)'
+    print(f"{'endpoint':<34}{'stdlib ms':>10}{fast_label + ' ms':>12}{'speedup':>9}{'bytes':>10}")
+    for label, payload in endpoints:
+        slow_ms, size = measure(flask_default_dumps, payload, args.iterations)
+        fast_ms, _ = measure(dumps, payload, args.iterations)
+        print(f"{label:<34}{slow_ms:>10.3f}{fast_ms:>12.3f}{slow_ms / fast_ms:>8.1f}x{size:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the time it takes to import backend/app.py.
+
+Each run imports the app in a fresh interpreter, so the numbers reflect what a
+gunicorn worker boot or a test run pays before serving anything. Importing must
+not touch the network, so the benchmark runs with a dummy GROQ_API_KEY and an
+unroutable Milvus host. Use --max-seconds in CI to fail on regressions.
+
+    python benchmarks/bench_startup.py --runs 5 --max-seconds 2.0
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(env, cwd):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import app"],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app failed:\n{result.stderr[-2000:]}")
+    return elapsed
+
+
+def slowest_imports(env, cwd, top):
+    """Return the modules with the largest cumulative import time from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import app"],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail if the median import time exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest imports")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "benchmark-dummy-key")
+    env["MILVUS_HOST"] = "127.0.0.1"
+    env["MILVUS_PORT"] = "1"
+
+    # Run in a scratch directory so uploads/ and data/ are not created in the repo
+    with tempfile.TemporaryDirectory() as cwd:
+        timings = [time_import(env, cwd) for _ in range(args.runs)]
+        median = statistics.median(timings)
+        print(f"import app: median {median:.3f}s  min {min(timings):.3f}s  max {max(timings):.3f}s  ({args.runs} runs)")
+
+        print(f"\nSlowest {args.top} imports (cumulative):")
+        for cumulative_us, name in slowest_imports(env, cwd, args.top):
+            print(f"  {cumulative_us / 1e6:8.3f}s  {name}")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"\nFAIL: median import time {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    from .pagination import encode_cursor, decode_cursor
+except ImportError:
+    # Imported as a top-level module (scripts run from backend/)
+    from pagination import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS certificates (
+        certificate_id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        topics TEXT,
+        score REAL,
+        date_issued TIMESTAMP
+    )""",
+    'CREATE INDEX IF NOT EXISTS idx_certificates_user_issued ON certificates (user_id, date_issued, certificate_id)',
+]
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_VERIFY_BATCH = 100
+
+
+class CertificateStore:
+    """
+    Certificates in SQLite, looked up by certificate_id or listed per user.
+
+    Uses one connection per thread, like the assessment store, and likewise
+    leaves table creation to migrate() so constructing it touches nothing.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def migrate(self) -> None:
+        """Create the certificates table and index; safe to run again"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'certificate_id': row['certificate_id'],
+            'user_id': row['user_id'],
+            'topics': json.loads(row['topics'] or '[]'),
+            'score': row['score'],
+            'date_issued': row['date_issued'],
+        }
+
+    def save(self, certificate: Dict[str, Any]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO certificates (certificate_id, user_id, topics, score, date_issued)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (certificate['certificate_id'], certificate['user_id'], json.dumps(certificate.get('topics', [])),
+                 certificate.get('score'), certificate.get('date_issued') or datetime.now().isoformat())
+            )
+
+    def get(self, certificate_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            'SELECT * FROM certificates WHERE certificate_id = ?', (certificate_id,)
+        ).fetchone()
+        return self._from_row(row) if row else None
+
+    def get_many(self, certificate_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up several certificates in one query; unknown IDs map to None"""
+        ids = list(dict.fromkeys(certificate_ids))
+        found: Dict[str, Optional[Dict[str, Any]]] = {certificate_id: None for certificate_id in ids}
+        if ids:
+            rows = self._connection().execute(
+                f"SELECT * FROM certificates WHERE certificate_id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+            for row in rows:
+                found[row['certificate_id']] = self._from_row(row)
+        return found
+
+    def list_for_user(self, user_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return one page of a user's certificates, newest first.
+
+        Returns {'certificates': [...], 'next_cursor': str or None}.
+        Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where, params = 'user_id = ?', [user_id]
+        if cursor:
+            date_issued, certificate_id = decode_cursor(cursor)
+            where += ' AND (date_issued < ? OR (date_issued = ? AND certificate_id < ?))'
+            params += [date_issued, date_issued, certificate_id]
+        rows = self._connection().execute(
+            f"""SELECT * FROM certificates WHERE {where}
+                ORDER BY date_issued DESC, certificate_id DESC LIMIT ?""",
+            params + [limit + 1]
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(rows[limit - 1]['date_issued'], rows[limit - 1]['certificate_id'])
+        return {'certificates': [self._from_row(row) for row in rows[:limit]], 'next_cursor': next_cursor}
+
+    def import_directory(self, certificates_dir: str) -> int:
+        """Import the CERT-*.json files the service used to write; existing certificates are kept"""
+        if not os.path.isdir(certificates_dir):
+            return 0
+        certificates = []
+        for name in sorted(os.listdir(certificates_dir)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(certificates_dir, name)) as f:
+                    certificates.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not read certificate {name}: {str(e)}")
+        conn = self._connection()
+        with conn:
+            cursor = conn.executemany(
+                """INSERT OR IGNORE INTO certificates (certificate_id, user_id, topics, score, date_issued)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(c['certificate_id'], c['user_id'], json.dumps(c.get('topics', [])), c.get('score'),
+                  c.get('date_issued')) for c in certificates if 'certificate_id' in c and 'user_id' in c]
+            )
+        return cursor.rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import certificate JSON files into the certificate store")
+    parser.add_argument('--db', default=os.getenv('PATHWAY_DB_PATH', 'pathway_data.db'), help='Database path')
+    parser.add_argument('certificates_dir', nargs='?', default=os.path.join('data', 'certificates'))
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    store = CertificateStore(args.db)
+    store.migrate()
+    imported = store.import_directory(args.certificates_dir)
+    print(f"Imported {imported} certificates from {args.certificates_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,367 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+import concurrent.futures
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from resource_cache import ResourceCache, FRESH, normalize_skill
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 5.0
+# How often the most-requested skills are checked and re-crawled before their cache entries go stale
+SCHEDULE_INTERVAL = 3600.0
+POPULAR_SKILLS = 50
+POPULARITY_WINDOW_DAYS = 7
+MAX_PARALLEL_JOBS = 4
+JOB_TIMEOUT = 120.0
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 30.0
+BACKOFF_MAX = 3600.0
+# Finished jobs are kept this long for the status endpoint
+JOB_RETENTION = 7 * 24 * 3600
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS crawl_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        skill TEXT NOT NULL,
+        sources TEXT,
+        reason TEXT,
+        status TEXT NOT NULL,
+        attempts INTEGER DEFAULT 0,
+        next_run_at REAL NOT NULL,
+        last_error TEXT,
+        resource_count INTEGER,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )""",
+    # At most one queued and one running job per skill; the queued one is a follow-up
+    # for sources requested while the running crawl was already under way
+    'DROP INDEX IF EXISTS idx_crawl_jobs_active_skill',
+    """CREATE UNIQUE INDEX IF NOT EXISTS idx_crawl_jobs_pending_skill ON crawl_jobs (skill, status)
+       WHERE status IN ('queued', 'running')""",
+    'CREATE INDEX IF NOT EXISTS idx_crawl_jobs_due ON crawl_jobs (status, next_run_at)',
+    """CREATE TABLE IF NOT EXISTS skill_requests (
+        skill TEXT NOT NULL,
+        day TEXT NOT NULL,
+        requests INTEGER NOT NULL,
+        PRIMARY KEY (skill, day)
+    )""",
+]
+
+JOB_COLUMNS = ('id', 'skill', 'sources', 'reason', 'status', 'attempts', 'next_run_at', 'last_error',
+               'resource_count', 'created_at', 'updated_at')
+
+
+def _covers(job_sources: Optional[str], sources: Optional[List[str]]) -> bool:
+    """Whether a job's encoded source list (NULL meaning every source) includes the requested sources"""
+    if job_sources is None:
+        return True
+    return sources is not None and set(sources) <= set(json.loads(job_sources))
+
+
+def _merge_sources(first: Optional[str], second: Optional[str]) -> Optional[str]:
+    if first is None or second is None:
+        return None
+    return json.dumps(sorted(set(json.loads(first)) | set(json.loads(second))))
+
+
+@contextmanager
+def _immediate_transaction(conn: sqlite3.Connection):
+    # Take the write lock up front, so the rows read are still current when they are written
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def backoff_delay(attempts: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class CrawlJobRunner:
+    """
+    Background crawl queue persisted in SQLite, run by a thread in each server process.
+
+    Request handlers only enqueue work, so lookups never wait on a scrape.
+    Every SCHEDULE_INTERVAL the most-requested skills whose cache entries
+    will go stale before the next check are queued as well. A skill has at
+    most one queued job, and sources requested while it is being crawled
+    go into a follow-up job that runs once the crawl finishes; failed
+    crawls are retried with exponential backoff up to max_attempts. Jobs are claimed with a conditional update,
+    so several worker processes can share one database.
+    """
+
+    def __init__(self, db_path: str, scraper, cache: Optional[ResourceCache] = None,
+                 poll_interval: float = POLL_INTERVAL, schedule_interval: float = SCHEDULE_INTERVAL,
+                 popular_skills: int = POPULAR_SKILLS, max_parallel: int = MAX_PARALLEL_JOBS,
+                 job_timeout: float = JOB_TIMEOUT, max_attempts: int = MAX_ATTEMPTS,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.scraper = scraper
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.schedule_interval = schedule_interval
+        self.popular_skills = popular_skills
+        self.max_parallel = max_parallel
+        self.job_timeout = job_timeout
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._local = threading.local()
+        self._requests: Counter = Counter()
+        self._requests_lock = threading.Lock()
+        self._next_schedule = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def migrate(self) -> None:
+        """Create the job and request-count tables; run once per deployment, not on import"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, skill: str, sources: Optional[List[str]] = None, reason: str = 'request',
+                delay: float = 0) -> bool:
+        """
+        Queue a crawl of a skill; returns False if a queued or running job already covers it.
+
+        While a crawl of the skill is running, sources it does not cover are
+        queued as a follow-up job, which is claimed once the running one ends.
+        """
+        skill = normalize_skill(skill)
+        now = self.clock()
+        encoded = json.dumps(sorted(sources)) if sources else None
+        conn = self._connection()
+        with _immediate_transaction(conn):
+            running = conn.execute('SELECT sources FROM crawl_jobs WHERE skill = ? AND status = ?',
+                                   (skill, RUNNING)).fetchone()
+            if running is not None and _covers(running['sources'], sources):
+                return False
+            cursor = conn.execute(
+                """INSERT OR IGNORE INTO crawl_jobs (skill, sources, reason, status, next_run_at, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (skill, encoded, reason, QUEUED, now + delay, now, now)
+            )
+            if cursor.rowcount:
+                return True
+            # Already queued for other sources: widen that job to every source
+            conn.execute(
+                """UPDATE crawl_jobs SET sources = NULL, updated_at = ?
+                   WHERE skill = ? AND status = ? AND sources IS NOT NULL AND sources IS NOT ?""",
+                (now, skill, QUEUED, encoded)
+            )
+        return False
+
+    def record_request(self, skill: str) -> None:
+        """Count a user lookup of a skill; counts are written to the database by the runner thread"""
+        with self._requests_lock:
+            self._requests[normalize_skill(skill)] += 1
+
+    def _flush_requests(self) -> None:
+        with self._requests_lock:
+            counts, self._requests = self._requests, Counter()
+        if not counts:
+            return
+        day = datetime.fromtimestamp(self.clock()).date().isoformat()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                """INSERT INTO skill_requests (skill, day, requests) VALUES (?, ?, ?)
+                   ON CONFLICT (skill, day) DO UPDATE SET requests = requests + excluded.requests""",
+                [(skill, day, count) for skill, count in counts.items()]
+            )
+
+    def popular(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most-requested skills over the popularity window"""
+        since = (datetime.fromtimestamp(self.clock()) - timedelta(days=POPULARITY_WINDOW_DAYS)).date().isoformat()
+        rows = self._connection().execute(
+            """SELECT skill, SUM(requests) AS requests FROM skill_requests WHERE day >= ?
+               GROUP BY skill ORDER BY requests DESC LIMIT ?""",
+            (since, limit or self.popular_skills)
+        ).fetchall()
+        return [{'skill': row['skill'], 'requests': row['requests']} for row in rows]
+
+    def schedule_popular(self) -> int:
+        """Queue popular skills whose listings will be stale before the next scheduling pass"""
+        scheduled = 0
+        sources = list(self.scraper.scraper.sources)
+        for entry in self.popular():
+            outdated = sources
+            if self.cache is not None:
+                entries = self.cache.lookup_many(entry['skill'], sources, record=False, ahead=self.schedule_interval)
+                outdated = [source for source, (state, _, _) in entries.items() if state != FRESH]
+            if outdated and self.enqueue(entry['skill'], outdated, reason='popular'):
+                scheduled += 1
+        return scheduled
+
+    def _prune(self) -> None:
+        now = self.clock()
+        cutoff_day = (datetime.fromtimestamp(now) - timedelta(days=POPULARITY_WINDOW_DAYS)).date().isoformat()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM crawl_jobs WHERE status IN (?, ?) AND updated_at < ?',
+                         (DONE, FAILED, now - JOB_RETENTION))
+            conn.execute('DELETE FROM skill_requests WHERE day < ?', (cutoff_day,))
+
+    def _requeue(self, conn: sqlite3.Connection, job: sqlite3.Row, next_run_at: float, error: Optional[str]) -> None:
+        # A follow-up queued while the job ran is folded into it, as a skill has only one queued job
+        sources = job['sources']
+        follow_up = conn.execute('SELECT id, sources FROM crawl_jobs WHERE skill = ? AND status = ?',
+                                 (job['skill'], QUEUED)).fetchone()
+        if follow_up is not None:
+            conn.execute('DELETE FROM crawl_jobs WHERE id = ?', (follow_up['id'],))
+            sources = _merge_sources(sources, follow_up['sources'])
+        conn.execute('UPDATE crawl_jobs SET status = ?, sources = ?, next_run_at = ?, last_error = ?, updated_at = ? '
+                     'WHERE id = ?', (QUEUED, sources, next_run_at, error, self.clock(), job['id']))
+
+    def _recover(self) -> None:
+        # Jobs left running by a process that died are queued again
+        now = self.clock()
+        conn = self._connection()
+        with _immediate_transaction(conn):
+            stale = conn.execute('SELECT * FROM crawl_jobs WHERE status = ? AND updated_at < ?',
+                                 (RUNNING, now - 2 * self.job_timeout)).fetchall()
+            for job in stale:
+                self._requeue(conn, job, job['next_run_at'], job['last_error'])
+
+    def _claim(self, limit: int) -> List[sqlite3.Row]:
+        now = self.clock()
+        conn = self._connection()
+        # A follow-up waits until the crawl of its skill that is still running has finished
+        candidates = conn.execute(
+            """SELECT * FROM crawl_jobs q WHERE status = ? AND next_run_at <= ?
+               AND NOT EXISTS (SELECT 1 FROM crawl_jobs r WHERE r.skill = q.skill AND r.status = ?)
+               ORDER BY next_run_at LIMIT ?""",
+            (QUEUED, now, RUNNING, limit)
+        ).fetchall()
+        claimed = []
+        for job in candidates:
+            with conn:
+                cursor = conn.execute(
+                    """UPDATE crawl_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ? AND status = ?
+                       AND NOT EXISTS (SELECT 1 FROM crawl_jobs r WHERE r.skill = crawl_jobs.skill AND r.status = ?)""",
+                    (RUNNING, now, job['id'], QUEUED, RUNNING)
+                )
+            # Another worker process may have claimed it first
+            if cursor.rowcount:
+                claimed.append(job)
+        return claimed
+
+    def _finish(self, job: sqlite3.Row, resource_count: Optional[int], error: Optional[str]) -> None:
+        now = self.clock()
+        attempts = job['attempts'] + 1
+        conn = self._connection()
+        with _immediate_transaction(conn):
+            if error is None:
+                conn.execute('UPDATE crawl_jobs SET status = ?, resource_count = ?, last_error = NULL, updated_at = ? '
+                             'WHERE id = ?', (DONE, resource_count, now, job['id']))
+            elif attempts < self.max_attempts:
+                self._requeue(conn, job, now + backoff_delay(attempts), error)
+            else:
+                conn.execute('UPDATE crawl_jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?',
+                             (FAILED, error, now, job['id']))
+                logger.error(f"Crawl of '{job['skill']}' failed after {attempts} attempts: {error}")
+
+    def run_pending(self) -> int:
+        """Run the crawls that are due, up to max_parallel at once; returns how many ran"""
+        jobs = self._claim(self.max_parallel)
+        if not jobs:
+            return 0
+        futures = {
+            self.scraper.refresh(job['skill'], json.loads(job['sources']) if job['sources'] else None): job
+            for job in jobs
+        }
+        done, not_done = concurrent.futures.wait(futures, timeout=self.job_timeout)
+        for future in not_done:
+            future.cancel()
+            self._finish(futures[future], None, 'timed out')
+        for future in done:
+            job = futures[future]
+            try:
+                resources = future.result()
+            except Exception as e:
+                self._finish(job, None, str(e) or type(e).__name__)
+                continue
+            # Sources swallow fetch errors and return nothing, so an empty crawl is retried
+            self._finish(job, len(resources), None if resources else 'no resources found')
+        return len(jobs)
+
+    def tick(self) -> None:
+        self._flush_requests()
+        now = self.clock()
+        if now >= self._next_schedule:
+            self._next_schedule = now + self.schedule_interval
+            self._prune()
+            scheduled = self.schedule_popular()
+            if scheduled:
+                logger.info(f"Scheduled prefetch crawls for {scheduled} popular skills")
+        while self.run_pending() and not self._stop.is_set():
+            pass
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='crawl-jobs', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        self._recover()
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Error running crawl jobs: {str(e)}")
+            self._stop.wait(self.poll_interval)
+
+    def status(self, recent: int = 20) -> Dict[str, Any]:
+        """Job counts by status, the most recently updated jobs and the skills prefetched by popularity"""
+        conn = self._connection()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        for row in conn.execute('SELECT status, COUNT(*) FROM crawl_jobs GROUP BY status'):
+            counts[row[0]] = row[1]
+        jobs = []
+        for row in conn.execute('SELECT * FROM crawl_jobs ORDER BY updated_at DESC LIMIT ?', (recent,)):
+            job = {column: row[column] for column in JOB_COLUMNS}
+            job['sources'] = json.loads(job['sources']) if job['sources'] else None
+            for column in ('next_run_at', 'created_at', 'updated_at'):
+                job[column] = datetime.fromtimestamp(job[column]).isoformat()
+            jobs.append(job)
+        return {
+            'counts': counts,
+            'recent_jobs': jobs,
+            'popular_skills': self.popular(),
+            'next_schedule_at': datetime.fromtimestamp(self._next_schedule).isoformat() if self._next_schedule else None,
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
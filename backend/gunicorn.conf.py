@@ -0,0 +1,16 @@
+import os
+
+# Gunicorn loads this file automatically from the working directory.
+# Workers import app.py without side effects, then start background tasks and warm up here before serving.
+
+def on_starting(server):
+    # Runs once in the master before any worker forks, so schema changes never race between workers
+    from storage import migrate
+    migrate()
+
+def post_worker_init(worker):
+    from app import start_background_tasks, warmup
+    start_background_tasks()
+    if os.getenv("APP_WARMUP", "true").lower() in ("0", "false", "no"):
+        return
+    warmup(check_groq=os.getenv("APP_WARMUP_CHECK_GROQ", "false").lower() in ("1", "true", "yes"))
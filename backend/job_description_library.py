@@ -0,0 +1,219 @@
+import os
+import re
+import sys
+import sqlite3
+import logging
+import argparse
+import difflib
+import functools
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Abbreviations expanded before matching so "Sr. Software Dev" and "Senior Software Developer" agree
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior',
+    'jr': 'junior',
+    'mgr': 'manager',
+    'eng': 'engineer',
+    'engr': 'engineer',
+    'dev': 'developer',
+    'devs': 'developer',
+    'swe': 'software engineer',
+    'sde': 'software engineer',
+    'ml': 'machine learning',
+    'ux': 'user experience',
+    'ui': 'user interface',
+    'qa': 'quality assurance',
+    'pm': 'product manager',
+    'dba': 'database administrator',
+    'sre': 'site reliability engineer',
+}
+
+# Seniority and level markers that do not change the underlying job description
+TITLE_LEVEL_WORDS = {
+    'senior', 'junior', 'lead', 'principal', 'staff', 'associate',
+    'entry', 'level', 'mid', 'intern', 'trainee', 'i', 'ii', 'iii', 'iv', '1', '2', '3'
+}
+
+# Roles pre-generated by the offline build command when no roles file is given
+DEFAULT_ROLES = [
+    'Software Engineer', 'Data Scientist', 'Data Analyst', 'Data Engineer',
+    'Machine Learning Engineer', 'Frontend Developer', 'Backend Developer',
+    'Full Stack Developer', 'DevOps Engineer', 'Cloud Engineer', 'Cloud Architect',
+    'Site Reliability Engineer', 'Mobile Developer', 'Android Developer', 'iOS Developer',
+    'Product Manager', 'Project Manager', 'Program Manager', 'Business Analyst',
+    'UX Designer', 'UI Designer', 'Product Designer', 'QA Engineer', 'Test Automation Engineer',
+    'Security Engineer', 'Cybersecurity Analyst', 'Network Engineer', 'Systems Administrator',
+    'Database Administrator', 'Solutions Architect', 'Software Architect', 'AI Engineer',
+    'Research Scientist', 'Business Intelligence Analyst', 'Game Developer',
+    'Embedded Systems Engineer', 'Blockchain Developer', 'Technical Writer',
+    'Engineering Manager', 'Scrum Master', 'Digital Marketing Manager', 'Marketing Analyst',
+    'Financial Analyst', 'Technical Support Engineer', 'Salesforce Developer',
+    'Computer Vision Engineer', 'NLP Engineer', 'MLOps Engineer', 'Platform Engineer',
+    'Growth Product Manager'
+]
+
+
+def normalize_role_title(title: str) -> str:
+    """Normalize a role title for matching, e.g. "Sr. Data Scientist II" -> "data scientist" """
+    title = (title or '').lower().replace('&', ' and ')
+    # Keep + and # so "C++ Developer" and "C# Developer" stay distinct
+    title = re.sub(r'[^a-z0-9+#\s]', ' ', title)
+    words = []
+    for word in title.split():
+        words.extend(TITLE_ABBREVIATIONS.get(word, word).split())
+    core = [w for w in words if w not in TITLE_LEVEL_WORDS]
+    # Titles made only of level words ("Lead") are kept as-is rather than matched to nothing
+    return ' '.join(core or words)
+
+
+class JobDescriptionLibrary:
+    """Precomputed job descriptions stored in SQLite and matched by normalized or fuzzy role title"""
+
+    def __init__(self, db_path: str, fuzzy_cutoff: float = 0.88):
+        self.db_path = db_path
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._titles: Optional[List[str]] = None
+
+    def migrate(self) -> None:
+        """Create the database directory and table; run once per deployment, not on import"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS job_descriptions (
+                normalized_title TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT,
+                created_at TEXT
+            )"""
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return a per-thread connection to the library database"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _known_titles(self) -> List[str]:
+        with self._lock:
+            if self._titles is None:
+                rows = self._connection().execute('SELECT normalized_title FROM job_descriptions').fetchall()
+                self._titles = [row[0] for row in rows]
+            return self._titles
+
+    def lookup(self, title: str) -> Optional[str]:
+        """Return the stored description for a title, trying an exact then a fuzzy normalized match"""
+        normalized = normalize_role_title(title)
+        if not normalized:
+            return None
+
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT description FROM job_descriptions WHERE normalized_title = ?', (normalized,)
+        ).fetchone()
+        if row:
+            logger.debug(f"Job description library hit for '{title}' -> '{normalized}'")
+            return row[0]
+
+        matches = difflib.get_close_matches(normalized, self._known_titles(), n=1, cutoff=self.fuzzy_cutoff)
+        if matches:
+            row = conn.execute(
+                'SELECT description FROM job_descriptions WHERE normalized_title = ?', (matches[0],)
+            ).fetchone()
+            if row:
+                logger.debug(f"Job description library fuzzy hit for '{title}' -> '{matches[0]}'")
+                return row[0]
+        return None
+
+    def add(self, title: str, description: str, source: str = 'groq') -> None:
+        """Store or replace the description for a role title"""
+        normalized = normalize_role_title(title)
+        if not normalized or not description:
+            return
+        conn = self._connection()
+        conn.execute(
+            """INSERT OR REPLACE INTO job_descriptions (normalized_title, title, description, source, created_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (normalized, title, description, source, datetime.now().isoformat())
+        )
+        conn.commit()
+        with self._lock:
+            self._titles = None
+
+    def get_or_fetch(self, title: str, fetch: Callable[[str], str]) -> str:
+        """Return a library description, falling back to fetch() and writing its result back"""
+        description = self.lookup(title)
+        if description is not None:
+            return description
+        description = fetch(title)
+        self.add(title, description, source='groq')
+        return description
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM job_descriptions').fetchone()[0]
+
+
+def build_library(library: JobDescriptionLibrary, roles: List[str], fetch: Callable[[str], str],
+                  refresh: bool = False) -> int:
+    """Generate and store descriptions for the given roles, skipping ones already present"""
+    built = 0
+    for role in roles:
+        if not refresh and library.lookup(role) is not None:
+            logger.info(f"Skipping '{role}', already in library")
+            continue
+        try:
+            library.add(role, fetch(role), source='batch')
+            built += 1
+            logger.info(f"Stored job description for '{role}'")
+        except Exception as e:
+            logger.error(f"Failed to build job description for '{role}': {str(e)}")
+    return built
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the precomputed job description library")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='Generate descriptions for the top N roles')
+    build.add_argument('--top', type=int, default=len(DEFAULT_ROLES), help='Number of roles to build')
+    build.add_argument('--roles-file', help='Text file with one role title per line, most requested first')
+    build.add_argument('--refresh', action='store_true', help='Regenerate roles that already exist')
+
+    lookup = subparsers.add_parser('lookup', help='Show which stored description a title resolves to')
+    lookup.add_argument('title')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    # Imported here so the library module itself stays free of the Flask app's startup cost
+    from app import job_description_library, fetch_job_description_from_groq
+    from rate_limiter import PRIORITY_BACKGROUND
+    job_description_library.migrate()
+
+    if args.command == 'build':
+        roles = DEFAULT_ROLES
+        if args.roles_file:
+            with open(args.roles_file, 'r') as f:
+                roles = [line.strip() for line in f if line.strip()]
+        # Batch builds yield to interactive traffic sharing the same rate limits
+        fetch = functools.partial(fetch_job_description_from_groq, priority=PRIORITY_BACKGROUND)
+        built = build_library(job_description_library, roles[:args.top], fetch, args.refresh)
+        print(f"Built {built} job descriptions ({job_description_library.count()} in library)")
+    elif args.command == 'lookup':
+        description = job_description_library.lookup(args.title)
+        print(f"'{args.title}' -> '{normalize_role_title(args.title)}'")
+        print(description if description is not None else 'No match; would fall through to Groq')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
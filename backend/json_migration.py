@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 200
+
+CHECKPOINT_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS json_migration (
+        assessment_id TEXT PRIMARY KEY,
+        user_id TEXT,
+        checksum TEXT,
+        migrated_at TIMESTAMP
+    )""",
+]
+
+# Directories under data/ that hold other features' files rather than users
+NON_USER_DIRS = {'resources', 'certificates'}
+
+# Fields compared by the checksum, with the defaults save_assessments applies when one is missing
+ASSESSMENT_FIELDS = {'id': None, 'user_id': None, 'target_role': '', 'current_role': '', 'experience': '',
+                     'timeframe': '', 'created_at': None, 'status': 'active'}
+MILESTONE_FIELDS = {'id': None, 'milestone_id': '', 'milestone': '', 'target_date': '', 'status': 'not_started',
+                    'notes': '', 'completed_at': None, 'created_at': None}
+
+
+def _text(value: Any) -> str:
+    # Columns are TEXT, so compare everything the way SQLite stores it
+    return '' if value is None else str(value)
+
+
+def record_checksum(assessment: Dict[str, Any], milestones: List[Dict[str, Any]]) -> str:
+    """Checksum of an assessment and its milestones that is the same for the JSON files and the stored rows"""
+    canonical = {
+        'assessment': {field: _text(assessment.get(field, default)) for field, default in ASSESSMENT_FIELDS.items()},
+        'assessment_data': assessment.get('assessment_data') or {},
+        'milestones': sorted(
+            ({field: _text(m.get(field, default)) for field, default in MILESTONE_FIELDS.items()} for m in milestones),
+            key=lambda m: m['id']
+        ),
+    }
+    body = json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def discover(data_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yield (user_id, assessment_id) for every assessment directory in the tree"""
+    with os.scandir(data_dir) as users:
+        user_ids = sorted(entry.name for entry in users if entry.is_dir() and entry.name not in NON_USER_DIRS)
+    for user_id in user_ids:
+        with os.scandir(os.path.join(data_dir, user_id)) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'assessment.json')):
+                    yield user_id, entry.name
+
+
+def _load_json(path: str, expected: type) -> Tuple[Any, int]:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    value = json.loads(raw)
+    if not isinstance(value, expected):
+        raise ValueError(f"{os.path.basename(path)} holds a {type(value).__name__}, expected a {expected.__name__}")
+    return value, len(raw)
+
+
+def _modified_at(path: str) -> str:
+    return datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+
+def parse_batch(data_dir: str, batch: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Read one batch of assessment directories (runs in a worker process).
+
+    Returns the (user, assessment, milestones) triples ready for
+    save_assessments, their checksums, the bytes read and any errors.
+    A directory that cannot be read or parsed is recorded as an error
+    and skipped, whatever the exception, so it never aborts the pool.
+    """
+    items, checksums, errors = [], [], []
+    users: Dict[str, Dict[str, Any]] = {}
+    bytes_read = 0
+    for user_id, assessment_dir in batch:
+        path = os.path.join(data_dir, user_id, assessment_dir)
+        try:
+            if user_id not in users:
+                user_file = os.path.join(data_dir, user_id, 'user_info.json')
+                user = {'id': user_id}
+                if os.path.exists(user_file):
+                    user, size = _load_json(user_file, dict)
+                    bytes_read += size
+                    user['id'] = user_id
+                users[user_id] = user
+            assessment_file = os.path.join(path, 'assessment.json')
+            assessment, size = _load_json(assessment_file, dict)
+            bytes_read += size
+            assessment.setdefault('id', assessment_dir)
+            assessment['user_id'] = user_id
+            # The store would stamp a missing created_at with the import time, which the
+            # checksum cannot reproduce; the file's modification time is stored instead
+            if not assessment.get('created_at'):
+                assessment['created_at'] = _modified_at(assessment_file)
+
+            milestones = []
+            milestones_file = os.path.join(path, 'milestones.json')
+            if os.path.exists(milestones_file):
+                milestones, size = _load_json(milestones_file, list)
+                bytes_read += size
+                for milestone in milestones:
+                    if not isinstance(milestone, dict) or 'id' not in milestone:
+                        raise ValueError("milestones.json holds an entry that is not a milestone object")
+                    if not milestone.get('created_at'):
+                        milestone['created_at'] = _modified_at(milestones_file)
+            checksum = record_checksum(assessment, milestones)
+        except Exception as e:
+            errors.append((path, f"{type(e).__name__}: {e}"))
+            continue
+        items.append((users[user_id], assessment, milestones))
+        checksums.append((assessment['id'], user_id, checksum))
+    return {'items': items, 'checksums': checksums, 'errors': errors, 'bytes_read': bytes_read}
+
+
+_worker_store = None
+
+
+def _init_verify_worker(db_path: str) -> None:
+    global _worker_store
+    from assessment_store import AssessmentStore
+    _worker_store = AssessmentStore(db_path)
+
+
+def verify_batch(batch: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Recompute checksums from the store for (assessment_id, expected checksum) pairs; returns the mismatches"""
+    mismatches = []
+    for assessment_id, expected in batch:
+        assessment = _worker_store.get_assessment(assessment_id)
+        if assessment is None:
+            mismatches.append((assessment_id, 'missing'))
+        elif record_checksum(assessment, _worker_store.get_progress(assessment_id)) != expected:
+            mismatches.append((assessment_id, 'checksum mismatch'))
+    return mismatches
+
+
+def _batches(items, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class JSONMigration:
+    """
+    Import the legacy data/<user>/<assessment>/*.json tree into an AssessmentStore.
+
+    Files are parsed in a process pool and written in batches from the main
+    process, since SQLite takes one writer at a time. Every imported
+    assessment is checkpointed with a checksum of its source files, so an
+    interrupted run resumes where it stopped and verify() can compare the
+    stored rows against the source.
+    """
+
+    def __init__(self, store, data_dir: str, workers: Optional[int] = None, batch_size: int = MIGRATION_BATCH_SIZE):
+        self.store = store
+        self.data_dir = data_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(store.db_path, timeout=30)
+        with self._conn:
+            for statement in CHECKPOINT_SCHEMA:
+                self._conn.execute(statement)
+
+    def migrated_ids(self) -> set:
+        return {row[0] for row in self._conn.execute('SELECT assessment_id FROM json_migration')}
+
+    def _checkpoint(self, checksums: List[Tuple[str, str, str]]) -> None:
+        now = datetime.now().isoformat()
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO json_migration (assessment_id, user_id, checksum, migrated_at) VALUES (?, ?, ?, ?)',
+                [(assessment_id, user_id, checksum, now) for assessment_id, user_id, checksum in checksums]
+            )
+
+    def run(self) -> Dict[str, Any]:
+        """Import every assessment not checkpointed by an earlier run"""
+        start = time.perf_counter()
+        done = self.migrated_ids()
+        found = list(discover(self.data_dir))
+        pending = [(user_id, assessment_id) for user_id, assessment_id in found if assessment_id not in done]
+        stats = {'discovered': len(found), 'skipped': len(found) - len(pending), 'imported': 0, 'milestones': 0,
+                 'bytes_read': 0, 'errors': []}
+        logger.info(f"{len(pending)} assessments to import, {stats['skipped']} already migrated")
+
+        batches = _batches(pending, self.batch_size)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a bounded number of batches in flight so memory does not grow with the tree
+            in_flight = set()
+            for batch in batches:
+                in_flight.add(pool.submit(parse_batch, self.data_dir, batch))
+                if len(in_flight) >= self.workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self._write(future.result(), stats)
+            for future in in_flight:
+                self._write(future.result(), stats)
+
+        stats['elapsed'] = time.perf_counter() - start
+        return stats
+
+    def _write(self, result: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        if result['items']:
+            self.store.save_assessments(result['items'])
+            # Checkpoint after the rows commit; a crash in between only re-imports this batch
+            self._checkpoint(result['checksums'])
+        stats['imported'] += len(result['items'])
+        stats['milestones'] += sum(len(milestones) for _, _, milestones in result['items'])
+        stats['bytes_read'] += result['bytes_read']
+        for path, error in result['errors']:
+            logger.error(f"Could not import {path}: {error}")
+        stats['errors'].extend(result['errors'])
+        logger.info(f"Imported {stats['imported'] + stats['skipped']}/{stats['discovered']} assessments")
+
+    def verify(self) -> Dict[str, Any]:
+        """Check that every checkpointed assessment is stored and matches the checksum of its source files"""
+        start = time.perf_counter()
+        expected = self._conn.execute('SELECT assessment_id, checksum FROM json_migration ORDER BY assessment_id').fetchall()
+        mismatches = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_verify_worker,
+                                 initargs=(self.store.db_path,)) as pool:
+            for result in pool.map(verify_batch, _batches(expected, self.batch_size)):
+                mismatches.extend(result)
+        source_count = sum(1 for _ in discover(self.data_dir))
+        return {
+            'source_assessments': source_count,
+            'checkpointed': len(expected),
+            'stored_assessments': self.store.count_assessments(),
+            'mismatches': mismatches,
+            'elapsed': time.perf_counter() - start,
+        }
+
+
+def format_report(stats: Dict[str, Any], verification: Optional[Dict[str, Any]] = None) -> str:
+    elapsed = max(stats['elapsed'], 1e-9)
+    lines = [
+        f"Discovered {stats['discovered']} assessments ({stats['skipped']} already migrated)",
+        f"Imported {stats['imported']} assessments and {stats['milestones']} milestones in {elapsed:.1f}s: "
+        f"{stats['imported'] / elapsed:.0f} assessments/s, {stats['bytes_read'] / 1e6 / elapsed:.1f} MB/s",
+    ]
+    if stats['errors']:
+        lines.append(f"{len(stats['errors'])} assessments failed to parse (see log); rerun to retry them")
+    if verification:
+        lines.append(
+            f"Verified {verification['checkpointed']} of {verification['source_assessments']} source assessments "
+            f"in {verification['elapsed']:.1f}s ({verification['stored_assessments']} rows in the store), "
+            f"{len(verification['mismatches'])} mismatches"
+        )
+        for assessment_id, reason in verification['mismatches'][:20]:
+            lines.append(f"  {assessment_id}: {reason}")
+    return '\n'.join(lines)
@@ -0,0 +1,85 @@
+import json
+import dataclasses
+from datetime import date
+from uuid import UUID
+from typing import Any
+
+from flask import Flask, Response, current_app, jsonify as flask_jsonify
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Flask 2.2+ lets the app swap its JSON implementation
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    DefaultJSONProvider = None
+
+if orjson is not None:
+    # Dates go through _default so they keep Flask's HTTP date format
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the extra types Flask's encoder supports"""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a response body to compact UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _payload(args, kwargs) -> Any:
+    if args and kwargs:
+        raise TypeError("jsonify() behavior undefined when passed both args and kwargs")
+    if len(args) == 1:
+        return args[0]
+    return args or kwargs
+
+
+def jsonify(*args, **kwargs) -> Response:
+    """
+    Drop-in replacement for flask.jsonify that serializes with orjson.
+
+    Falls back to flask.jsonify when orjson is not installed or the app is
+    in debug mode, where Flask pretty-prints responses.
+    """
+    if orjson is None or current_app.debug:
+        return flask_jsonify(*args, **kwargs)
+    return current_app.response_class(dumps(_payload(args, kwargs)) + b'\n', mimetype='application/json')
+
+
+if DefaultJSONProvider is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """JSON provider for Flask 2.2+ that serializes with orjson"""
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return dumps(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs) -> Response:
+            if self._app.debug:
+                return super().response(*args, **kwargs)
+            return self._app.response_class(dumps(_payload(args, kwargs)) + b'\n', mimetype=self.mimetype)
+
+
+def install_json_provider(app: Flask) -> None:
+    """Use orjson for every JSON response and request body on Flask 2.2+; older Flask relies on jsonify above"""
+    if orjson is not None and DefaultJSONProvider is not None:
+        app.json = ORJSONProvider(app)
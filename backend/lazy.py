@@ -0,0 +1,31 @@
+import logging
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class LazyProxy:
+    """Proxy that builds the wrapped object on first attribute access instead of at import time"""
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        self._factory = factory
+        self._name = name
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the wrapped object, creating it on the first call"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    logger.info(f"Initializing {self._name}")
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
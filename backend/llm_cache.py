@@ -0,0 +1,285 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Request arguments that change how or when a response is delivered but not what it contains
+NON_KEY_PARAMS = {'stream', 'priority'}
+
+
+def make_cache_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+    """Build a content-addressed key from the model, messages and sampling params"""
+    payload = {
+        'model': model,
+        'messages': messages,
+        'params': {k: v for k, v in params.items() if k not in NON_KEY_PARAMS}
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier LRU + TTL cache for LLM completion text, with an optional SQLite disk tier"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+
+    def migrate(self) -> None:
+        """Create the disk tier's directory and table; run once per deployment, not on import"""
+        if self.disk_path:
+            try:
+                os.makedirs(os.path.dirname(self.disk_path) or '.', exist_ok=True)
+                conn = self._disk_connection()
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        content TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )"""
+                )
+                conn.commit()
+                logger.info(f"LLM response cache disk tier enabled at {self.disk_path}")
+            except Exception as e:
+                logger.warning(f"Could not open LLM cache disk tier at {self.disk_path}: {str(e)}")
+                self.disk_path = None
+
+    def _disk_connection(self) -> sqlite3.Connection:
+        """Return a per-thread connection to the disk tier"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str, count_stats: bool = True) -> Optional[str]:
+        """Return cached content for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, content = entry
+                if not self._is_expired(created_at):
+                    self._entries.move_to_end(key)
+                    if count_stats:
+                        self.stats['hits'] += 1
+                    return content
+                del self._entries[key]
+                self.stats['expired'] += 1
+
+        if self.disk_path:
+            try:
+                row = self._disk_connection().execute(
+                    'SELECT content, created_at FROM llm_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row and not self._is_expired(row[1]):
+                    self._store_memory(key, row[0], row[1])
+                    if count_stats:
+                        with self._lock:
+                            self.stats['disk_hits'] += 1
+                    return row[0]
+            except Exception as e:
+                logger.warning(f"Error reading LLM cache disk tier: {str(e)}")
+
+        if count_stats:
+            with self._lock:
+                self.stats['misses'] += 1
+        return None
+
+    def _store_memory(self, key: str, content: str, created_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (created_at, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def set(self, key: str, content: str) -> None:
+        """Store content in memory and, if enabled, on disk"""
+        created_at = time.time()
+        self._store_memory(key, content, created_at)
+        with self._lock:
+            self.stats['stores'] += 1
+
+        if self.disk_path:
+            try:
+                conn = self._disk_connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO llm_cache (key, content, created_at) VALUES (?, ?, ?)',
+                    (key, content, created_at)
+                )
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"Error writing LLM cache disk tier: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['disk_enabled'] = bool(self.disk_path)
+        return stats
+
+
+class _CachedMessage:
+    def __init__(self, content: str):
+        self.role = 'assistant'
+        self.content = content
+
+
+class _CachedChoice:
+    def __init__(self, content: str):
+        self.index = 0
+        self.finish_reason = 'stop'
+        self.message = _CachedMessage(content)
+
+
+class CachedCompletion:
+    """Minimal stand-in for a Groq ChatCompletion rebuilt from cached text"""
+
+    def __init__(self, model: str, content: str):
+        self.model = model
+        self.cached = True
+        self.usage = None
+        self.choices = [_CachedChoice(content)]
+
+
+class _CachedDelta:
+    def __init__(self, content: str):
+        self.role = 'assistant'
+        self.content = content
+
+
+class _CachedStreamChoice:
+    def __init__(self, content: str):
+        self.index = 0
+        self.finish_reason = 'stop'
+        self.delta = _CachedDelta(content)
+
+
+class CachedCompletionChunk:
+    """Minimal stand-in for a streamed ChatCompletionChunk replayed from the cache"""
+
+    def __init__(self, model: str, content: str):
+        self.model = model
+        self.cached = True
+        self.choices = [_CachedStreamChoice(content)]
+
+
+class _CachedChatCompletions:
+    def __init__(self, client: "CachedGroqClient"):
+        self._client = client
+
+    def _stream_and_store(self, key: str, stream):
+        """Pass streamed chunks through, caching the assembled text once the stream completes"""
+        parts = []
+        try:
+            for chunk in stream:
+                try:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                except (AttributeError, IndexError):
+                    pass
+                yield chunk
+        finally:
+            # Close the upstream response if the caller stops reading early; partial text is not cached
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+        if parts:
+            self._client.cache.set(key, ''.join(parts))
+
+    def create(self, **kwargs):
+        """Serve a completion from the cache, calling the upstream client on a miss"""
+        upstream = self._client.client.chat.completions
+
+        model = kwargs.get('model', '')
+        messages = kwargs.get('messages', [])
+        params = {k: v for k, v in kwargs.items() if k not in ('model', 'messages')}
+        key = make_cache_key(model, messages, params)
+
+        content = self._client.cache.get(key)
+        if content is not None:
+            logger.debug(f"LLM cache hit for key {key[:12]}")
+            if kwargs.get('stream'):
+                return iter([CachedCompletionChunk(model, content)])
+            return CachedCompletion(model, content)
+
+        if kwargs.get('stream'):
+            # Streams are consumed incrementally by the caller, so they cannot be shared in flight
+            return self._stream_and_store(key, upstream.create(**kwargs))
+
+        def fetch():
+            # Another request (or worker) may have filled the cache while we waited for the flight
+            shared = self._client.cache.get(key, count_stats=False)
+            if shared is not None:
+                return CachedCompletion(model, shared)
+            completion = upstream.create(**kwargs)
+            try:
+                result = completion.choices[0].message.content
+                if result:
+                    self._client.cache.set(key, result)
+            except (AttributeError, IndexError) as e:
+                logger.warning(f"Could not cache LLM completion: {str(e)}")
+            return completion
+
+        # Identical prompts already in flight share a single upstream call
+        return self._client.singleflight.do(key, fetch)
+
+
+class _CachedChat:
+    def __init__(self, client: "CachedGroqClient"):
+        self.completions = _CachedChatCompletions(client)
+
+
+class CachedGroqClient:
+    """Drop-in wrapper around a Groq client that caches chat completions"""
+
+    def __init__(self, client, cache: LLMResponseCache, singleflight: Optional[SingleFlight] = None):
+        self.client = client
+        self.cache = cache
+        self.singleflight = singleflight or SingleFlight()
+        self.chat = _CachedChat(self)
+
+    def __getattr__(self, name):
+        # Anything not cached (embeddings, models, ...) goes straight to the wrapped client
+        return getattr(self.client, name)
+
+
+def cache_from_env(data_folder: str = 'data') -> LLMResponseCache:
+    """Build an LLMResponseCache configured from LLM_CACHE_* environment variables"""
+    disk_path = os.getenv('LLM_CACHE_PATH', os.path.join(data_folder, 'llm_cache.db'))
+    if os.getenv('LLM_CACHE_DISK', 'true').lower() in ('0', 'false', 'no'):
+        disk_path = None
+    return LLMResponseCache(
+        max_entries=int(os.getenv('LLM_CACHE_SIZE', '512')),
+        ttl_seconds=float(os.getenv('LLM_CACHE_TTL', '86400')),
+        disk_path=disk_path
+    )
@@ -0,0 +1,241 @@
+import time
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = [f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs]
+    return '{' + ','.join(escaped) + '}'
+
+
+class _Histogram:
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Minimal thread-safe counters and histograms rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]]]] = []
+
+    def counter(self, name: str, help_text: str) -> None:
+        with self._lock:
+            self._help[name] = ('counter', help_text)
+            self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float]) -> None:
+        with self._lock:
+            self._help[name] = ('histogram', help_text)
+            self._histograms.setdefault(name, {})
+            self._buckets[name] = tuple(buckets)
+
+    def inc(self, name: str, labels: Dict[str, Any], amount: float = 1) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Dict[str, Any], value: float) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = _Histogram(self._buckets[name])
+            series[key].observe(value)
+
+    def register_collector(self, collector) -> None:
+        """
+        Add a callback that reports externally held stats at scrape time.
+
+        It must return a list of (name, type, help, samples) tuples where
+        samples is a list of (labels dict, value) pairs.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                lines.append(f"# HELP {name} {self._help[name][1]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name, series in self._histograms.items():
+                lines.append(f"# HELP {name} {self._help[name][1]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in series.items():
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', str(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+            collectors = list(self._collectors)
+
+        for collector in collectors:
+            try:
+                for name, metric_type, help_text, samples in collector():
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for labels, value in samples:
+                        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {str(e)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.histogram('llm_request_duration_seconds', 'Latency of LLM and embedding calls', LATENCY_BUCKETS)
+REGISTRY.histogram('llm_time_to_first_token_seconds', 'Time to the first streamed token', LATENCY_BUCKETS)
+REGISTRY.histogram('llm_prompt_tokens', 'Prompt tokens per LLM call', TOKEN_BUCKETS)
+REGISTRY.histogram('llm_completion_tokens', 'Completion tokens per LLM call', TOKEN_BUCKETS)
+REGISTRY.counter('llm_json_parse_total', 'JSON parse attempts on LLM output by result')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def record_llm_call(endpoint: str, kind: str, latency: float, status: str = 'ok', cache_hit: bool = False,
+                    prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+    """Record one LLM or embedding call"""
+    REGISTRY.observe('llm_request_duration_seconds', {
+        'endpoint': endpoint, 'kind': kind, 'cache': 'hit' if cache_hit else 'miss', 'status': status
+    }, latency)
+    if prompt_tokens is not None:
+        REGISTRY.observe('llm_prompt_tokens', {'endpoint': endpoint, 'kind': kind}, prompt_tokens)
+    if completion_tokens is not None:
+        REGISTRY.observe('llm_completion_tokens', {'endpoint': endpoint}, completion_tokens)
+
+
+def record_json_parse(endpoint: str, ok: bool, count: int = 1) -> None:
+    """Record whether LLM output for an endpoint parsed as valid JSON"""
+    if count:
+        REGISTRY.inc('llm_json_parse_total', {'endpoint': endpoint, 'result': 'ok' if ok else 'error'}, count)
+
+
+def _usage_tokens(response) -> Tuple[Optional[int], Optional[int]]:
+    usage = getattr(response, 'usage', None)
+    return getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None)
+
+
+class _InstrumentedChatCompletions:
+    def __init__(self, client: "InstrumentedGroqClient"):
+        self._client = client
+
+    def _instrument_stream(self, endpoint: str, stream, start: float):
+        first_token_at = None
+        chars = 0
+        status = 'ok'
+        cache_hit = False
+        try:
+            for chunk in stream:
+                cache_hit = cache_hit or getattr(chunk, 'cached', False) is True
+                try:
+                    delta = chunk.choices[0].delta.content
+                except (AttributeError, IndexError):
+                    delta = None
+                if delta:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        REGISTRY.observe('llm_time_to_first_token_seconds', {'endpoint': endpoint}, first_token_at - start)
+                    chars += len(delta)
+                yield chunk
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+            # Streams carry no usage, so estimate completion tokens from the text length
+            record_llm_call(endpoint, 'chat_stream', time.perf_counter() - start, status=status,
+                            cache_hit=cache_hit, completion_tokens=(chars + 3) // 4)
+
+    def create(self, **kwargs):
+        endpoint = self._client.resolve_endpoint()
+        start = time.perf_counter()
+        try:
+            response = self._client.client.chat.completions.create(**kwargs)
+        except Exception:
+            record_llm_call(endpoint, 'chat', time.perf_counter() - start, status='error')
+            raise
+
+        if kwargs.get('stream'):
+            return self._instrument_stream(endpoint, response, start)
+
+        prompt_tokens, completion_tokens = _usage_tokens(response)
+        record_llm_call(endpoint, 'chat', time.perf_counter() - start,
+                        cache_hit=getattr(response, 'cached', False) is True,
+                        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return response
+
+
+class _InstrumentedChat:
+    def __init__(self, client: "InstrumentedGroqClient"):
+        self.completions = _InstrumentedChatCompletions(client)
+
+
+class _InstrumentedEmbeddings:
+    def __init__(self, client: "InstrumentedGroqClient"):
+        self._client = client
+
+    def create(self, **kwargs):
+        endpoint = self._client.resolve_endpoint()
+        start = time.perf_counter()
+        try:
+            response = self._client.client.embeddings.create(**kwargs)
+        except Exception:
+            record_llm_call(endpoint, 'embedding', time.perf_counter() - start, status='error')
+            raise
+        prompt_tokens, _ = _usage_tokens(response)
+        record_llm_call(endpoint, 'embedding', time.perf_counter() - start, prompt_tokens=prompt_tokens)
+        return response
+
+
+class InstrumentedGroqClient:
+    """Wrapper that times every chat and embedding call and records token usage per endpoint"""
+
+    def __init__(self, client, endpoint_resolver: Optional[Callable[[], Optional[str]]] = None):
+        self.client = client
+        self.endpoint_resolver = endpoint_resolver
+        self.chat = _InstrumentedChat(self)
+        self.embeddings = _InstrumentedEmbeddings(self)
+
+    def resolve_endpoint(self) -> str:
+        if self.endpoint_resolver:
+            try:
+                return self.endpoint_resolver() or 'unknown'
+            except Exception:
+                pass
+        return 'unknown'
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
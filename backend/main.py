@@ -1,8 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import assessment
+from .llm_metrics import REGISTRY as metrics_registry, PROMETHEUS_CONTENT_TYPE
 
-app = FastAPI()
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+# orjson serializes the JSON responses when it is installed
+app = FastAPI(default_response_class=DefaultResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -16,6 +24,21 @@ app.add_middleware(
 # Include routers
 app.include_router(assessment.router)
 
+@app.on_event("startup")
+async def startup():
+    # Tables are created here rather than when the service is constructed at import
+    assessment.assessment_service.certificate_store.migrate()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Close the pooled Groq connections held by the assessment service
+    await assessment.assessment_service.close()
+
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the Lifelong Pathway AI API"} 
\ No newline at end of file
+    return {"message": "Welcome to the Lifelong Pathway AI API"} 
+
+@app.get("/metrics")
+async def metrics():
+    """Expose LLM latency, token and parse metrics in the Prometheus text format"""
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
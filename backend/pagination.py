@@ -0,0 +1,17 @@
+import json
+import base64
+from typing import Tuple
+
+
+def encode_cursor(sort_key: str, item_id: str) -> str:
+    """Opaque keyset pagination cursor pointing just after the given row"""
+    return base64.urlsafe_b64encode(json.dumps([sort_key, item_id]).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        sort_key, item_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return str(sort_key), str(item_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
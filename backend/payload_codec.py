@@ -0,0 +1,82 @@
+import json
+import zlib
+import threading
+from typing import Any, Union
+
+# Use the fast codecs when installed, otherwise fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# First byte of an encoded payload says how the JSON body was compressed
+FORMAT_ZLIB = 0x01
+FORMAT_ZSTD = 0x02
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+_local = threading.local()
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _zstd_compressor():
+    # zstandard contexts are not thread-safe, so keep one per thread
+    compressor = getattr(_local, 'compressor', None)
+    if compressor is None:
+        compressor = _local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor
+
+
+def _zstd_decompressor():
+    decompressor = getattr(_local, 'decompressor', None)
+    if decompressor is None:
+        decompressor = _local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def encode_payload(obj: Any) -> bytes:
+    """Serialize an object to compressed JSON, tagged with its compression format"""
+    body = dumps_json(obj)
+    if zstandard is not None:
+        return bytes([FORMAT_ZSTD]) + _zstd_compressor().compress(body)
+    return bytes([FORMAT_ZLIB]) + zlib.compress(body, ZLIB_LEVEL)
+
+
+def decode_payload(value: Union[bytes, str, None]) -> Any:
+    """
+    Decode a payload written by encode_payload.
+
+    Plain JSON text (rows written before payloads were compressed) is also
+    accepted, so old and new rows can be read side by side during a migration.
+    """
+    if value is None or value == '' or value == b'':
+        return None
+    if isinstance(value, str):
+        return loads_json(value)
+    fmt, body = value[0], value[1:]
+    if fmt == FORMAT_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        return loads_json(_zstd_decompressor().decompress(body))
+    if fmt == FORMAT_ZLIB:
+        return loads_json(zlib.decompress(body))
+    # Untagged bytes are uncompressed JSON
+    return loads_json(value)
@@ -0,0 +1,226 @@
+import os
+import re
+import math
+import logging
+import threading
+import importlib.util
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Use a real BPE tokenizer when available, otherwise fall back to a character estimate.
+# The encoding is loaded on first use, since on a cold cache tiktoken downloads it.
+TIKTOKEN_ENABLED = importlib.util.find_spec('tiktoken') is not None
+_ENCODING = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Return the tiktoken encoding, loading it on the first call; None when unavailable"""
+    global _ENCODING, TIKTOKEN_ENABLED
+    if _ENCODING is None and TIKTOKEN_ENABLED:
+        with _encoding_lock:
+            if _ENCODING is None and TIKTOKEN_ENABLED:
+                try:
+                    import tiktoken
+                    _ENCODING = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    logger.warning(f"Could not load the tiktoken encoding, estimating token counts instead: {e}")
+                    TIKTOKEN_ENABLED = False
+    return _ENCODING
+
+# Approximate per-message framing overhead added by the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Token budgets for the variable part of each endpoint's prompt, overridable with PROMPT_BUDGET_<NAME>
+DEFAULT_PROMPT_BUDGETS = {
+    'extract_skills': 6000,
+    'career_gap_job_description': 2000,
+    'learn_with_ai_chat': 6000,
+    'upload_pdf_summary': 4000,
+}
+
+# Resume sections that add tokens without adding skills
+BOILERPLATE_SECTIONS = {
+    'references', 'referees', 'declaration', 'hobbies', 'hobbies and interests',
+    'personal details', 'personal information', 'personal data', 'objective', 'career objective'
+}
+
+# Headings that start a new, useful resume section and so end any boilerplate section
+RESUME_SECTIONS = {
+    'summary', 'profile', 'professional summary', 'experience', 'work experience',
+    'professional experience', 'employment history', 'education', 'skills', 'technical skills',
+    'projects', 'certifications', 'certificates', 'awards', 'achievements', 'publications',
+    'languages', 'volunteer experience', 'training', 'courses'
+}
+
+BOILERPLATE_LINES = re.compile(r'^\s*(references|referees)?\s*(are\s+)?available\s+(up)?on\s+request\.?\s*$', re.IGNORECASE)
+
+TRUNCATION_MARKER = "... [content truncated]"
+
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate, without tiktoken) the tokens in a piece of text"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Roughly four characters per token for English prose
+    return math.ceil(len(text) / 4)
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Count the tokens in a chat message list, including per-message overhead"""
+    return sum(count_tokens(str(m.get('content') or '')) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of spaces and tabs and limit blank lines to one"""
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r' ?\n ?', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def _heading_key(line: str) -> str:
+    return re.sub(r'[^a-z& ]', '', line.lower()).replace('&', 'and').strip()
+
+
+def strip_resume_boilerplate(text: str) -> str:
+    """Drop resume sections such as references, declarations and hobbies"""
+    kept = []
+    dropping = False
+    for line in text.split('\n'):
+        key = _heading_key(line)
+        if len(line) <= 40 and key in BOILERPLATE_SECTIONS:
+            dropping = True
+            continue
+        if len(line) <= 40 and key in RESUME_SECTIONS:
+            dropping = False
+        if dropping or BOILERPLATE_LINES.match(line):
+            continue
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text so it fits in max_tokens, keeping the beginning"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:max(max_tokens - 8, 0)]) + TRUNCATION_MARKER
+    return text[:max(max_tokens - 8, 0) * 4] + TRUNCATION_MARKER
+
+
+class PromptBudgeter:
+    """Measures prompts before they are sent and deterministically compacts ones over budget"""
+
+    def __init__(self, budgets: Dict[str, int] = None):
+        self.budgets = dict(DEFAULT_PROMPT_BUDGETS)
+        self.budgets.update(budgets or {})
+        for name in list(self.budgets):
+            override = os.getenv(f"PROMPT_BUDGET_{name.upper()}")
+            if override:
+                self.budgets[name] = int(override)
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def budget_for(self, endpoint: str) -> int:
+        return self.budgets.get(endpoint, int(os.getenv('PROMPT_BUDGET_DEFAULT', '8000')))
+
+    def _record(self, endpoint: str, original_tokens: int, final_tokens: int) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(endpoint, {
+                'prompts': 0,
+                'compacted': 0,
+                'tokens_in': 0,
+                'tokens_sent': 0,
+                'max_tokens_sent': 0
+            })
+            metrics['prompts'] += 1
+            metrics['tokens_in'] += original_tokens
+            metrics['tokens_sent'] += final_tokens
+            metrics['max_tokens_sent'] = max(metrics['max_tokens_sent'], final_tokens)
+            if final_tokens < original_tokens:
+                metrics['compacted'] += 1
+
+    def measure(self, endpoint: str, messages: List[Dict[str, Any]]) -> int:
+        """Record the size of a prompt that is sent without compaction"""
+        tokens = count_message_tokens(messages)
+        self._record(endpoint, tokens, tokens)
+        return tokens
+
+    def fit_text(self, endpoint: str, text: str, resume: bool = False) -> str:
+        """Compact one variable prompt field until it fits the endpoint's budget"""
+        budget = self.budget_for(endpoint)
+        original_tokens = count_tokens(text)
+        if original_tokens <= budget:
+            self._record(endpoint, original_tokens, original_tokens)
+            return text
+
+        text = collapse_whitespace(text)
+        if resume and count_tokens(text) > budget:
+            text = strip_resume_boilerplate(text)
+        text = truncate_to_tokens(text, budget)
+
+        final_tokens = count_tokens(text)
+        logger.info(f"Compacted {endpoint} prompt field from {original_tokens} to {final_tokens} tokens")
+        self._record(endpoint, original_tokens, final_tokens)
+        return text
+
+    def fit_messages(self, endpoint: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Compact a chat message list until it fits the endpoint's budget.
+
+        Whitespace is collapsed first, then conversation history is dropped
+        oldest-first (the leading system prompt and the final user message are
+        always kept), and finally the largest remaining context is truncated.
+        """
+        budget = self.budget_for(endpoint)
+        original_tokens = count_message_tokens(messages)
+        if original_tokens <= budget:
+            self._record(endpoint, original_tokens, original_tokens)
+            return messages
+
+        messages = [dict(m, content=collapse_whitespace(str(m.get('content') or ''))) for m in messages]
+
+        # Indices of user/assistant turns that may be dropped, oldest first
+        history = [i for i, m in enumerate(messages[:-1]) if m.get('role') in ('user', 'assistant')]
+        dropped = set()
+        total = count_message_tokens(messages)
+        for i in history:
+            if total <= budget:
+                break
+            total -= count_tokens(messages[i]['content']) + MESSAGE_OVERHEAD_TOKENS
+            dropped.add(i)
+        messages = [m for i, m in enumerate(messages) if i not in dropped]
+
+        total = count_message_tokens(messages)
+        if total > budget and len(messages) > 2:
+            # Shrink the largest context block (usually shared documents), never the user's question
+            candidates = range(1, len(messages) - 1)
+            largest = max(candidates, key=lambda i: count_tokens(messages[i]['content']))
+            excess = total - budget
+            allowed = max(count_tokens(messages[largest]['content']) - excess, 0)
+            messages[largest] = dict(messages[largest], content=truncate_to_tokens(messages[largest]['content'], allowed))
+
+        final_tokens = count_message_tokens(messages)
+        logger.info(f"Compacted {endpoint} prompt from {original_tokens} to {final_tokens} tokens "
+                    f"({len(dropped)} history messages dropped)")
+        self._record(endpoint, original_tokens, final_tokens)
+        return messages
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return per-endpoint prompt size metrics"""
+        with self._lock:
+            endpoints = {name: dict(values) for name, values in self._metrics.items()}
+        for values in endpoints.values():
+            values['avg_tokens_sent'] = values['tokens_sent'] / values['prompts'] if values['prompts'] else 0
+        return {
+            'tokenizer': 'tiktoken' if TIKTOKEN_ENABLED else 'estimate',
+            'budgets': dict(self.budgets),
+            'endpoints': endpoints
+        }
@@ -0,0 +1,218 @@
+import os
+import re
+import time
+import heapq
+import random
+import logging
+import itertools
+import threading
+from typing import Any, Dict, Optional
+
+from prompt_budget import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+# Priority classes for outbound LLM traffic; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ASSESSMENT = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_ASSESSMENT: 'assessment',
+    PRIORITY_BACKGROUND: 'background'
+}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit header durations such as "12", "7.66s", "250ms" or "1m30.5s" into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        matched = True
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be consumed (0 if it can be consumed now)"""
+        self._refill()
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.available -= amount
+
+
+class GroqScheduler:
+    """
+    Admits outbound LLM calls in priority order within requests-per-minute and
+    tokens-per-minute budgets.
+
+    Waiting calls form a single priority queue, so an interactive chat turn is
+    always admitted before queued assessment or background work.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._metrics = {
+            name: {'admitted': 0, 'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0, 'retries': 0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    def acquire(self, priority: int, tokens: int) -> float:
+        """Block until the call may be sent; return the time spent waiting"""
+        tokens = min(tokens, self.tokens.capacity)
+        start = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if self._queue[0] == ticket:
+                        timeout = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                        if timeout <= 0:
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            break
+                    self._cond.wait(timeout=timeout)
+            finally:
+                if self._queue[0] == ticket:
+                    heapq.heappop(self._queue)
+                else:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            metrics = self._metrics[PRIORITY_NAMES.get(priority, 'background')]
+            metrics['admitted'] += 1
+            metrics['wait_seconds_total'] += waited
+            metrics['wait_seconds_max'] = max(metrics['wait_seconds_max'], waited)
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once the real usage of a call is known"""
+        if actual_tokens is None:
+            return
+        with self._cond:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+            self._cond.notify_all()
+
+    def record_retry(self, priority: int) -> None:
+        with self._cond:
+            self._metrics[PRIORITY_NAMES.get(priority, 'background')]['retries'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-queue wait-time metrics and current queue depth"""
+        with self._cond:
+            queues = {name: dict(values) for name, values in self._metrics.items()}
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue:
+                depth[PRIORITY_NAMES.get(priority, 'background')] += 1
+        for name, values in queues.items():
+            values['wait_seconds_avg'] = values['wait_seconds_total'] / values['admitted'] if values['admitted'] else 0.0
+            values['queued'] = depth[name]
+        return {'queues': queues}
+
+
+def retry_delay(error: Exception, attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """Delay before retrying a rate-limited call, honouring rate-limit headers when present"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    for header in ('retry-after', 'x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens'):
+        delay = parse_duration(headers.get(header))
+        if delay is not None:
+            # Small jitter so workers released by the same reset time do not retry in lockstep
+            return min(delay, max_delay) + random.uniform(0, 0.5)
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    return status == 429 or type(error).__name__ == 'RateLimitError'
+
+
+class _ScheduledChatCompletions:
+    def __init__(self, client: "ScheduledGroqClient"):
+        self._client = client
+
+    def create(self, priority: int = PRIORITY_ASSESSMENT, **kwargs):
+        """Admit the call through the scheduler, retrying rate-limit errors with backoff"""
+        scheduler = self._client.scheduler
+        estimated = count_message_tokens(kwargs.get('messages', [])) + int(kwargs.get('max_tokens') or 0)
+
+        attempt = 0
+        while True:
+            scheduler.acquire(priority, estimated)
+            try:
+                completion = self._client.client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self._client.max_retries:
+                    raise
+                delay = retry_delay(e, attempt)
+                attempt += 1
+                scheduler.record_retry(priority)
+                logger.warning(f"Groq rate limit hit ({PRIORITY_NAMES.get(priority)}), "
+                               f"retry {attempt}/{self._client.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            usage = getattr(completion, 'usage', None)
+            scheduler.settle(estimated, getattr(usage, 'total_tokens', None))
+            return completion
+
+
+class _ScheduledChat:
+    def __init__(self, client: "ScheduledGroqClient"):
+        self.completions = _ScheduledChatCompletions(client)
+
+
+class ScheduledGroqClient:
+    """Wrapper around a Groq client that routes chat completions through a GroqScheduler"""
+
+    def __init__(self, client, scheduler: GroqScheduler, max_retries: int = 3):
+        self.client = client
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.chat = _ScheduledChat(self)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def scheduler_from_env() -> GroqScheduler:
+    """Build a GroqScheduler from the GROQ_RPM and GROQ_TPM environment variables"""
+    return GroqScheduler(
+        requests_per_minute=float(os.getenv('GROQ_RPM', '30')),
+        tokens_per_minute=float(os.getenv('GROQ_TPM', '30000'))
+    )
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How long a scraped listing stays fresh per source, in seconds
+SOURCE_TTLS = {'Udemy': 24 * 3600, 'Coursera': 24 * 3600, 'GitHub': 12 * 3600, 'YouTube': 6 * 3600}
+DEFAULT_TTL = 12 * 3600
+# Searches that found nothing (or failed) are retried sooner
+NEGATIVE_TTL = 3600
+# Stale entries are still served while a refresh runs, up to this age
+MAX_STALE = 7 * 24 * 3600
+
+FRESH = 'fresh'
+STALE = 'stale'
+MISS = 'miss'
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS resource_cache (
+        skill TEXT NOT NULL,
+        source TEXT NOT NULL,
+        resources TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (skill, source)
+    )""",
+]
+
+
+def normalize_skill(skill: str) -> str:
+    return ' '.join(skill.lower().split())
+
+
+class ResourceCache:
+    """
+    Scraped resource listings per (skill, source) with a per-source TTL.
+
+    lookup() reports whether an entry is fresh, stale (past its TTL but
+    within max_stale, so it can be served while a refresh runs) or a miss.
+    Empty listings are cached too, with the shorter negative_ttl.
+    """
+
+    def __init__(self, db_path: str, ttls: Optional[Dict[str, float]] = None, negative_ttl: float = NEGATIVE_TTL,
+                 max_stale: float = MAX_STALE, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def migrate(self) -> None:
+        """Create the database directory and table; run once per deployment, not on import"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _state(self, source: str, resources: List[Dict[str, Any]], fetched_at: float, ahead: float = 0) -> str:
+        age = self.clock() + ahead - fetched_at
+        ttl = self.ttls.get(source, DEFAULT_TTL) if resources else self.negative_ttl
+        if age <= ttl:
+            return FRESH
+        if age <= ttl + self.max_stale:
+            return STALE
+        return MISS
+
+    def _record(self, source: str, state: str, negative: bool) -> None:
+        result = 'negative' if negative and state != MISS else state
+        with self._lock:
+            stats = self._stats.setdefault(source, {FRESH: 0, STALE: 0, 'negative': 0, MISS: 0})
+            stats[result] += 1
+
+    def lookup_many(self, skill: str, sources: Iterable[str], record: bool = True,
+                    ahead: float = 0) -> Dict[str, Tuple[str, Optional[List[Dict[str, Any]]], Optional[float]]]:
+        """
+        Return {source: (state, resources, fetched_at)} for one skill; resources is None on a miss.
+
+        `ahead` judges freshness that many seconds from now, for prefetching
+        entries about to expire. Pass record=False to leave the hit counters alone.
+        """
+        sources = list(sources)
+        rows = self._connection().execute(
+            f"SELECT source, resources, fetched_at FROM resource_cache WHERE skill = ? AND source IN ({','.join('?' * len(sources))})",
+            [normalize_skill(skill)] + sources
+        ).fetchall()
+        found = {source: (json.loads(resources), fetched_at) for source, resources, fetched_at in rows}
+
+        entries = {}
+        for source in sources:
+            if source not in found:
+                if record:
+                    self._record(source, MISS, False)
+                entries[source] = (MISS, None, None)
+                continue
+            resources, fetched_at = found[source]
+            state = self._state(source, resources, fetched_at, ahead)
+            if record:
+                self._record(source, state, not resources)
+            entries[source] = (state, resources if state != MISS else None, fetched_at)
+        return entries
+
+    def lookup(self, skill: str, source: str) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        state, resources, _ = self.lookup_many(skill, [source])[source]
+        return state, resources
+
+    def store(self, skill: str, source: str, resources: List[Dict[str, Any]]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO resource_cache (skill, source, resources, fetched_at) VALUES (?, ?, ?, ?)',
+                (normalize_skill(skill), source, json.dumps(resources), self.clock())
+            )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source lookup counts; stale and negative entries are served, so they count as hits"""
+        with self._lock:
+            stats = {source: dict(counts) for source, counts in self._stats.items()}
+        for counts in stats.values():
+            total = sum(counts.values())
+            counts['hit_ratio'] = (total - counts[MISS]) / total if total else 0.0
+        return stats
+
+
+def fetched_at_iso(fetched_at: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(fetched_at).isoformat() if fetched_at is not None else None
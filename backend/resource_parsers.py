@@ -0,0 +1,333 @@
+import os
+import re
+import json
+import logging
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fastest first; HTML_PARSER_BACKEND picks one explicitly
+PARSER_BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+
+class Node(ABC):
+    """The small part of a DOM element the source parsers use, over any backend"""
+
+    @abstractmethod
+    def select(self, css: str) -> List["Node"]:
+        ...
+
+    @abstractmethod
+    def select_one(self, css: str) -> Optional["Node"]:
+        ...
+
+    @property
+    @abstractmethod
+    def text(self) -> str:
+        ...
+
+    @abstractmethod
+    def get(self, attribute: str) -> Optional[str]:
+        ...
+
+
+class _SelectolaxNode(Node):
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, css):
+        return [_SelectolaxNode(n) for n in self._node.css(css)]
+
+    def select_one(self, css):
+        node = self._node.css_first(css)
+        return _SelectolaxNode(node) if node is not None else None
+
+    @property
+    def text(self):
+        return self._node.text()
+
+    def get(self, attribute):
+        return self._node.attributes.get(attribute)
+
+
+class _LxmlNode(Node):
+    def __init__(self, element):
+        self._element = element
+
+    def select(self, css):
+        return [_LxmlNode(e) for e in self._element.cssselect(css)]
+
+    def select_one(self, css):
+        found = self._element.cssselect(css)
+        return _LxmlNode(found[0]) if found else None
+
+    @property
+    def text(self):
+        return self._element.text_content()
+
+    def get(self, attribute):
+        return self._element.get(attribute)
+
+
+class _SoupNode(Node):
+    def __init__(self, tag):
+        self._tag = tag
+
+    def select(self, css):
+        return [_SoupNode(t) for t in self._tag.select(css)]
+
+    def select_one(self, css):
+        tag = self._tag.select_one(css)
+        return _SoupNode(tag) if tag is not None else None
+
+    @property
+    def text(self):
+        return self._tag.text
+
+    def get(self, attribute):
+        return self._tag.get(attribute)
+
+
+def _parse_selectolax(html: str) -> Node:
+    from selectolax.lexbor import LexborHTMLParser
+    return _SelectolaxNode(LexborHTMLParser(html).root)
+
+
+def _parse_lxml(html: str) -> Node:
+    import lxml.html
+    return _LxmlNode(lxml.html.document_fromstring(html))
+
+
+def _parse_bs4(html: str) -> Node:
+    from bs4 import BeautifulSoup
+    return _SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+_BACKENDS: Dict[str, Callable[[str], Node]] = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4': _parse_bs4,
+}
+
+
+def _backend_available(name: str) -> bool:
+    if name == 'selectolax':
+        return importlib.util.find_spec('selectolax') is not None and importlib.util.find_spec('selectolax.lexbor') is not None
+    if name == 'lxml':
+        # lxml needs cssselect to run CSS selectors
+        return importlib.util.find_spec('lxml') is not None and importlib.util.find_spec('cssselect') is not None
+    return importlib.util.find_spec('bs4') is not None
+
+
+def available_backends() -> List[str]:
+    return [name for name in PARSER_BACKENDS if _backend_available(name)]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Pick the requested backend if installed, otherwise the fastest one that is"""
+    name = name or os.getenv('HTML_PARSER_BACKEND')
+    if name:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown HTML parser backend: {name}")
+        if _backend_available(name):
+            return name
+        logger.warning(f"HTML parser backend {name} is not installed, falling back")
+    available = available_backends()
+    if not available:
+        raise RuntimeError("No HTML parser installed; install selectolax, lxml with cssselect, or beautifulsoup4")
+    return available[0]
+
+
+def parse_html(html: str, backend: str) -> Node:
+    return _BACKENDS[backend](html)
+
+
+def parse_udemy(html: str, skill: str, max_results: int, backend: str) -> List[Dict[str, Any]]:
+    soup = parse_html(html, backend)
+    courses = []
+
+    # Parse course cards
+    course_elements = soup.select('.course-card-container')[:max_results]
+
+    for element in course_elements:
+        try:
+            title_element = element.select_one('.course-card--course-title')
+            link_element = element.select_one('a')
+            rating_element = element.select_one('.star-rating--rating-number')
+            reviews_element = element.select_one('.course-card--reviews-text')
+            instructor_element = element.select_one('.course-card--instructor-text')
+            price_element = element.select_one('.price-text--price-part')
+
+            if not title_element or not link_element:
+                continue
+
+            title = title_element.text.strip()
+            url = f"https://www.udemy.com{link_element.get('href')}"
+            rating = float(rating_element.text.strip()) if rating_element else None
+
+            reviews_text = reviews_element.text.strip() if reviews_element else "0 reviews"
+            reviews_count = int(re.search(r'(\d+)', reviews_text).group(1)) if re.search(r'(\d+)', reviews_text) else 0
+
+            instructor = instructor_element.text.strip() if instructor_element else "Unknown Instructor"
+            price = price_element.text.strip() if price_element else "Unknown Price"
+
+            courses.append({
+                'title': title,
+                'url': url,
+                'rating': rating,
+                'reviews_count': reviews_count,
+                'instructor': instructor,
+                'price': price,
+                'source': 'Udemy',
+                'resource_type': 'course',
+                'price_type': 'paid' if price and 'free' not in price.lower() else 'free',
+                'skill': skill
+            })
+        except Exception as e:
+            logger.error(f"Error parsing Udemy course: {str(e)}")
+
+    return courses
+
+
+def parse_coursera(html: str, skill: str, max_results: int, backend: str) -> List[Dict[str, Any]]:
+    soup = parse_html(html, backend)
+    courses = []
+
+    # Parse course cards
+    course_elements = soup.select('.cds-ProductCard-gridCard')[:max_results]
+
+    for element in course_elements:
+        try:
+            title_element = element.select_one('.cds-CommonCard-title')
+            link_element = element.select_one('a')
+            provider_element = element.select_one('.cds-CommonCard-context')
+
+            if not title_element or not link_element:
+                continue
+
+            title = title_element.text.strip()
+            url = f"https://www.coursera.org{link_element.get('href')}"
+            provider = provider_element.text.strip() if provider_element else "Unknown Provider"
+
+            courses.append({
+                'title': title,
+                'url': url,
+                'provider': provider,
+                'source': 'Coursera',
+                'resource_type': 'course',
+                'price_type': 'mixed',  # Coursera offers both free and paid options
+                'skill': skill
+            })
+        except Exception as e:
+            logger.error(f"Error parsing Coursera course: {str(e)}")
+
+    return courses
+
+
+def parse_github(html: str, skill: str, max_results: int, backend: str) -> List[Dict[str, Any]]:
+    soup = parse_html(html, backend)
+    resources = []
+
+    # Parse repo cards
+    repo_elements = soup.select('.repo-list-item')[:max_results]
+
+    for element in repo_elements:
+        try:
+            name_element = element.select_one('.f4 a')
+            description_element = element.select_one('.mb-1')
+            stars_element = element.select_one('a[href*="stargazers"]')
+
+            if not name_element:
+                continue
+
+            title = name_element.text.strip()
+            url = f"https://github.com{name_element.get('href')}"
+            description = description_element.text.strip() if description_element else ""
+
+            stars_text = stars_element.text.strip() if stars_element else "0"
+            stars = int(re.sub(r'[^\d]', '', stars_text)) if re.sub(r'[^\d]', '', stars_text) else 0
+
+            resources.append({
+                'title': title,
+                'url': url,
+                'description': description,
+                'rating': stars / 1000,  # Normalize stars as a form of rating
+                'source': 'GitHub',
+                'resource_type': 'repository',
+                'price_type': 'free',
+                'skill': skill
+            })
+        except Exception as e:
+            logger.error(f"Error parsing GitHub repository: {str(e)}")
+
+    return resources
+
+
+def parse_youtube(html: str, skill: str, max_results: int, backend: str) -> List[Dict[str, Any]]:
+    # YouTube uses a JavaScript-rendered page, so the results are read from the embedded initial state
+    initial_data_match = re.search(r'var ytInitialData = (.*?);</script>', html)
+
+    tutorials = []
+
+    if initial_data_match:
+        try:
+            data = json.loads(initial_data_match.group(1))
+
+            contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
+
+            for content in contents:
+                item_section = content.get('itemSectionRenderer', {}).get('contents', [])
+
+                for item in item_section:
+                    video_renderer = item.get('videoRenderer', {})
+                    if video_renderer:
+                        try:
+                            video_id = video_renderer.get('videoId', '')
+                            title = video_renderer.get('title', {}).get('runs', [{}])[0].get('text', '')
+                            channel = video_renderer.get('ownerText', {}).get('runs', [{}])[0].get('text', '')
+                            view_count_text = video_renderer.get('viewCountText', {}).get('simpleText', '0 views')
+
+                            view_count = int(re.sub(r'[^\d]', '', view_count_text)) if re.sub(r'[^\d]', '', view_count_text) else 0
+
+                            if video_id and title:
+                                tutorials.append({
+                                    'title': title,
+                                    'url': f"https://www.youtube.com/watch?v={video_id}",
+                                    'provider': channel,
+                                    'views': view_count,
+                                    'rating': view_count / 1000000,  # Normalize views as a form of rating
+                                    'source': 'YouTube',
+                                    'resource_type': 'video',
+                                    'price_type': 'free',
+                                    'skill': skill
+                                })
+
+                                if len(tutorials) >= max_results:
+                                    break
+                        except Exception as e:
+                            logger.error(f"Error parsing YouTube video: {str(e)}")
+
+                    if len(tutorials) >= max_results:
+                        break
+
+                if len(tutorials) >= max_results:
+                    break
+        except Exception as e:
+            logger.error(f"Error parsing YouTube data: {str(e)}")
+
+    return tutorials
+
+
+SOURCE_PARSERS = {
+    'Udemy': parse_udemy,
+    'Coursera': parse_coursera,
+    'GitHub': parse_github,
+    'YouTube': parse_youtube,
+}
+
+
+def parse_results(source: str, html: str, skill: str, max_results: int, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract resources from a source's search page; module-level so it can run in a process pool"""
+    return SOURCE_PARSERS[source](html, skill, max_results, backend or resolve_backend())
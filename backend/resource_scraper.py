@@ -1,25 +1,155 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+import os
 import logging
 import json
 import asyncio
 import aiohttp
-from typing import Dict, List, Any, Optional
+import threading
+import concurrent.futures
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from urllib.parse import quote_plus
 
+from resource_cache import ResourceCache, normalize_skill
+from resource_parsers import parse_results, resolve_backend
+
 logger = logging.getLogger(__name__)
 
+# Connection pool and timeouts for the scraper's shared HTTP session
+SCRAPER_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "64"))
+SCRAPER_MAX_PER_HOST = int(os.getenv("SCRAPER_MAX_PER_HOST", "8"))
+SCRAPER_DNS_TTL = int(os.getenv("SCRAPER_DNS_TTL", "300"))
+SCRAPER_KEEPALIVE = float(os.getenv("SCRAPER_KEEPALIVE", "30"))
+SCRAPER_CONNECT_TIMEOUT = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5"))
+SCRAPER_READ_TIMEOUT = float(os.getenv("SCRAPER_READ_TIMEOUT", "10"))
+SCRAPER_TOTAL_TIMEOUT = float(os.getenv("SCRAPER_TOTAL_TIMEOUT", "20"))
+
+# Result pages are parsed off the event loop, in threads by default or in processes for CPU-bound parsing
+SCRAPER_PARSE_EXECUTOR = os.getenv("SCRAPER_PARSE_EXECUTOR", "thread")
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_parse_executor: Optional[concurrent.futures.Executor] = None
+_parse_executor_lock = threading.Lock()
+
+def get_parse_executor() -> concurrent.futures.Executor:
+    """Shared pool for parsing result pages, created on first use in each process"""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            if SCRAPER_PARSE_EXECUTOR == 'process':
+                _parse_executor = concurrent.futures.ProcessPoolExecutor(max_workers=SCRAPER_PARSE_WORKERS)
+            else:
+                _parse_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SCRAPER_PARSE_WORKERS,
+                                                                        thread_name_prefix='html-parse')
+        return _parse_executor
+
+# Searches in flight across all sources, and per source so no single site is hammered
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "16"))
+SOURCE_CONCURRENCY = {'Udemy': 4, 'Coursera': 4, 'GitHub': 2, 'YouTube': 4}
+
+def create_scraper_session(headers: Dict[str, str]) -> aiohttp.ClientSession:
+    """Create a keep-alive session with a DNS cache, per-host connection limits and request timeouts"""
+    connector = aiohttp.TCPConnector(
+        limit=SCRAPER_MAX_CONNECTIONS,
+        limit_per_host=SCRAPER_MAX_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=SCRAPER_DNS_TTL,
+        keepalive_timeout=SCRAPER_KEEPALIVE
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=SCRAPER_TOTAL_TIMEOUT,
+        sock_connect=SCRAPER_CONNECT_TIMEOUT,
+        sock_read=SCRAPER_READ_TIMEOUT
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
 class ResourceScraper:
     """Class for scraping learning resources from various websites"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+                 source_concurrency: Optional[Dict[str, int]] = None, cache: Optional[ResourceCache] = None,
+                 parser_backend: Optional[str] = None, parse_executor: Optional[concurrent.futures.Executor] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.data_folder = 'data/resources'
-        import os
         os.makedirs(self.data_folder, exist_ok=True)
+        # One session for every search so connections and DNS lookups are reused across sources and skills
+        self._session = session
+        self._owns_session = session is None
+        self.sources = {
+            'Udemy': self.search_udemy,
+            'Coursera': self.search_coursera,
+            'GitHub': self.search_github,
+            'YouTube': self.search_youtube
+        }
+        self.max_concurrency = max_concurrency
+        self.source_concurrency = {**SOURCE_CONCURRENCY, **(source_concurrency or {})}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._source_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.cache = cache
+        self.parser_backend = resolve_backend(parser_backend)
+        self.parse_executor = parse_executor
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = create_scraper_session(self.headers)
+            self._owns_session = True
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared session if this scraper created it"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    async def __aenter__(self) -> "ResourceScraper":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def _search(self, source: str, skill: str) -> List[Dict[str, Any]]:
+        """
+        Scrape one source for a skill and store the listing in the cache, if there is one.
+        
+        Reads are served from the cache by the app, which queues a crawl job
+        for stale or missing entries; the scraper itself always fetches.
+        """
+        resources = await self._search_source(source, skill)
+        if self.cache is not None:
+            self.cache.store(skill, source, resources)
+        return resources
+    
+    async def _search_source(self, source: str, skill: str) -> List[Dict[str, Any]]:
+        """Run one source's search within the global and per-source concurrency limits"""
+        # Created lazily so the semaphores bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._source_semaphores = {
+                name: asyncio.Semaphore(self.source_concurrency.get(name, self.max_concurrency))
+                for name in self.sources
+            }
+        # Wait for the source's slot first so a busy source does not hold global slots other sources could use
+        async with self._source_semaphores[source]:
+            async with self._semaphore:
+                return await self.sources[source](skill)
+    
+    async def _fetch(self, source: str, url: str) -> Optional[str]:
+        """Fetch a search page, returning None on a non-200 status or timeout"""
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    logger.error(f"Failed to fetch {source} results: Status {response.status}")
+                    return None
+                return await response.text()
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out fetching {source} results")
+            return None
+    
+    async def _parse(self, source: str, html: str, skill: str, max_results: int) -> List[Dict[str, Any]]:
+        """Parse a result page in the parse pool so large pages do not block other scrapes"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor or get_parse_executor(), parse_results,
+                                          source, html, skill, max_results, self.parser_backend)
     
     async def search_udemy(self, skill: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """Search for courses on Udemy"""
@@ -27,58 +157,11 @@ class ResourceScraper:
             search_term = quote_plus(skill)
             url = f"https://www.udemy.com/courses/search/?src=ukw&q={search_term}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch Udemy results: Status {response.status}")
-                        return []
-                    
-                    html = await response.text()
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            courses = []
-            
-            # Parse course cards
-            course_elements = soup.select('.course-card-container')[:max_results]
+            html = await self._fetch('Udemy', url)
+            if html is None:
+                return []
             
-            for element in course_elements:
-                try:
-                    title_element = element.select_one('.course-card--course-title')
-                    link_element = element.select_one('a')
-                    rating_element = element.select_one('.star-rating--rating-number')
-                    reviews_element = element.select_one('.course-card--reviews-text')
-                    instructor_element = element.select_one('.course-card--instructor-text')
-                    price_element = element.select_one('.price-text--price-part')
-                    
-                    if not title_element or not link_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    url = f"https://www.udemy.com{link_element.get('href')}"
-                    rating = float(rating_element.text.strip()) if rating_element else None
-                    
-                    reviews_text = reviews_element.text.strip() if reviews_element else "0 reviews"
-                    reviews_count = int(re.search(r'(\d+)', reviews_text).group(1)) if re.search(r'(\d+)', reviews_text) else 0
-                    
-                    instructor = instructor_element.text.strip() if instructor_element else "Unknown Instructor"
-                    price = price_element.text.strip() if price_element else "Unknown Price"
-                    
-                    courses.append({
-                        'title': title,
-                        'url': url,
-                        'rating': rating,
-                        'reviews_count': reviews_count,
-                        'instructor': instructor,
-                        'price': price,
-                        'source': 'Udemy',
-                        'resource_type': 'course',
-                        'price_type': 'paid' if price and 'free' not in price.lower() else 'free',
-                        'skill': skill
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing Udemy course: {str(e)}")
-            
-            return courses
+            return await self._parse('Udemy', html, skill, max_results)
         except Exception as e:
             logger.error(f"Error searching Udemy: {str(e)}")
             return []
@@ -89,46 +172,11 @@ class ResourceScraper:
             search_term = quote_plus(skill)
             url = f"https://www.coursera.org/search?query={search_term}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch Coursera results: Status {response.status}")
-                        return []
-                    
-                    html = await response.text()
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            courses = []
-            
-            # Parse course cards
-            course_elements = soup.select('.cds-ProductCard-gridCard')[:max_results]
+            html = await self._fetch('Coursera', url)
+            if html is None:
+                return []
             
-            for element in course_elements:
-                try:
-                    title_element = element.select_one('.cds-CommonCard-title')
-                    link_element = element.select_one('a')
-                    provider_element = element.select_one('.cds-CommonCard-context')
-                    
-                    if not title_element or not link_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    url = f"https://www.coursera.org{link_element.get('href')}"
-                    provider = provider_element.text.strip() if provider_element else "Unknown Provider"
-                    
-                    courses.append({
-                        'title': title,
-                        'url': url,
-                        'provider': provider,
-                        'source': 'Coursera',
-                        'resource_type': 'course',
-                        'price_type': 'mixed',  # Coursera offers both free and paid options
-                        'skill': skill
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing Coursera course: {str(e)}")
-            
-            return courses
+            return await self._parse('Coursera', html, skill, max_results)
         except Exception as e:
             logger.error(f"Error searching Coursera: {str(e)}")
             return []
@@ -139,50 +187,11 @@ class ResourceScraper:
             search_term = quote_plus(f"{skill} awesome")
             url = f"https://github.com/search?q={search_term}&type=repositories"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch GitHub results: Status {response.status}")
-                        return []
-                    
-                    html = await response.text()
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            resources = []
-            
-            # Parse repo cards
-            repo_elements = soup.select('.repo-list-item')[:max_results]
-            
-            for element in repo_elements:
-                try:
-                    name_element = element.select_one('.f4 a')
-                    description_element = element.select_one('.mb-1')
-                    stars_element = element.select_one('a[href*="stargazers"]')
-                    
-                    if not name_element:
-                        continue
-                    
-                    title = name_element.text.strip()
-                    url = f"https://github.com{name_element.get('href')}"
-                    description = description_element.text.strip() if description_element else ""
-                    
-                    stars_text = stars_element.text.strip() if stars_element else "0"
-                    stars = int(re.sub(r'[^\d]', '', stars_text)) if re.sub(r'[^\d]', '', stars_text) else 0
-                    
-                    resources.append({
-                        'title': title,
-                        'url': url,
-                        'description': description,
-                        'rating': stars / 1000,  # Normalize stars as a form of rating
-                        'source': 'GitHub',
-                        'resource_type': 'repository',
-                        'price_type': 'free',
-                        'skill': skill
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing GitHub repository: {str(e)}")
+            html = await self._fetch('GitHub', url)
+            if html is None:
+                return []
             
-            return resources
+            return await self._parse('GitHub', html, skill, max_results)
         except Exception as e:
             logger.error(f"Error searching GitHub: {str(e)}")
             return []
@@ -193,93 +202,66 @@ class ResourceScraper:
             search_term = quote_plus(f"{skill} tutorial")
             url = f"https://www.youtube.com/results?search_query={search_term}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch YouTube results: Status {response.status}")
-                        return []
-                    
-                    html = await response.text()
-            
-            # Extract video data from the page
-            # YouTube uses a JavaScript-rendered page, so we need to extract data from the initial state
-            initial_data_match = re.search(r'var ytInitialData = (.*?);</script>', html)
-            
-            tutorials = []
-            
-            if initial_data_match:
-                try:
-                    json_str = initial_data_match.group(1)
-                    data = json.loads(json_str)
-                    
-                    contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
-                    
-                    for content in contents:
-                        item_section = content.get('itemSectionRenderer', {}).get('contents', [])
-                        
-                        for item in item_section:
-                            video_renderer = item.get('videoRenderer', {})
-                            if video_renderer:
-                                try:
-                                    video_id = video_renderer.get('videoId', '')
-                                    title = video_renderer.get('title', {}).get('runs', [{}])[0].get('text', '')
-                                    channel = video_renderer.get('ownerText', {}).get('runs', [{}])[0].get('text', '')
-                                    view_count_text = video_renderer.get('viewCountText', {}).get('simpleText', '0 views')
-                                    
-                                    view_count = int(re.sub(r'[^\d]', '', view_count_text)) if re.sub(r'[^\d]', '', view_count_text) else 0
-                                    
-                                    if video_id and title:
-                                        tutorials.append({
-                                            'title': title,
-                                            'url': f"https://www.youtube.com/watch?v={video_id}",
-                                            'provider': channel,
-                                            'views': view_count,
-                                            'rating': view_count / 1000000,  # Normalize views as a form of rating
-                                            'source': 'YouTube',
-                                            'resource_type': 'video',
-                                            'price_type': 'free',
-                                            'skill': skill
-                                        })
-                                        
-                                        if len(tutorials) >= max_results:
-                                            break
-                                except Exception as e:
-                                    logger.error(f"Error parsing YouTube video: {str(e)}")
-                            
-                            if len(tutorials) >= max_results:
-                                break
-                        
-                        if len(tutorials) >= max_results:
-                            break
-                except Exception as e:
-                    logger.error(f"Error parsing YouTube data: {str(e)}")
+            html = await self._fetch('YouTube', url)
+            if html is None:
+                return []
             
-            return tutorials
+            return await self._parse('YouTube', html, skill, max_results)
         except Exception as e:
             logger.error(f"Error searching YouTube: {str(e)}")
             return []
     
     async def find_resources_for_skill(self, skill: str) -> List[Dict[str, Any]]:
         """Find resources for a specific skill from multiple sources"""
-        tasks = [
-            self.search_udemy(skill),
-            self.search_coursera(skill),
-            self.search_github(skill),
-            self.search_youtube(skill)
-        ]
-        
-        results = await asyncio.gather(*tasks)
-        
+        results = await asyncio.gather(*(self._search(source, skill) for source in self.sources))
+        return self._combine(results)
+    
+    async def refresh_skill(self, skill: str, sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Re-scrape a skill from the given sources (all by default), replacing their cached entries"""
+        results = await asyncio.gather(*(self._search(source, skill) for source in (sources or self.sources)))
+        return self._combine(results)
+    
+    @staticmethod
+    def _combine(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         # Combine all results
         all_resources = []
         for resource_list in results:
             all_resources.extend(resource_list)
         
         # Sort by rating (if available)
-        all_resources.sort(key=lambda x: x.get('rating', 0), reverse=True)
+        all_resources.sort(key=lambda x: x.get('rating') or 0, reverse=True)
         
         return all_resources
     
+    async def iter_resources(self, skills: List[str]) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Search every source for every skill at once and yield (skill, resources)
+        as soon as all sources for that skill have answered.
+        
+        Concurrency is bounded by the global and per-source limits, so a long
+        skill list takes about as long as its slowest source queue rather than
+        one round of searches per skill.
+        """
+        skills = list(dict.fromkeys(skills))
+        
+        async def search(source: str, skill: str) -> Tuple[str, List[Dict[str, Any]]]:
+            return skill, await self._search(source, skill)
+        
+        tasks = [asyncio.ensure_future(search(source, skill)) for skill in skills for source in self.sources]
+        pending = {skill: len(self.sources) for skill in skills}
+        results: Dict[str, List[List[Dict[str, Any]]]] = {skill: [] for skill in skills}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                skill, resources = await next_done
+                results[skill].append(resources)
+                pending[skill] -= 1
+                if pending[skill] == 0:
+                    yield skill, self._combine(results.pop(skill))
+        finally:
+            # The consumer stopped early; do not leave searches running
+            for task in tasks:
+                task.cancel()
+    
     def save_resources_to_local(self, skill: str, resources: List[Dict[str, Any]]) -> None:
         """Save resources to a local JSON file per skill"""
         import os
@@ -304,15 +286,65 @@ class ResourceScraper:
             logger.error(f"Error saving resources to local file: {str(e)}")
     
     async def find_and_save_resources(self, skills: List[str]) -> List[Dict[str, Any]]:
-        """Find and save resources for multiple skills"""
-        all_resources = []
-        for skill in skills:
-            resources = await self.find_resources_for_skill(skill)
-            all_resources.extend(resources)
+        """Find and save resources for multiple skills, searching all of them concurrently"""
+        by_skill = {}
+        async for skill, resources in self.iter_resources(skills):
             self.save_resources_to_local(skill, resources)
+            by_skill[skill] = resources
+        
+        # Keep the caller's skill order regardless of which searches finished first
+        all_resources = []
+        for skill in dict.fromkeys(skills):
+            all_resources.extend(by_skill.get(skill, []))
         return all_resources
 
-async def get_resources_for_skills(skills: List[str]) -> List[Dict[str, Any]]:
-    """Helper function to get resources for a list of skills"""
-    scraper = ResourceScraper()
-    return await scraper.find_and_save_resources(skills) 
\ No newline at end of file
+class BackgroundScraper:
+    """
+    A long-lived ResourceScraper on its own event loop thread.
+    
+    Lets synchronous Flask handlers schedule scrapes without waiting for
+    them; a refresh already in flight for the same skill and at least the
+    requested sources is shared rather than scheduled twice.
+    """
+    
+    def __init__(self, cache: Optional[ResourceCache] = None):
+        self.scraper = ResourceScraper(cache=cache)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Keyed on (skill, sources), with None standing for every source
+        self._in_flight: Dict[Tuple[str, Optional[frozenset]], concurrent.futures.Future] = {}
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        # Started on first use so each server process gets its own loop thread
+        if self._thread is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='resource-scraper', daemon=True)
+            self._thread.start()
+        return self._loop
+    
+    def refresh(self, skill: str, sources: Optional[List[str]] = None) -> concurrent.futures.Future:
+        """Schedule a re-scrape of a skill and return a future for its resources"""
+        key = (normalize_skill(skill), frozenset(sources) if sources else None)
+        with self._lock:
+            for (in_flight_skill, in_flight_sources), future in self._in_flight.items():
+                if in_flight_skill == key[0] and (in_flight_sources is None
+                                                  or (key[1] is not None and key[1] <= in_flight_sources)):
+                    return future
+            future = asyncio.run_coroutine_threadsafe(self.scraper.refresh_skill(skill, sources),
+                                                      self._ensure_started())
+            self._in_flight[key] = future
+        # Outside the lock: the callback runs right away if the scrape already finished
+        future.add_done_callback(lambda f: self._finished(key, f))
+        return future
+    
+    def _finished(self, key: Tuple[str, Optional[frozenset]], future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Background scrape for '{key[0]}' failed: {str(future.exception())}")
+    
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from ..assessment_service import AssessmentService
+from ..certificate_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_VERIFY_BATCH
 from ..auth import get_current_user
-import json
 
 router = APIRouter(prefix="/assessment", tags=["assessment"])
 assessment_service = AssessmentService()
@@ -15,6 +15,9 @@ class TestRequest(BaseModel):
 class TestAnswers(BaseModel):
     answers: Dict[str, str]
 
+class VerifyCertificatesRequest(BaseModel):
+    certificate_ids: List[str]
+
 @router.post("/generate-test")
 async def generate_test(
     request: TestRequest,
@@ -57,18 +60,39 @@ async def upload_resume(
     topics = await assessment_service.extract_topics_from_resume(resume_text)
     return topics
 
+@router.get("/certificates/verify/{certificate_id}")
+def verify_certificate(certificate_id: str) -> Dict[str, Any]:
+    """Public check that a certificate was issued, for employers; no login required"""
+    certificate = assessment_service.certificate_store.get(certificate_id)
+    if certificate is None:
+        raise HTTPException(status_code=404, detail="Certificate not found")
+    return {'valid': True, 'certificate': certificate}
+
+@router.post("/certificates/verify")
+def verify_certificates(request: VerifyCertificatesRequest) -> Dict[str, Any]:
+    """Verify up to MAX_VERIFY_BATCH certificates in one call; unknown IDs come back as invalid"""
+    if len(request.certificate_ids) > MAX_VERIFY_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_VERIFY_BATCH} certificates per request")
+    found = assessment_service.certificate_store.get_many(request.certificate_ids)
+    return {
+        'results': [
+            {'certificate_id': certificate_id, 'valid': certificate is not None, 'certificate': certificate}
+            for certificate_id, certificate in found.items()
+        ]
+    }
+
 @router.get("/certificates/{user_id}")
-async def get_user_certificates(
+def get_user_certificates(
     user_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> List[Dict[str, Any]]:
-    """Get all certificates for a user"""
+) -> Dict[str, Any]:
+    """Get one page of a user's certificates, newest first; pass next_cursor back to get the next page"""
     if current_user['id'] != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to view these certificates")
-    
-    certificates = []
-    for file in assessment_service.certificates_dir.glob(f"CERT-{user_id}-*.json"):
-        with open(file, 'r') as f:
-            certificates.append(json.load(f))
-    
-    return certificates 
\ No newline at end of file
+
+    try:
+        return assessment_service.certificate_store.list_for_user(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
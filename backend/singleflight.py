@@ -0,0 +1,108 @@
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows has no fcntl; cross-worker coalescing falls back to per-worker only
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    Within a worker, the first caller for a key runs the function and every
+    concurrent caller with that key blocks on its result. If ``lock_dir`` is
+    set, the leader also takes an exclusive file lock for the key, so leaders
+    in other worker processes queue behind it. The function passed to ``do``
+    should re-check a shared store (such as the LLM disk cache) once it holds
+    the lock, which is how waiting workers pick up the first worker's result.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None):
+        self.lock_dir = lock_dir if FCNTL_AVAILABLE else None
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0
+        }
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    @contextmanager
+    def _process_lock(self, key: str):
+        if not self.lock_dir:
+            yield
+            return
+        lock_path = os.path.join(self.lock_dir, f"{key}.lock")
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once for all concurrent callers sharing key and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['leaders'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with self._process_lock(key):
+                call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.waiters:
+                logger.debug(f"Single-flight call {key[:12]} shared with {call.waiters} waiting request(s)")
+            call.done.set()
+        return call.result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return leader/coalesced counters and the number of calls in flight"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._calls)
+        stats['cross_worker'] = bool(self.lock_dir)
+        return stats
+
+
+def singleflight_from_env(data_folder: str = 'data') -> SingleFlight:
+    """Build a SingleFlight, enabling cross-worker file locks when LLM_SINGLEFLIGHT_CROSS_WORKER is set"""
+    lock_dir = None
+    if os.getenv('LLM_SINGLEFLIGHT_CROSS_WORKER', 'false').lower() in ('1', 'true', 'yes'):
+        lock_dir = os.getenv('LLM_SINGLEFLIGHT_LOCK_DIR', os.path.join(data_folder, 'singleflight'))
+    return SingleFlight(lock_dir=lock_dir)
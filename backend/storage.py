@@ -0,0 +1,52 @@
+"""
+Where the Flask app keeps its uploads and SQLite databases, and the step that creates them.
+
+app.py only builds objects over these paths, so importing it creates
+nothing. migrate() makes the directories and applies every schema; the
+gunicorn master runs it from on_starting before forking workers, and
+`python storage.py` runs it by hand.
+"""
+import os
+import sys
+import logging
+
+from assessment_store import AssessmentStore
+from certificate_store import CertificateStore
+from crawl_jobs import CrawlJobRunner
+from job_description_library import JobDescriptionLibrary
+from llm_cache import cache_from_env
+from resource_cache import ResourceCache
+
+logger = logging.getLogger(__name__)
+
+# Uploaded resumes and documents
+UPLOAD_FOLDER = 'uploads'
+# Roadmaps, saved resources and the feature databases below
+DATA_FOLDER = 'data'
+
+PATHWAY_DB_PATH = os.getenv('PATHWAY_DB_PATH', 'pathway_data.db')
+JOB_DESCRIPTION_DB = os.getenv('JOB_DESCRIPTION_DB', os.path.join(DATA_FOLDER, 'job_descriptions.db'))
+RESOURCE_CACHE_DB = os.getenv('RESOURCE_CACHE_DB', os.path.join(DATA_FOLDER, 'resource_cache.db'))
+CRAWL_JOBS_DB = os.getenv('CRAWL_JOBS_DB', os.path.join(DATA_FOLDER, 'resource_cache.db'))
+
+
+def migrate() -> None:
+    """Create the app's directories and apply every database schema; safe to run again"""
+    for folder in (UPLOAD_FOLDER, DATA_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+
+    store = AssessmentStore(PATHWAY_DB_PATH)
+    store.migrate()
+    store.close()
+    CertificateStore(PATHWAY_DB_PATH).migrate()
+    JobDescriptionLibrary(JOB_DESCRIPTION_DB).migrate()
+    ResourceCache(RESOURCE_CACHE_DB).migrate()
+    CrawlJobRunner(CRAWL_JOBS_DB, scraper=None).migrate()
+    cache_from_env(DATA_FOLDER).migrate()
+    logger.info("Storage migrated")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    migrate()
+    sys.exit(0)
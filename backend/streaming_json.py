@@ -0,0 +1,106 @@
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayItemStream:
+    """
+    Incrementally extract complete objects from named arrays of a streamed JSON document.
+
+    Feed text chunks as they arrive from the LLM; every object inside one of
+    the watched top-level arrays (e.g. ``{"questions": [{...}, {...}]}``) is
+    returned as soon as its closing brace has been seen. Text before the first
+    ``{`` (prose, markdown fences) is ignored, and each item is decoded on its
+    own, so a malformed item or trailing commentary does not lose the others.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = ('questions',)):
+        self.array_keys = set(array_keys)
+        self.invalid_items = 0
+        self._buffer = ''
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = None
+        self._key = None
+        self._array_key = None
+        self._item_start = -1
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level object has been closed"""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Consume a chunk of text and return (array_key, item) pairs completed by it"""
+        if self._done or not chunk:
+            return []
+        self._buffer += chunk
+        items = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    # Only strings directly inside the top-level object can be keys we care about
+                    if len(self._stack) == 1:
+                        self._last_string = buffer[self._string_start + 1:i]
+            elif not self._stack:
+                # Skip anything before the top-level object, such as ```json fences
+                if char == '{':
+                    self._stack.append('{')
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ':' and len(self._stack) == 1:
+                self._key = self._last_string
+            elif char in '{[':
+                if char == '[' and len(self._stack) == 1:
+                    self._array_key = self._key if self._key in self.array_keys else None
+                elif char == '{' and len(self._stack) == 2 and self._array_key:
+                    self._item_start = i
+                self._stack.append(char)
+            elif char in '}]':
+                self._stack.pop()
+                if char == '}' and len(self._stack) == 2 and self._item_start >= 0:
+                    items.extend(self._decode_item(buffer[self._item_start:i + 1]))
+                    self._item_start = -1
+                elif not self._stack:
+                    self._done = True
+                    i += 1
+                    break
+            i += 1
+
+        # Drop consumed text that can no longer be part of an item or key
+        keep_from = self._item_start if self._item_start >= 0 else (self._string_start if self._in_string else i)
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._item_start >= 0:
+            self._item_start = 0
+        if self._in_string:
+            self._string_start -= keep_from
+        return items
+
+    def _decode_item(self, text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.invalid_items += 1
+            logger.warning(f"Skipping malformed item in '{self._array_key}': {str(e)}")
+            return []
+        if not isinstance(item, dict):
+            return []
+        return [(self._array_key, item)]
@@ -78,10 +78,34 @@ interface Assessment {
   experience: string;
   timeframe: string;
   created_at: string;
-  assessment_data: any;
+  assessment_data?: any;
   progress?: number;
+  milestone_count?: number;
+  skill_gap_count?: number;
+  resource_count?: number;
 }
 
+interface AssessmentPage {
+  assessments: Assessment[];
+  next_cursor: string | null;
+}
+
+const ASSESSMENT_PAGE_SIZE = 20;
+
+// The list view only needs the summary projection, not each assessment's full analysis
+const fetchAssessmentPage = async (userId: string, cursor?: string | null): Promise<AssessmentPage> => {
+  const params = new URLSearchParams({ view: 'summary', limit: String(ASSESSMENT_PAGE_SIZE) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await fetch(`http://localhost:5000/api/get-assessments/${userId}?${params}`);
+  if (!response.ok) {
+    throw new Error('Failed to fetch assessments');
+  }
+  const data = await response.json();
+  return { assessments: data.assessments || [], next_cursor: data.next_cursor || null };
+};
+
 interface Milestone {
   id: string;
   milestone: string;
@@ -102,6 +126,8 @@ const Dashboard = () => {
   const [careerPaths, setCareerPaths] = useState([]);
   const [loading, setLoading] = useState(true);
   const [assessments, setAssessments] = useState<Assessment[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [milestones, setMilestones] = useState<Milestone[]>([]);
   const [selectedAssessment, setSelectedAssessment] = useState<Assessment | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -154,15 +180,10 @@ const Dashboard = () => {
       
       try {
         console.log("Fetching assessments for user:", userId);
-        const response = await fetch(`http://localhost:5000/api/get-assessments/${userId}`);
-        
-        if (!response.ok) {
-          throw new Error('Failed to fetch assessments');
-        }
-        
-        const data = await response.json();
-        console.log("Assessments received:", data.assessments?.length || 0);
-        setAssessments(data.assessments || []);
+        const page = await fetchAssessmentPage(userId);
+        console.log("Assessments received:", page.assessments.length);
+        setAssessments(page.assessments);
+        setNextCursor(page.next_cursor);
         
       } catch (error) {
         console.error('Error fetching assessments:', error);
@@ -228,8 +249,7 @@ const Dashboard = () => {
         },
         body: JSON.stringify({
           progress_id: milestoneId,
-          status: status,
-          notes: ''
+          status: status
         }),
       });
       
@@ -276,15 +296,13 @@ const Dashboard = () => {
     const userId = localStorage.getItem('user_id');
     if (userId) {
       try {
-        const response = await fetch(`http://localhost:5000/api/get-assessments/${userId}`);
-        if (response.ok) {
-          const data = await response.json();
-          setAssessments(data.assessments || []);
-          toast({
-            title: "Assessments refreshed",
-            description: "Your latest assessments have been loaded."
-          });
-        }
+        const page = await fetchAssessmentPage(userId);
+        setAssessments(page.assessments);
+        setNextCursor(page.next_cursor);
+        toast({
+          title: "Assessments refreshed",
+          description: "Your latest assessments have been loaded."
+        });
       } catch (error) {
         console.error('Error refreshing assessments:', error);
         toast({
@@ -298,6 +316,26 @@ const Dashboard = () => {
     }
   };
 
+  const handleLoadMoreAssessments = async () => {
+    const userId = localStorage.getItem('user_id');
+    if (!userId || !nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchAssessmentPage(userId, nextCursor);
+      setAssessments(prev => [...prev, ...page.assessments]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error loading more assessments:', error);
+      toast({
+        title: "Error loading assessments",
+        description: "There was a problem fetching more of your assessments.",
+        variant: "destructive"
+      });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDeleteAssessment = async (assessmentId: string, event: React.MouseEvent) => {
     // Stop propagation to prevent navigating to learning path when clicking delete
     event.stopPropagation();
@@ -387,11 +425,10 @@ const Dashboard = () => {
                     const currentRole = assessment.current_role || 'Not specified';
                     const createdAt = new Date(assessment.created_at).toLocaleDateString();
                     
-                    // Extract some stats from assessment data
-                    const { analysis } = assessment.assessment_data;
-                    const milestoneCount = analysis.milestones?.length || 0;
-                    const skillGapCount = analysis.skill_gaps?.length || 0;
-                    const resourceCount = analysis.resources?.length || 0;
+                    // Section counts come with the summary projection
+                    const milestoneCount = assessment.milestone_count || 0;
+                    const skillGapCount = assessment.skill_gap_count || 0;
+                    const resourceCount = assessment.resource_count || 0;
                     
                     return (
                       <Card key={assessment.id} className="hover:shadow-md transition-shadow">
@@ -476,6 +513,13 @@ const Dashboard = () => {
                     );
                   })}
                 </div>
+                {nextCursor && (
+                  <div className="flex justify-center mb-8">
+                    <Button variant="outline" onClick={handleLoadMoreAssessments} disabled={loadingMore}>
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </Button>
+                  </div>
+                )}
               </>
             )}
             
@@ -212,8 +212,8 @@ const LearnWithAI = () => {
         content: file.content
       }));
       
-      // Send the message to the backend API
-      const response = await fetch('/api/learn-with-ai/chat', {
+      // Send the message to the streaming backend API so tokens render as they arrive
+      const response = await fetch('/api/learn-with-ai/chat/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -229,20 +229,64 @@ const LearnWithAI = () => {
         }),
       });
       
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`API error: ${response.status}`);
       }
       
-      const data = await response.json();
+      const assistantId = (Date.now() + 1).toString();
+      let assistantContent = '';
       
-      const assistantMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        role: 'assistant',
-        content: data.message,
-        timestamp: new Date(data.timestamp) || new Date()
+      const updateAssistantMessage = (content: string, timestamp?: string) => {
+        setMessages(prev => {
+          const assistantMessage: Message = {
+            id: assistantId,
+            role: 'assistant',
+            content,
+            timestamp: timestamp ? new Date(timestamp) : new Date()
+          };
+          const exists = prev.some(msg => msg.id === assistantId);
+          return exists
+            ? prev.map(msg => (msg.id === assistantId ? assistantMessage : msg))
+            : [...prev, assistantMessage];
+        });
       };
       
-      setMessages(prev => [...prev, assistantMessage]);
+      // Parse the server-sent events as they are received
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+        
+        for (const rawEvent of events) {
+          let eventType = 'message';
+          let payload = '';
+          for (const line of rawEvent.split('\n')) {
+            if (line.startsWith('event: ')) eventType = line.slice(7);
+            else if (line.startsWith('data: ')) payload += line.slice(6);
+          }
+          if (!payload) continue;
+          
+          const data = JSON.parse(payload);
+          if (eventType === 'error') {
+            throw new Error(data.error);
+          }
+          if (eventType === 'done') {
+            updateAssistantMessage(data.message, data.timestamp);
+          } else if (data.token) {
+            assistantContent += data.token;
+            updateAssistantMessage(assistantContent);
+            setIsLoading(false);
+          }
+        }
+      }
+      
       setIsLoading(false);
       
     } catch (error) {
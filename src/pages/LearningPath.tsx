@@ -172,8 +172,7 @@ const LearningPath = () => {
         },
         body: JSON.stringify({
           progress_id: milestoneId,
-          status: status,
-          notes: ''
+          status: status
         }),
       });
       